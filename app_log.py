@@ -0,0 +1,141 @@
+# app_log.py - 로그 (큐 + 백그라운드 기록 스레드, 레벨, 크기 기준 로테이션, 주기 요약)
+#
+# 각 모듈은 get_logger(이름)로 로거를 받아 쓴다. 로그 호출은 큐에 넣기만 하고
+# 파일/콘솔 기록은 백그라운드 스레드(QueueListener)가 맡으므로 OCR 루프가 출력 때문에 멈추지 않는다.
+# 매 프레임 나오는 메시지는 DEBUG (기본 꺼짐)이고, 대신 RateLimitedSummary가 몇 초마다 한 줄로 요약한다.
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+APP_LOGGER = "ocr_translator"
+
+_listener = None
+_setup_lock = threading.Lock()
+
+def get_logger(name):
+    """프로그램 로거 (setup_logging 전에는 WARNING 이상만 stderr로 출력)"""
+    return logging.getLogger(f"{APP_LOGGER}.{name}")
+
+def _level(level):
+    if isinstance(level, str):
+        value = logging.getLevelName(level.upper())
+        return value if isinstance(value, int) else logging.INFO
+    return level
+
+def setup_logging(path="debug_log.txt", level="INFO", console=True, max_bytes=2 * 1024 * 1024, backups=3,
+                  stream=None):
+    """큐 기반 로그 설정 (path가 없으면 콘솔만), 여러 번 호출하면 앞의 설정을 교체
+
+    실행할 때마다 이전 로그 파일을 로테이션해서 최근 backups개 실행의 로그를 남긴다.
+    콘솔 로그는 stream (기본 표준 출력)으로 나간다.
+    """
+    global _listener
+    with _setup_lock:
+        shutdown_logging()
+        handlers = []
+        if path:
+            try:
+                file_handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+                if backups > 0 and os.path.exists(path) and os.path.getsize(path) > 0:
+                    file_handler.doRollover()
+                file_handler.setFormatter(logging.Formatter(
+                    "%(asctime)s.%(msecs)03d %(levelname)-7s [%(threadName)s] %(message)s", "%H:%M:%S"))
+                handlers.append(file_handler)
+            except Exception as e:
+                sys.stderr.write(f"[⚠️ 로그 파일 열기 실패] {path}: {e}\n")
+        if console:
+            console_handler = logging.StreamHandler(stream or sys.stdout)
+            console_handler.setFormatter(logging.Formatter("%(message)s"))
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        # 다른 라이브러리 로그는 경고 이상만
+        root.setLevel(logging.WARNING)
+        logging.getLogger(APP_LOGGER).setLevel(_level(level))
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+def set_log_level(level):
+    """프로그램 로그 레벨 변경 ('DEBUG', 'INFO', 'WARNING' ...)"""
+    logging.getLogger(APP_LOGGER).setLevel(_level(level))
+
+def get_log_level():
+    """현재 프로그램 로그 레벨 (작업자 프로세스에 넘길 때 사용)"""
+    return logging.getLogger(APP_LOGGER).getEffectiveLevel()
+
+def shutdown_logging():
+    """남은 로그를 모두 기록하고 기록 스레드 종료"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.close()
+        except Exception:
+            pass
+
+atexit.register(shutdown_logging)
+
+class RateLimitedSummary:
+    """매 프레임 로그 대신 interval초마다 누적 횟수/평균 시간을 한 줄로 출력
+
+    labels는 {키: 표시 이름}이며 이 순서로 출력한다. timing()으로 넣은 키는 평균 ms를 함께 표시한다.
+    """
+
+    def __init__(self, logger, title, labels, interval=10.0):
+        self.logger = logger
+        self.title = title
+        self.labels = labels
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._seconds = {}
+        self._started = time.monotonic()
+
+    def count(self, key, n=1):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + n
+        self._maybe_flush()
+
+    def timing(self, key, seconds):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._seconds[key] = self._seconds.get(key, 0.0) + seconds
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self.interval > 0 and time.monotonic() - self._started >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """지금까지 누적한 내용을 출력하고 초기화 (누적한 것이 없으면 출력하지 않음)"""
+        with self._lock:
+            counts, seconds = self._counts, self._seconds
+            elapsed = time.monotonic() - self._started
+            self._counts, self._seconds = {}, {}
+            self._started = time.monotonic()
+        if not counts or not self.logger.isEnabledFor(logging.INFO):
+            return
+        parts = []
+        for key, label in self.labels.items():
+            n = counts.get(key, 0)
+            if key in seconds and n:
+                parts.append(f"{label} {n}회 (평균 {seconds[key] * 1000 / n:.0f}ms)")
+            elif n:
+                parts.append(f"{label} {n}회")
+        if parts:
+            self.logger.info("[📊 %s, 최근 %.0f초] %s", self.title, elapsed, ", ".join(parts))
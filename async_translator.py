@@ -0,0 +1,152 @@
+# async_translator.py - 비동기 번역 클라이언트 (오래된 요청 취소, 동일 요청 공유)
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import get_setting
+from translator import translate_text
+from app_log import get_logger
+from metrics import metrics
+
+log = get_logger("async_translator")
+
+class AsyncTranslationClient:
+    """별도 스레드의 asyncio 이벤트 루프에서 번역 요청을 관리
+
+    - 같은 영역(region)에 새 텍스트가 들어오면 이전 요청은 취소된다.
+    - 엔진/언어/텍스트가 같은 요청이 동시에 들어오면 한 번만 번역한다.
+    - 결과는 콜백과 concurrent.futures.Future로 도착 즉시 전달된다.
+    - translate_func(text, source_lang)의 source_lang은 영역별 원본 언어 (없으면 None).
+    - translate_func가 예외를 내면 오류 메시지를 결과로 전달한다 (오버레이에 그대로 표시).
+    """
+
+    def __init__(self, translate_func=translate_text, max_workers=4):
+        self.translate_func = translate_func
+        self.max_workers = max_workers
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._start_lock = threading.Lock()
+        self._region_tasks = {}   # 영역 -> ((텍스트, 원본 언어), asyncio.Task)
+        self._inflight = {}       # 요청 키 -> [asyncio.Future, 대기자 수]
+        self.submitted = 0
+        self.cancelled = 0
+        self.deduplicated = 0
+
+    def start(self):
+        """이벤트 루프 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="translate")
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(ready.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name="translate-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def stop(self):
+        """진행 중인 요청을 모두 취소하고 이벤트 루프 종료"""
+        with self._start_lock:
+            if not self._loop:
+                return
+            loop = self._loop
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), loop).result(timeout=2)
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=2)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._loop = None
+            self._thread = None
+
+    def submit(self, region, text, callback=None, source_lang=None):
+        """번역 요청 (region의 이전 요청은 취소됨), 결과는 Future/콜백으로 전달"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._submit(region, text, callback, source_lang), self._loop)
+
+    def cancel(self, region):
+        """영역의 진행 중인 요청 취소"""
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._cancel_region, region)
+
+    def cancel_all(self):
+        """모든 영역의 진행 중인 요청 취소"""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop)
+
+    def _cancel_region(self, region):
+        current = self._region_tasks.pop(region, None)
+        if current and not current[1].done():
+            current[1].cancel()
+            self.cancelled += 1
+
+    async def _cancel_all(self):
+        for region in list(self._region_tasks):
+            self._cancel_region(region)
+
+    def _request_key(self, text, source_lang):
+        return (get_setting("ENGINE", "deepl"), get_setting("TARGET_LANG", "ko"),
+                get_setting("AUTO_DETECT_LANG", True), get_setting("SOURCE_LANG", "en"), source_lang, text)
+
+    async def _submit(self, region, text, callback, source_lang=None):
+        self.submitted += 1
+        current = self._region_tasks.get(region)
+        if current and not current[1].done() and current[0] == (text, source_lang):
+            # 같은 영역에 같은 텍스트면 진행 중인 요청을 그대로 기다림
+            task = current[1]
+        else:
+            if current and not current[1].done():
+                current[1].cancel()
+                self.cancelled += 1
+            task = asyncio.ensure_future(self._translate(text, source_lang))
+            self._region_tasks[region] = ((text, source_lang), task)
+        try:
+            result = await asyncio.shield(task)
+        except Exception as e:
+            # 취소(CancelledError)는 그대로 전파, 번역 오류는 동기 경로처럼 메시지로 표시
+            metrics.inc("errors", stage="translate")
+            log.warning("[⚠️ 번역 실패] %s", e)
+            result = f"(번역 실패: {e})"
+        finally:
+            current = self._region_tasks.get(region)
+            if current and current[1] is task and task.done():
+                del self._region_tasks[region]
+        if callback is not None:
+            try:
+                callback(result)
+            except Exception as e:
+                log.exception("[⚠️ 번역 콜백 오류] %s", e)
+        return result
+
+    async def _translate(self, text, source_lang):
+        """동일 요청은 진행 중인 호출 하나를 공유"""
+        key = self._request_key(text, source_lang)
+        entry = self._inflight.get(key)
+        if entry is None:
+            future = self._loop.run_in_executor(self._executor, self.translate_func, text, source_lang)
+            entry = [future, 0]
+            self._inflight[key] = entry
+            future.add_done_callback(lambda _f, key=key, entry=entry: self._forget(key, entry))
+        else:
+            self.deduplicated += 1
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                # 아무도 기다리지 않으면 아직 시작 전인 작업은 취소
+                entry[0].cancel()
+
+    def _forget(self, key, entry):
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    def stats(self):
+        """요청/취소/공유 통계"""
+        return {"submitted": self.submitted, "cancelled": self.cancelled,
+                "deduplicated": self.deduplicated}
@@ -0,0 +1,354 @@
+# batch_ocr.py - 이미지 파일/폴더 일괄 OCR + 번역 (Tk 없이 실행, 스크린샷 모음 전처리나 CI용)
+#
+# 사용 예:
+#   python batch_ocr.py screenshots/ --output results.jsonl
+#   python batch_ocr.py shots/ extra.png --recursive --workers 4 --batch-size 16 --format csv --output out.csv
+#   python batch_ocr.py shots/ --translator none --set SOURCE_LANG=ja   (OCR만)
+#
+# 같은 크기 이미지끼리 묶어서 easyocr readtext_batched로 한 번에 인식하고, 묶음은 작업자 프로세스
+# (ocr_workers.ProcessOcrPool)에 나눠 보낸다. 인식된 텍스트는 중복을 제거한 뒤 번역 엔진에
+# 묶어서 요청하고 (캐시/번역 메모리 사용), OCR과 번역은 겹쳐서 진행된다.
+# 결과는 입력 순서대로 JSONL 또는 CSV로 기록한다.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from app_log import get_logger, setup_logging
+from config import get_setting, update_setting
+from capture import IMAGE_EXTENSIONS, list_image_files, load_image_rgb
+from ocr_engines import get_lang, onnx_options
+
+log = get_logger("batch_ocr")
+
+def collect_images(sources, recursive=False):
+    """입력 경로(파일 또는 디렉터리) → 이미지 파일 목록 (디렉터리는 이름순, 중복 제거)"""
+    files, seen = [], set()
+    for source in sources:
+        if os.path.isdir(source):
+            found = list_image_files(source, recursive=recursive)
+        elif os.path.isfile(source) and source.lower().endswith(IMAGE_EXTENSIONS):
+            found = [source]
+        else:
+            log.warning("[⚠️ 이미지가 아니거나 없는 경로, 건너뜀] %s", source)
+            continue
+        for path in found:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                files.append(path)
+    return files
+
+def load_for_ocr(path, preset):
+    """이미지 로드 + 전처리 → (RGB 배열, 배율)
+
+    readtext_batched는 묶음을 (N, 높이, 너비, 3) 배열로 받으므로 흑백 전처리 결과도 3채널로 맞춘다.
+    """
+    image = load_image_rgb(path)
+    scale = 1.0
+    if preset != "none":
+        from preprocess import preprocess
+        image, scale = preprocess(image, preset)
+    if image.ndim == 2:
+        image = np.repeat(image[..., None], 3, axis=2)
+    return np.ascontiguousarray(image), scale
+
+def _prefetch(executor, func, items, depth):
+    """items를 func로 백그라운드에서 처리하며 순서대로 (항목, 결과 Future) 반환 (최대 depth개 미리 처리)"""
+    pending = deque()
+    items = iter(items)
+    for item in items:
+        pending.append((item, executor.submit(func, item)))
+        if len(pending) >= depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+class _LocalOcr:
+    """작업자 프로세스 없이 이 프로세스에서 실행 (workers=0)"""
+
+    def __init__(self, langs, gpu, onnx):
+        from onnx_backend import create_reader
+        self.reader = create_reader(langs, gpu, onnx)
+
+    def submit(self, images, **kwargs):
+        future = Future()
+        try:
+            future.set_result(self.reader.readtext_batched(images, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        pass
+
+class _PoolOcr:
+    """작업자 프로세스 풀에서 실행 (묶음 하나가 공유 메모리 슬롯 하나에 들어가도록 슬롯 크기를 잡음)"""
+
+    def __init__(self, langs, gpu, onnx, workers, slot_mb, timeout):
+        from ocr_workers import ProcessOcrPool
+        self.langs, self.gpu = tuple(langs), gpu
+        self.pool = ProcessOcrPool(workers=workers, slots=2, slot_mb=slot_mb, timeout=timeout, onnx=onnx)
+        self.pool.load(self.langs, gpu)
+
+    def submit(self, images, **kwargs):
+        return self.pool.call(self.langs, self.gpu, "readtext_batched", images, **kwargs)
+
+    def close(self):
+        self.pool.close()
+
+def _to_lines(results, scale):
+    """easyocr 결과 → [{box, text, confidence}] (상자 좌표는 원본 이미지 기준)"""
+    lines = []
+    for box, text, confidence in results:
+        lines.append({
+            "box": [[round(float(x) / scale), round(float(y) / scale)] for x, y in box],
+            "text": text,
+            "confidence": round(float(confidence), 4),
+        })
+    return lines
+
+class BatchRunner:
+    """이미지 목록을 묶음 단위로 OCR하고 번역해서 입력 순서대로 writer에 넘김"""
+
+    def __init__(self, ocr_backend, write, batch_size=8, inflight=4, translate=True, per_line=False,
+                 translate_workers=4, preset="none", load_threads=4):
+        self.ocr = ocr_backend
+        self.write = write
+        self.batch_size = batch_size
+        self.inflight = inflight
+        self.translate = translate
+        self.per_line = per_line
+        self.preset = preset
+        self.load_threads = load_threads
+        self._translate_pool = ThreadPoolExecutor(max_workers=translate_workers, thread_name_prefix="batch-translate")
+        self._translations = {}   # 텍스트 → 번역 Future (이미 요청한 텍스트는 다시 보내지 않음)
+        self._records = {}        # 입력 번호 → (기록, 번역 대상 텍스트 목록)
+        self._next = 0            # 다음에 기록할 입력 번호
+        self.stats = {"images": 0, "errors": 0, "lines": 0, "unique_texts": 0, "batches": 0}
+
+    def _translate_new(self, texts):
+        """아직 요청하지 않은 텍스트만 묶어서 번역 요청"""
+        from translator import translate_batch
+        new = [t for t in dict.fromkeys(texts) if t and t not in self._translations]
+        if not new:
+            return
+        self.stats["unique_texts"] += len(new)
+        future = self._translate_pool.submit(translate_batch, new)
+        for i, text in enumerate(new):
+            self._translations[text] = (future, i)
+
+    def _units(self, text):
+        """번역 단위 (TRANSLATE_PER_LINE이면 줄마다)"""
+        if not text:
+            return []
+        return text.split("\n") if self.per_line else [text]
+
+    def _add(self, index, record):
+        """기록 등록 후 번역할 텍스트 목록 반환"""
+        units = self._units(record.get("text", "")) if self.translate else []
+        self._records[index] = (record, units)
+        return units
+
+    def _flush(self, block=False):
+        """입력 순서대로, 번역까지 끝난 기록을 writer에 넘김"""
+        while self._next in self._records:
+            record, units = self._records[self._next]
+            futures = [self._translations[u][0] for u in units]
+            if not block and not all(f.done() for f in futures):
+                return
+            if self.translate:
+                translated = []
+                for unit in units:
+                    future, position = self._translations[unit]
+                    try:
+                        translated.append(future.result()[position])
+                    except Exception as e:
+                        translated.append("")
+                        record["error"] = f"번역 실패: {e}"
+                record["translation"] = "\n".join(translated)
+            del self._records[self._next]
+            self.write(record)
+            self._next += 1
+
+    def _finish_batch(self, batch, future):
+        """OCR 묶음 결과를 기록으로 변환"""
+        self.stats["batches"] += 1
+        try:
+            results = future.result()
+        except Exception as e:
+            log.warning("[⚠️ OCR 묶음 실패] %d장: %s", len(batch), e)
+            results = None
+        units = []
+        for position, (index, path, image, scale) in enumerate(batch):
+            record = {"file": path, "width": round(image.shape[1] / scale), "height": round(image.shape[0] / scale)}
+            if results is None:
+                self.stats["errors"] += 1
+                record.update(text="", lines=[], error="OCR 실패")
+            else:
+                lines = _to_lines(results[position], scale)
+                self.stats["lines"] += len(lines)
+                record.update(text="\n".join(line["text"] for line in lines), lines=lines)
+            units.extend(self._add(index, record))
+        # 묶음 전체에서 처음 보는 텍스트만 한 번에 번역 요청
+        self._translate_new(units)
+
+    def run(self, paths):
+        started = time.perf_counter()
+        running = {}                 # OCR Future → 묶음 [(번호, 경로, 이미지, 배율)]
+        buckets = {}                 # 이미지 크기 → 모으는 중인 묶음
+
+        def submit(batch):
+            # 작업자에 보낸 묶음이 너무 많으면 하나가 끝날 때까지 기다림 (메모리 사용량 제한)
+            while len(running) >= self.inflight:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish_batch(running.pop(future), future)
+                self._flush()
+            images = np.stack([item[2] for item in batch])
+            running[self.ocr.submit(images, batch_size=len(batch), detail=1)] = batch
+
+        loader = ThreadPoolExecutor(max_workers=self.load_threads, thread_name_prefix="batch-load")
+        try:
+            items = _prefetch(loader, lambda p: load_for_ocr(p, self.preset), paths,
+                              depth=self.batch_size * max(self.inflight, 1))
+            for index, (path, future) in enumerate(items):
+                self.stats["images"] += 1
+                try:
+                    image, scale = future.result()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    log.warning("[⚠️ 이미지 로드 실패] %s: %s", path, e)
+                    self._add(index, {"file": path, "text": "", "lines": [], "error": f"이미지 로드 실패: {e}"})
+                    continue
+                bucket = buckets.setdefault(image.shape, [])
+                bucket.append((index, path, image, scale))
+                if len(bucket) >= self.batch_size:
+                    submit(buckets.pop(image.shape))
+            # 크기별로 남은 이미지 (묶음이 덜 찼어도 전송)
+            for batch in buckets.values():
+                submit(batch)
+            for future in list(running):
+                self._finish_batch(running.pop(future), future)
+            self._flush(block=True)
+        finally:
+            loader.shutdown(wait=False, cancel_futures=True)
+            self._translate_pool.shutdown(wait=True)
+        self.stats["elapsed_s"] = time.perf_counter() - started
+        return self.stats
+
+class JsonlWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def __call__(self, record):
+        self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+class CsvWriter:
+    """CSV 기록 (줄별 상자 정보는 생략)"""
+    FIELDS = ("file", "text", "translation", "error")
+
+    def __init__(self, f):
+        self.writer = csv.DictWriter(f, fieldnames=self.FIELDS, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def __call__(self, record):
+        self.writer.writerow(record)
+
+def parse_value(raw):
+    """--set 값 파싱 (JSON 형식이면 해당 타입으로)"""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="이미지 파일/폴더 일괄 OCR + 번역 (Tk 없이 실행)")
+    parser.add_argument("inputs", nargs="+", help="이미지 파일 또는 디렉터리")
+    parser.add_argument("--recursive", action="store_true", help="하위 디렉터리 이미지도 포함")
+    parser.add_argument("--output", default="-", help="결과 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                        help="결과 형식 (기본: 출력 파일 확장자가 .csv면 csv, 아니면 jsonl)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="OCR 작업자 프로세스 수 (0이면 이 프로세스에서 실행, 기본: CPU 수에 맞춤)")
+    parser.add_argument("--batch-size", type=int, default=8, help="readtext_batched 한 번에 넣을 이미지 수")
+    parser.add_argument("--translator", default="settings",
+                        help="settings(설정된 엔진, 기본), none(번역 안 함), deepl, libretranslate 또는 등록된 엔진 이름")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="번역 캐시/번역 메모리 사용 안 함")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="설정 덮어쓰기 (여러 번 사용 가능, 값은 JSON 형식)")
+    parser.add_argument("--log-level", default="INFO", help="로그 레벨 (로그는 표준 오류로 출력)")
+    return parser
+
+def default_workers():
+    """CPU 코어 4개당 작업자 하나 (easyocr 추론은 작업자마다 여러 스레드를 씀)"""
+    return max(min((os.cpu_count() or 1) // 4, 4), 1)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # 결과를 표준 출력으로 내보낼 수 있도록 로그는 표준 오류로 (로그 파일은 건드리지 않음)
+    setup_logging(path=None, level=args.log_level, stream=sys.stderr)
+
+    for item in args.set:
+        key, _, raw = item.partition("=")
+        if not update_setting(key, parse_value(raw)):
+            log.error("[⚠️ 알 수 없거나 잘못된 설정] %s", item)
+            return 2
+    if not args.cache:
+        update_setting("TRANSLATION_CACHE", False)
+        update_setting("TRANSLATION_MEMORY", False)
+    translate = args.translator != "none"
+    if translate and args.translator != "settings":
+        update_setting("ENGINE", args.translator)
+
+    paths = collect_images(args.inputs, recursive=args.recursive)
+    if not paths:
+        log.error("[⚠️ 처리할 이미지가 없습니다]")
+        return 1
+
+    langs = get_lang(get_setting("SOURCE_LANG", "en"))
+    gpu = get_setting("USE_GPU", False)
+    workers = default_workers() if args.workers is None else max(args.workers, 0)
+    batch_size = max(args.batch_size, 1)
+    # 묶음 하나 크기 (가장 큰 이미지 기준 대략치, 넘으면 ProcessOcrPool이 큐로 직접 보냄)
+    slot_mb = max(get_setting("OCR_PROCESS_SLOT_MB", 8), 1) * batch_size
+    log.info("[📂 일괄 처리 시작] 이미지 %d장, 언어 %s, 작업자 %d, 묶음 %d", len(paths), langs, workers, batch_size)
+    if workers:
+        backend = _PoolOcr(langs, gpu, onnx_options(), workers, slot_mb, get_setting("OCR_PROCESS_TIMEOUT", 30.0))
+    else:
+        backend = _LocalOcr(langs, gpu, onnx_options())
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    try:
+        runner = BatchRunner(
+            backend,
+            CsvWriter(output) if fmt == "csv" else JsonlWriter(output),
+            batch_size=batch_size,
+            inflight=max(workers, 1) * 2,
+            translate=translate,
+            per_line=get_setting("TRANSLATE_PER_LINE", False),
+            translate_workers=get_setting("TRANSLATE_WORKERS", 4),
+            preset=get_setting("OCR_PREPROCESS", "none"),
+        )
+        stats = runner.run(paths)
+    finally:
+        backend.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = stats["elapsed_s"]
+    log.info("[✅ 일괄 처리 완료] 이미지 %d장 (오류 %d), 묶음 %d개, 번역 요청 텍스트 %d개, %.1f초 (%.1f장/초)",
+             stats["images"], stats["errors"], stats["batches"], stats["unique_texts"], elapsed,
+             stats["images"] / elapsed if elapsed > 0 else 0.0)
+    return 1 if stats["errors"] else 0
+
+if __name__ == "__main__":
+    # 작업자 프로세스(spawn)를 exe 패키징 환경에서도 쓸 수 있도록
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# batcher.py - 짧은 시간 동안 들어온 번역 요청을 모아서 한 번에 전송
+import threading
+from concurrent.futures import Future
+
+class MicroBatcher:
+    """동시에 들어온 요청을 window초 동안 모아 묶음 함수 한 번으로 처리
+
+    같은 group(엔진, 언어 조합)끼리만 묶고, max_size개가 차면 즉시 전송한다.
+    max_size는 group마다 다르면 max_size(group)을 돌려주는 함수로 줄 수 있다.
+    batch_func(group, items)는 items와 같은 순서의 결과 리스트를 반환해야 한다.
+    """
+
+    def __init__(self, batch_func, window=0.015, max_size=50):
+        self.batch_func = batch_func
+        self.window = window
+        self.max_size = max_size
+        self._pending = {}   # group -> [(item, Future)]
+        self._timers = {}    # group -> threading.Timer
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, group, item):
+        """요청 추가 후 결과를 받을 Future 반환"""
+        future = Future()
+        flush_now = False
+        with self._lock:
+            bucket = self._pending.setdefault(group, [])
+            bucket.append((item, future))
+            max_size = self.max_size(group) if callable(self.max_size) else self.max_size
+            if len(bucket) >= max_size:
+                flush_now = True
+            elif group not in self._timers:
+                timer = threading.Timer(self.window, self._flush, args=(group,))
+                timer.daemon = True
+                self._timers[group] = timer
+                timer.start()
+        if flush_now:
+            self._flush(group)
+        return future
+
+    def _flush(self, group):
+        """모인 요청을 한 번에 처리하고 결과를 나눠줌"""
+        with self._lock:
+            bucket = self._pending.pop(group, [])
+            timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        if not bucket:
+            return
+        items = [item for item, _ in bucket]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = self.batch_func(group, items)
+            if len(results) != len(items):
+                raise ValueError(f"묶음 결과 개수 불일치: {len(results)}/{len(items)}")
+        except Exception as e:
+            for _, future in bucket:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(bucket, results):
+            future.set_result(result)
+
+    def stats(self):
+        """묶음 전송 통계"""
+        avg = self.items / self.batches if self.batches else 0.0
+        return {"batches": self.batches, "items": self.items, "avg_batch_size": avg}
@@ -0,0 +1,342 @@
+# benchmark.py - 녹화 프레임으로 OCR→번역 경로 성능 측정
+#
+# 사용 예:
+#   python benchmark.py --frames recorded_frames --translator fake --output bench.json
+#   python benchmark.py --frames clip.mp4 --set OCR_INTERVAL=0 --set USE_GPU=false
+#   python benchmark.py --frames recorded_frames --no-change-detect --set OCR_PREPROCESS=fast  (전처리 프리셋 하나로 전체 경로 측정)
+#   python benchmark.py --frames recorded_frames --compare-preprocess  (전처리 프리셋별 속도와 'none' 대비 텍스트 일치율)
+#   python benchmark.py --frames recorded_frames --compare-preprocess --preprocess-only  (OCR 없이 전처리 비용만)
+#   python benchmark.py --frames recorded_frames --compare-ocr-backends  (torch fp32/int8, ONNX fp32/int8 비교)
+import argparse
+import json
+import platform
+import sys
+import time
+
+from app_log import setup_logging
+from config import get_setting, update_setting
+from stabilizer import edit_distance
+from translation_memory import get_memory
+
+STAGES = ("capture", "ocr", "translate", "overlay")
+
+def percentile(sorted_values, p):
+    """정렬된 값에서 p 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+def summarize(samples):
+    """지연 시간 목록(초) → 밀리초 통계"""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) * 1000 / len(values),
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+def register_fake_translator(latency_ms):
+    """네트워크 없이 지연만 흉내내는 가짜 번역 엔진 등록"""
+    from translator import register_engine
+
+    def fake_request(texts, source, target):
+        time.sleep(latency_ms / 1000.0)
+        return [f"[{target}] {text}" for text in texts]
+
+    register_engine("fake", fake_request)
+    update_setting("ENGINE", "fake")
+
+class _NullLabel:
+    """Tk 없이 실행할 때 쓰는 오버레이 레이블 대용"""
+    def config(self, **kwargs):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+def create_overlay_label(use_tk):
+    """오버레이 갱신 비용 측정용 레이블 (Tk를 쓸 수 없으면 빈 레이블)"""
+    if use_tk:
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()
+            overlay = tk.Toplevel(root)
+            overlay.withdraw()
+            label = tk.Label(overlay, text="", font=("Malgun Gothic", 16), wraplength=780)
+            label.pack()
+            return label
+        except Exception as e:
+            print(f"[⚠️ Tk 사용 불가, 오버레이 측정 생략]: {e}")
+    return _NullLabel()
+
+def parse_value(raw):
+    """--set 값 파싱 (JSON 형식이면 해당 타입으로)"""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+def char_error_rate(reference, hypothesis):
+    """문자 오류율 (편집 거리 / 기준 길이)"""
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return edit_distance(reference, hypothesis) / len(reference)
+
+def compare_ocr_backends(args):
+    """같은 프레임을 torch(easyocr 기본 int8 양자화) / torch fp32 / ONNX fp32 / ONNX int8 리더로 인식해서
+    속도와 정확도(torch 기준) 비교"""
+    import easyocr
+    import ocr
+    from capture import ReplayCapture
+    from onnx_backend import apply_onnx
+    from preprocess import preprocess
+
+    for item in args.set:
+        key, _, raw = item.partition("=")
+        update_setting(key, parse_value(raw))
+    langs = ocr.get_lang(get_setting("SOURCE_LANG"))
+    cache_dir = get_setting("OCR_ONNX_CACHE_DIR", "onnx_models")
+
+    source = ReplayCapture(args.frames, loop=False)
+    frames = []
+    while not (args.max_frames and len(frames) >= args.max_frames):
+        frame = source.grab()
+        if frame is None:
+            break
+        frames.append(preprocess(frame, get_setting("OCR_PREPROCESS", "none"))[0])
+    source.close()
+
+    backends = {
+        "torch": lambda: easyocr.Reader(langs, gpu=False),
+        "torch_fp32": lambda: easyocr.Reader(langs, gpu=False, quantize=False),
+        # torch 동적 양자화 모델은 ONNX로 내보낼 수 없으므로 quantize=False로 생성
+        "onnx_fp32": lambda: apply_onnx(easyocr.Reader(langs, gpu=False, quantize=False), cache_dir, use_quantize=False),
+        "onnx_int8": lambda: apply_onnx(easyocr.Reader(langs, gpu=False, quantize=False), cache_dir, use_quantize=True),
+    }
+    texts = {}
+    report = {"frames": len(frames), "langs": langs, "backends": {}}
+    for name, factory in backends.items():
+        reader = factory()
+        ocr.warm_up_reader(reader)
+        samples = []
+        texts[name] = []
+        for _ in range(args.iterations):
+            for i, frame in enumerate(frames):
+                started = time.perf_counter()
+                lines = reader.readtext(frame, detail=0)
+                samples.append(time.perf_counter() - started)
+                if len(texts[name]) < len(frames):
+                    texts[name].append("\n".join(lines))
+        result = {"latency": summarize(samples)}
+        if name != "torch":
+            rates = [char_error_rate(ref, hyp) for ref, hyp in zip(texts["torch"], texts[name])]
+            result["cer_vs_torch"] = sum(rates) / len(rates) if rates else 0.0
+            result["exact_match_vs_torch"] = (sum(ref == hyp for ref, hyp in zip(texts["torch"], texts[name]))
+                                              / len(frames) if frames else 0.0)
+        report["backends"][name] = result
+    report["environment"] = {"python": platform.python_version(), "platform": platform.platform()}
+    return report
+
+def compare_preprocess(args):
+    """같은 프레임을 전처리 프리셋마다 인식해서 전처리/OCR 시간, 이미지 크기, 'none' 대비 텍스트 일치율 비교
+
+    pixel_ratio는 전처리 후 픽셀 수 / 원본 픽셀 수 (검출 비용은 대략 픽셀 수에 비례).
+    --preprocess-only면 OCR 없이 전처리 시간과 이미지 크기만 측정한다.
+    """
+    from capture import ReplayCapture
+    from preprocess import PRESETS, preprocess
+
+    for item in args.set:
+        key, _, raw = item.partition("=")
+        update_setting(key, parse_value(raw))
+
+    source = ReplayCapture(args.frames, loop=False)
+    frames = []
+    while not (args.max_frames and len(frames) >= args.max_frames):
+        frame = source.grab()
+        if frame is None:
+            break
+        frames.append(frame)
+    source.close()
+
+    reader = None
+    if not args.preprocess_only:
+        import ocr
+        from onnx_backend import create_reader
+        from ocr_engines import get_lang, onnx_options
+        reader = create_reader(get_lang(get_setting("SOURCE_LANG")), get_setting("USE_GPU", False), onnx_options())
+        ocr.warm_up_reader(reader)
+
+    original_pixels = sum(frame.shape[0] * frame.shape[1] for frame in frames)
+    texts = {}
+    report = {"frames": len(frames), "ocr": reader is not None, "presets": {}}
+    for preset in PRESETS:
+        prep_samples, ocr_samples = [], []
+        pixels = 0
+        texts[preset] = []
+        for iteration in range(args.iterations):
+            for frame in frames:
+                started = time.perf_counter()
+                image, _ = preprocess(frame, preset)
+                prep_samples.append(time.perf_counter() - started)
+                if iteration == 0:
+                    pixels += image.shape[0] * image.shape[1]
+                if reader is None:
+                    continue
+                started = time.perf_counter()
+                lines = reader.readtext(image, detail=0)
+                ocr_samples.append(time.perf_counter() - started)
+                if iteration == 0:
+                    texts[preset].append("\n".join(lines))
+        result = {
+            "preprocess": summarize(prep_samples),
+            "pixel_ratio": pixels / original_pixels if original_pixels else 0.0,
+        }
+        if reader is not None:
+            result["ocr"] = summarize(ocr_samples)
+            if preset != "none":
+                pairs = list(zip(texts["none"], texts[preset]))
+                rates = [char_error_rate(ref, hyp) for ref, hyp in pairs]
+                result["cer_vs_none"] = sum(rates) / len(rates) if rates else 0.0
+                result["exact_match_vs_none"] = sum(ref == hyp for ref, hyp in pairs) / len(pairs) if pairs else 0.0
+        report["presets"][preset] = result
+    report["environment"] = {"python": platform.python_version(), "platform": platform.platform()}
+    return report
+
+def run_benchmark(args):
+    """녹화 프레임을 ocr_loop와 같은 경로로 처리하며 단계별 지연 측정"""
+    import ocr
+    from capture import ReplayCapture
+
+    for item in args.set:
+        key, _, raw = item.partition("=")
+        update_setting(key, parse_value(raw))
+    if not args.cache:
+        update_setting("TRANSLATION_CACHE", False)
+        update_setting("TRANSLATION_MEMORY", False)
+    if args.translator == "fake":
+        register_fake_translator(args.fake_latency)
+    elif args.translator != "settings":
+        update_setting("ENGINE", args.translator)
+
+    # OCR 리더 준비 + 워밍업 (측정 대상에서 제외)
+    started = time.perf_counter()
+    if ocr.ensure_ocr_reader() is None:
+        raise RuntimeError("OCR 리더 초기화 실패")
+    reader_init = time.perf_counter() - started
+    ocr.change_detector.reset()
+    ocr.tile_tracker.reset()
+
+    label = create_overlay_label(args.overlay == "tk")
+    samples = {stage: [] for stage in STAGES}
+    total_frames = 0
+    skipped = 0
+    frame_limit = args.max_frames
+
+    bench_start = time.perf_counter()
+    for _ in range(args.iterations):
+        source = ReplayCapture(args.frames)
+        while not (frame_limit and total_frames >= frame_limit):
+            t0 = time.perf_counter()
+            frame = source.grab()
+            t1 = time.perf_counter()
+            if frame is None:
+                break
+            total_frames += 1
+            samples["capture"].append(t1 - t0)
+
+            text = ocr.recognize_frame(frame, detect_change=args.change_detect)
+            t2 = time.perf_counter()
+            if text is None:
+                skipped += 1
+                continue
+            samples["ocr"].append(t2 - t1)
+            if not text:
+                continue
+
+            translated = ocr.translate_for_overlay(text)
+            t3 = time.perf_counter()
+            samples["translate"].append(t3 - t2)
+
+            label.config(text=translated)
+            label.update_idletasks()
+            samples["overlay"].append(time.perf_counter() - t3)
+        source.close()
+    elapsed = time.perf_counter() - bench_start
+    memory = get_memory()
+
+    return {
+        "frames": total_frames,
+        "ocr_skipped": skipped,
+        "elapsed_s": elapsed,
+        "throughput_fps": total_frames / elapsed if elapsed > 0 else 0.0,
+        "reader_init_s": reader_init,
+        "stages": {stage: summarize(samples[stage]) for stage in STAGES},
+        "tile_tracking": ocr.tile_tracker.stats(),
+        "translation_memory": memory.stats() if memory is not None else None,
+        "settings": {
+            "ENGINE": get_setting("ENGINE"),
+            "SOURCE_LANG": get_setting("SOURCE_LANG"),
+            "USE_GPU": get_setting("USE_GPU"),
+            "TRANSLATE_PER_LINE": get_setting("TRANSLATE_PER_LINE"),
+            "OCR_PREPROCESS": get_setting("OCR_PREPROCESS"),
+            "OCR_BACKEND": get_setting("OCR_BACKEND"),
+            "change_detect": args.change_detect,
+            "overrides": args.set,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="녹화 프레임으로 OCR→번역 경로 성능 측정")
+    parser.add_argument("--frames", required=True, help="이미지 폴더 또는 동영상 파일")
+    parser.add_argument("--translator", default="fake",
+                        help="fake(기본), settings(설정된 엔진), deepl, libretranslate 또는 등록된 엔진 이름")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="가짜 번역기 지연(ms)")
+    parser.add_argument("--iterations", type=int, default=1, help="프레임 전체 반복 횟수")
+    parser.add_argument("--max-frames", type=int, default=0, help="최대 처리 프레임 수 (0이면 제한 없음)")
+    parser.add_argument("--overlay", choices=("tk", "none"), default="tk", help="오버레이 갱신 측정 방식")
+    parser.add_argument("--no-change-detect", dest="change_detect", action="store_false",
+                        help="변화 감지를 끄고 모든 프레임 OCR")
+    parser.add_argument("--cache", action="store_true", help="번역 캐시/번역 메모리 사용")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="설정 덮어쓰기 (여러 번 사용 가능, 값은 JSON 형식)")
+    parser.add_argument("--compare-ocr-backends", action="store_true",
+                        help="번역 없이 torch (int8/fp32) / ONNX fp32 / ONNX int8 OCR 속도와 정확도 비교")
+    parser.add_argument("--compare-preprocess", action="store_true",
+                        help="번역 없이 전처리 프리셋별 전처리/OCR 속도와 'none' 대비 텍스트 일치율 비교")
+    parser.add_argument("--preprocess-only", action="store_true",
+                        help="--compare-preprocess에서 OCR 없이 전처리 시간과 이미지 크기만 측정")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # 측정 중 로그는 경고 이상만 콘솔로 (로그 파일은 건드리지 않음)
+    setup_logging(path=None, level="WARNING")
+    if args.compare_ocr_backends:
+        report = compare_ocr_backends(args)
+    elif args.compare_preprocess:
+        report = compare_preprocess(args)
+    else:
+        report = run_benchmark(args)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[✅ 벤치마크 결과 저장] {args.output}")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+# capture.py - 화면 캡처 백엔드 (pyautogui, mss, X11 공유 메모리, 녹화 재생)
+import os
+import sys
+import glob
+import threading
+import time
+import ctypes
+import ctypes.util
+import numpy as np
+from app_log import get_logger
+
+log = get_logger("capture")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+class CaptureBackend:
+    """캡처 백엔드 기본 클래스
+
+    grab(region)은 (x1, y1, x2, y2) 영역을 RGB uint8 배열 (높이, 너비, 3)로 반환한다.
+    더 이상 프레임이 없으면 (재생 종료) None을 반환한다.
+    """
+    name = "base"
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class PyAutoGuiCapture(CaptureBackend):
+    """pyautogui 스크린샷 (PIL 경유라 느림, 다른 백엔드가 없을 때 사용)"""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def grab(self, region):
+        x1, y1, x2, y2 = region
+        img = self._pyautogui.screenshot(region=(x1, y1, x2 - x1, y2 - y1))
+        return np.asarray(img)
+
+class MssCapture(CaptureBackend):
+    """mss 캡처 (BGRA 버퍼를 바로 NumPy로 변환)
+
+    mss 인스턴스는 스레드 간에 공유하면 안 되므로 캡처 스레드에서 생성해야 한다.
+    """
+    name = "mss"
+
+    def __init__(self):
+        import mss
+        self._sct = mss.mss()
+
+    def grab(self, region):
+        x1, y1, x2, y2 = region
+        shot = self._sct.grab({"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return np.ascontiguousarray(bgra[..., 2::-1])
+
+    def close(self):
+        self._sct.close()
+
+# ---- X11 MIT-SHM 캡처 (ctypes) ----
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        # 함수 포인터 테이블 (사용하지 않음)
+        ("funcs", ctypes.c_void_p * 6),
+    ]
+
+_ZPIXMAP = 2
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+_ALL_PLANES = 0xFFFFFFFF
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+# X 오류 처리기는 프로세스 전체에 하나뿐이므로 (Tk도 같은 처리기를 씀) 한 번만 설치하고
+# 캡처용 디스플레이 연결에서 난 오류만 가로챈다. 다른 연결의 오류는 원래 처리기로 넘긴다.
+_x_error_targets = {}       # 디스플레이 포인터 -> XShmCapture
+_x_error_lock = threading.Lock()
+_x_error_handler = None     # 설치한 콜백 (해제되지 않도록 보관)
+_x_previous_handler = None  # 설치 전 처리기
+
+def _dispatch_x_error(display, event):
+    capture = _x_error_targets.get(display)
+    if capture is not None:
+        capture._x_error = (event.contents.error_code, event.contents.request_code)
+        return 0
+    if _x_previous_handler is not None:
+        return _x_previous_handler(display, event)
+    return 0
+
+def _watch_x_errors(x11, display, capture):
+    """display 연결의 X 오류를 capture에 기록 (처리기는 처음 한 번만 설치)"""
+    global _x_error_handler, _x_previous_handler
+    with _x_error_lock:
+        if _x_error_handler is None:
+            _x_error_handler = _XErrorHandler(_dispatch_x_error)
+            previous = x11.XSetErrorHandler(ctypes.cast(_x_error_handler, ctypes.c_void_p))
+            _x_previous_handler = _XErrorHandler(previous) if previous else None
+        _x_error_targets[display] = capture
+
+def _unwatch_x_errors(display):
+    with _x_error_lock:
+        _x_error_targets.pop(display, None)
+
+def paste_region(frame, region, bounds):
+    """bounds(x1, y1, x2, y2) 안쪽만 찍은 frame을 region 크기의 검은 배열에 제자리로 붙임"""
+    x1, y1, x2, y2 = region
+    out = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+    bx1, by1, bx2, by2 = bounds
+    out[by1 - y1:by2 - y1, bx1 - x1:bx2 - x1] = frame
+    return out
+
+class XShmCapture(CaptureBackend):
+    """X11 공유 메모리(XShmGetImage) 캡처: 서버가 공유 메모리에 바로 쓰고 NumPy로 읽음
+
+    같은 크기의 영역을 반복 캡처할 때 공유 메모리 이미지를 재사용한다.
+    화면(루트 창) 밖으로 나간 부분은 캡처하지 않고 검은색으로 채운다 (영역 좌표와 프레임 크기 유지).
+    X 오류(BadMatch 등)의 기본 처리기는 프로세스를 끝내므로 캡처용 연결의 오류는 기록만 하는
+    처리기를 (처음 한 번) 설치해두고, 오류가 나면 예외로 알린다.
+    """
+    name = "xshm"
+
+    def __init__(self):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            raise RuntimeError("X11 디스플레이가 없습니다")
+        x11_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise RuntimeError("libX11/libXext를 찾을 수 없습니다")
+        self._x11 = ctypes.CDLL(x11_path)
+        self._xext = ctypes.CDLL(xext_path)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._declare()
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise RuntimeError("X11 디스플레이 연결 실패")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._x11.XCloseDisplay(self._display)
+            raise RuntimeError("MIT-SHM 확장을 지원하지 않습니다")
+        screen = self._x11.XDefaultScreen(self._display)
+        self._root = self._x11.XRootWindow(self._display, screen)
+        self._visual = self._x11.XDefaultVisual(self._display, screen)
+        self._depth = self._x11.XDefaultDepth(self._display, screen)
+        self._image = None
+        self._shminfo = None
+        self._size = None
+        self._buffer = None
+        self._x_error = None
+        _watch_x_errors(self._x11, self._display, self)
+
+    def _declare(self):
+        x11, xext, libc = self._x11, self._xext, self._libc
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        x11.XGetGeometry.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+        ]
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_char_p,
+            ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage), ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def _create_image(self, width, height):
+        """지정 크기의 공유 메모리 이미지 생성"""
+        self._release_image()
+        shminfo = _XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(
+            self._display, self._visual, self._depth, _ZPIXMAP, None, ctypes.byref(shminfo), width, height
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage 실패")
+        if image.contents.bits_per_pixel != 32:
+            self._x11.XFree(image)
+            raise RuntimeError(f"지원하지 않는 픽셀 형식: {image.contents.bits_per_pixel}bpp")
+        size = image.contents.bytes_per_line * height
+        shminfo.shmid = self._libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            self._x11.XFree(image)
+            raise RuntimeError(f"shmget 실패 (errno {ctypes.get_errno()})")
+        addr = self._libc.shmat(shminfo.shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            self._libc.shmctl(shminfo.shmid, _IPC_RMID, None)
+            self._x11.XFree(image)
+            raise RuntimeError(f"shmat 실패 (errno {ctypes.get_errno()})")
+        shminfo.shmaddr = addr
+        shminfo.readOnly = 0
+        image.contents.data = addr
+        if not self._xext.XShmAttach(self._display, ctypes.byref(shminfo)):
+            self._libc.shmdt(addr)
+            self._libc.shmctl(shminfo.shmid, _IPC_RMID, None)
+            self._x11.XFree(image)
+            raise RuntimeError("XShmAttach 실패")
+        self._x11.XSync(self._display, 0)
+        # 모든 프로세스가 분리되면 자동 삭제되도록 미리 제거 표시
+        self._libc.shmctl(shminfo.shmid, _IPC_RMID, None)
+
+        bpl = image.contents.bytes_per_line
+        raw = (ctypes.c_ubyte * size).from_address(addr)
+        self._buffer = np.ctypeslib.as_array(raw).reshape(height, bpl // 4, 4)[:, :width]
+        self._image = image
+        self._shminfo = shminfo
+        self._size = (width, height)
+
+    def _release_image(self):
+        if self._image is None:
+            return
+        self._xext.XShmDetach(self._display, ctypes.byref(self._shminfo))
+        self._x11.XSync(self._display, 0)
+        self._libc.shmdt(self._shminfo.shmaddr)
+        # 데이터는 공유 메모리이므로 구조체만 해제
+        self._image.contents.data = None
+        self._x11.XFree(self._image)
+        self._image = None
+        self._shminfo = None
+        self._buffer = None
+        self._size = None
+
+    def _screen_size(self):
+        """루트 창 크기 (해상도가 바뀔 수 있으므로 매번 조회)"""
+        root = ctypes.c_ulong()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        self._x11.XGetGeometry(self._display, self._root, ctypes.byref(root), ctypes.byref(x), ctypes.byref(y),
+                               ctypes.byref(width), ctypes.byref(height), ctypes.byref(border), ctypes.byref(depth))
+        return width.value, height.value
+
+    def _get_image(self, x, y):
+        """XShmGetImage 실행 (이 연결의 X 오류는 프로세스 종료 대신 예외)"""
+        self._x_error = None
+        ok = self._xext.XShmGetImage(self._display, self._root, self._image, x, y, _ALL_PLANES)
+        self._x11.XSync(self._display, 0)
+        if self._x_error is not None:
+            error_code, request_code = self._x_error
+            raise RuntimeError(f"XShmGetImage X 오류 (코드 {error_code}, 요청 {request_code})")
+        if not ok:
+            raise RuntimeError("XShmGetImage 실패")
+
+    def grab(self, region):
+        x1, y1, x2, y2 = region
+        screen_width, screen_height = self._screen_size()
+        bounds = (max(x1, 0), max(y1, 0), min(x2, screen_width), min(y2, screen_height))
+        width, height = bounds[2] - bounds[0], bounds[3] - bounds[1]
+        if width <= 0 or height <= 0:
+            return np.zeros((max(y2 - y1, 0), max(x2 - x1, 0), 3), dtype=np.uint8)
+        if self._size != (width, height):
+            self._create_image(width, height)
+        self._get_image(bounds[0], bounds[1])
+        # 공유 버퍼는 다음 캡처 때 덮어써지므로 BGRX → RGB 변환하면서 한 번만 복사
+        frame = np.ascontiguousarray(self._buffer[..., 2::-1])
+        if bounds != (x1, y1, x2, y2):
+            return paste_region(frame, region, bounds)
+        return frame
+
+    def close(self):
+        self._release_image()
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            _unwatch_x_errors(self._display)
+            self._display = None
+
+# ---- 녹화 재생 ----
+
+def load_image_rgb(path):
+    """이미지 파일을 RGB 배열로 로드"""
+    try:
+        import cv2
+        img = cv2.imread(path, cv2.IMREAD_COLOR)
+        if img is not None:
+            return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    except ImportError:
+        pass
+    from PIL import Image
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"))
+
+def list_image_files(source, recursive=False):
+    """디렉터리 안의 이미지 파일 목록 (이름순, recursive면 하위 디렉터리 포함)"""
+    pattern = os.path.join(source, "**", "*") if recursive else os.path.join(source, "*")
+    files = [p for p in glob.glob(pattern, recursive=recursive) if p.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(files)
+
+class ReplayCapture(CaptureBackend):
+    """녹화된 프레임 재생 (이미지 디렉터리 또는 동영상 파일)
+
+    녹화 프레임을 화면 전체(원점 0, 0)로 보고 실시간 캡처처럼 영역 부분만 잘라서 반환한다
+    (여러 영역을 한 번에 찍은 뒤 영역별로 자르는 경로가 실시간과 같게 동작).
+    영역이 없거나 프레임이 영역을 포함하지 않으면 (영역만 녹화한 경우) 프레임을 그대로 반환한다.
+    fps를 주면 실제 속도로 재생한다.
+    """
+    name = "replay"
+
+    def __init__(self, source, loop=False, fps=None):
+        if not source or not os.path.exists(source):
+            raise RuntimeError(f"재생할 프레임 경로가 없습니다: {source}")
+        self.source = source
+        self.loop = loop
+        self.fps = fps
+        self._files = None
+        self._video = None
+        self._index = 0
+        self._next_time = None
+        if os.path.isdir(source):
+            self._files = list_image_files(source)
+            if not self._files:
+                raise RuntimeError(f"재생할 이미지가 없습니다: {source}")
+        else:
+            import cv2
+            self._video = cv2.VideoCapture(source)
+            if not self._video.isOpened():
+                raise RuntimeError(f"동영상을 열 수 없습니다: {source}")
+
+    def _read_next(self):
+        if self._files is not None:
+            if self._index >= len(self._files):
+                if not self.loop:
+                    return None
+                self._index = 0
+            frame = load_image_rgb(self._files[self._index])
+            self._index += 1
+            return frame
+        import cv2
+        ok, frame = self._video.read()
+        if not ok and self.loop:
+            self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._video.read()
+        if not ok:
+            return None
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def grab(self, region=None):
+        if self.fps:
+            now = time.perf_counter()
+            if self._next_time is not None and now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time or now) + 1.0 / self.fps
+        frame = self._read_next()
+        if frame is None or region is None:
+            return frame
+        x1, y1, x2, y2 = region
+        if x1 < 0 or y1 < 0 or frame.shape[0] < y2 or frame.shape[1] < x2:
+            return frame
+        return np.ascontiguousarray(frame[y1:y2, x1:x2])
+
+    def close(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+
+def create_capture_backend(name="auto", replay_source=None, replay_loop=False, replay_fps=None):
+    """이름으로 캡처 백엔드 생성 ("auto"면 사용 가능한 가장 빠른 백엔드)"""
+    if name == "replay":
+        return ReplayCapture(replay_source, loop=replay_loop, fps=replay_fps)
+    candidates = {
+        "xshm": [XShmCapture],
+        "mss": [MssCapture],
+        "pyautogui": [PyAutoGuiCapture],
+    }.get(name, [XShmCapture, MssCapture, PyAutoGuiCapture])
+    last_error = None
+    for backend_class in candidates:
+        try:
+            backend = backend_class()
+            log.info("[📸 캡처 백엔드] %s", backend.name)
+            return backend
+        except Exception as e:
+            last_error = e
+    raise RuntimeError(f"사용 가능한 캡처 백엔드가 없습니다: {last_error}")
@@ -0,0 +1,114 @@
+# change_detect.py - 화면 변화 감지 (변화 없으면 OCR 생략)
+import numpy as np
+
+# 비교용 축소 배율 (가로/세로 몇 픽셀마다 하나씩 샘플링할지)
+SAMPLE_STEP = 2
+
+def to_gray_small(frame, step=SAMPLE_STEP):
+    """비교용 축소 그레이스케일 이미지 생성 (int16)"""
+    arr = np.asarray(frame)
+    small = arr[::step, ::step]
+    if small.ndim == 3:
+        # RGB 평균 대신 정수 가중합 (0.299, 0.587, 0.114 근사)
+        small = (small[..., 0].astype(np.int32) * 77
+                 + small[..., 1].astype(np.int32) * 150
+                 + small[..., 2].astype(np.int32) * 29) >> 8
+    return small.astype(np.int16)
+
+def frame_difference(prev_small, cur_small, noise=8):
+    """두 축소 이미지의 변화 비율(%) 계산
+
+    noise 이하의 픽셀 밝기 변화는 노이즈로 보고 무시한다.
+    """
+    if prev_small is None or cur_small is None or prev_small.shape != cur_small.shape:
+        return 100.0
+    diff = np.abs(cur_small - prev_small)
+    changed = np.count_nonzero(diff > noise)
+    return changed * 100.0 / diff.size
+
+def tile_change_counts(changed, tile):
+    """변화 픽셀 bool 배열 → 타일별 변화 픽셀 수 (타일 행 × 타일 열)"""
+    h, w = changed.shape
+    rows, cols = -(-h // tile), -(-w // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=np.uint8)
+    padded[:h, :w] = changed
+    return padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3), dtype=np.int32)
+
+class ChangeDetector:
+    """마지막으로 OCR한 프레임과 비교해서 의미 있는 변화가 있는지 판단
+
+    자막 한 글자(3 → 5)는 넓은 영역 전체에서 보면 0.1% 미만의 픽셀 변화라서 전체 비율만으로는
+    놓치므로, 축소 이미지의 타일(tile × tile) 하나에서라도 tile_pixels개 이상 바뀌면 변화로 본다.
+    기준 프레임은 OCR이 끝난 뒤 commit()으로만 갱신한다 (건너뛴 프레임과 비교하면 천천히 바뀌는
+    변화가 쌓여도 감지하지 못하고, OCR이 실패한 프레임을 기준으로 삼으면 그 변화를 놓친다).
+    """
+
+    def __init__(self, threshold=0.5, noise=8, tile=16, tile_pixels=2):
+        self.threshold = threshold      # 전체 변화 픽셀 비율(%) 기준
+        self.noise = noise              # 픽셀 밝기 노이즈 허용치
+        self.tile = tile                # 축소 이미지 기준 타일 크기
+        self.tile_pixels = tile_pixels  # 타일 하나에서 이만큼 바뀌면 변화
+        self.prev_small = None
+        self._candidate = None
+        self.checked = 0
+        self.skipped = 0
+
+    def reset(self):
+        """이전 프레임 및 카운터 초기화"""
+        self.prev_small = None
+        self._candidate = None
+        self.checked = 0
+        self.skipped = 0
+
+    def has_changed(self, frame):
+        """마지막으로 OCR한 프레임에서 바뀌었으면 True (기준 프레임은 commit()에서 갱신)"""
+        cur_small = to_gray_small(frame)
+        self._candidate = cur_small
+        changed = self._differs(cur_small)
+        self.count(changed)
+        return changed
+
+    def _differs(self, cur_small):
+        prev = self.prev_small
+        if prev is None or prev.shape != cur_small.shape:
+            return True
+        changed = np.abs(cur_small - prev) > self.noise
+        if np.count_nonzero(changed) * 100.0 / changed.size >= self.threshold:
+            return True
+        return int(tile_change_counts(changed, self.tile).max()) >= self.tile_pixels
+
+    def commit(self):
+        """OCR을 마친 뒤 호출: 마지막으로 검사한 프레임을 기준 프레임으로"""
+        if self._candidate is not None:
+            self.prev_small = self._candidate
+            self._candidate = None
+
+    def count(self, changed):
+        """검사/스킵 횟수 기록 (다른 방법으로 변화를 판단한 경우에도 통계에 반영)"""
+        self.checked += 1
+        if not changed:
+            self.skipped += 1
+
+    def stats(self):
+        """스킵 통계 반환"""
+        rate = self.skipped * 100.0 / self.checked if self.checked else 0.0
+        return {"checked": self.checked, "skipped": self.skipped, "skip_rate": rate}
+
+def dirty_tiles(prev_gray, cur_gray, tile=32, noise=8, min_pixels=4):
+    """타일별 변화 여부 (타일 행 × 타일 열 bool 배열)
+
+    타일 안에서 noise보다 밝기가 많이 바뀐 픽셀이 min_pixels개 이상이면 변경된 타일로 본다.
+    """
+    changed = np.abs(cur_gray.astype(np.int16) - prev_gray.astype(np.int16)) > noise
+    return tile_change_counts(changed, tile) >= min_pixels
+
+def dirty_rects(grid, tile, shape):
+    """변경된 타일들을 연결 영역별 최소 사각형 [(x1, y1, x2, y2)]으로 병합"""
+    import cv2
+    h, w = shape[:2]
+    count, _, stats, _ = cv2.connectedComponentsWithStats(grid.astype(np.uint8), connectivity=8)
+    rects = []
+    for label in range(1, count):
+        x, y, cw, ch = stats[label, :4]
+        rects.append((int(x * tile), int(y * tile), int(min((x + cw) * tile, w)), int(min((y + ch) * tile, h))))
+    return rects
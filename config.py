@@ -1,6 +1,12 @@
 # config.py - 간소화된 설정 관리
+import atexit
 import json
 import os
+import tempfile
+import threading
+from app_log import get_logger
+
+log = get_logger("config")
 
 # 기본 설정
 DEFAULT_SETTINGS = {
@@ -13,35 +19,244 @@ DEFAULT_SETTINGS = {
     "OCR_INTERVAL": 1.0,
     "SOURCE_LANG": "en",
     "TARGET_LANG": "ko",
-    "AUTO_DETECT_LANG": True
+    "AUTO_DETECT_LANG": True,
+    "CHANGE_THRESHOLD": 0.5,  # 변화 픽셀 비율(%) 미만이면 OCR 생략
+    "CHANGE_NOISE": 8,  # 픽셀 밝기 변화 노이즈 허용치 (0~255)
+    "CHANGE_TILE_PIXELS": 2,  # 32px 칸 하나에서 이만큼(2px 간격 샘플 기준) 바뀌어도 변화로 봄 (글자 하나 변경 감지)
+    "TRANSLATION_CACHE": True,
+    "CACHE_PATH": "translation_cache.db",
+    "CACHE_MEMORY_ENTRIES": 2000,
+    "CACHE_MEMORY_BYTES": 4 * 1024 * 1024,
+    "CACHE_DISK_ENTRIES": 100000,
+    "CACHE_DISK_BYTES": 50 * 1024 * 1024,
+    "TRANSLATION_MEMORY": True,  # 숫자만 다르거나 아주 비슷한 문장은 이전 번역 재사용
+    "TM_PATH": "translation_memory.db",
+    "TM_THRESHOLD": 1.0,  # 1.0이면 숫자/자리표시자만 다른 문장만 재사용, 낮추면 문자 3-gram 유사도(Dice)가 이 값 이상일 때도 재사용
+    "TM_NGRAM": 3,
+    "TM_SUBSTITUTE": True,  # 재사용할 때 숫자/자리표시자를 새 문장의 값으로 교체
+    "TM_MAX_ENTRIES": 200000,  # 엔진/언어 조합별 최대 항목 수 (넘으면 오래 쓰지 않은 항목부터 삭제, 0이면 제한 없음)
+    "HTTP_CONNECT_TIMEOUT": 3.0,
+    "HTTP_READ_TIMEOUT": 10.0,
+    "TRANSLATE_BATCH_WINDOW": 0.015,  # 번역 요청을 모으는 시간(초), 0이면 사용 안 함
+    "TRANSLATE_PER_LINE": False,  # 줄 단위로 나눠서 한 요청에 묶어 번역
+    "ASYNC_TRANSLATION": True,  # 새 텍스트가 오면 이전 번역 요청 취소
+    "TRANSLATE_WORKERS": 4,
+    "CAPTURE_BACKEND": "auto",  # 'auto', 'xshm', 'mss', 'pyautogui', 'replay'
+    "REPLAY_SOURCE": "",  # replay 백엔드용 이미지 폴더 또는 동영상 파일
+    "REPLAY_LOOP": True,
+    "REPLAY_FPS": None,
+    "OCR_READER_MEMORY_MB": 1500,  # 풀에 유지할 OCR 리더 메모리 한도
+    "OCR_READER_IDLE_SECONDS": 600,  # 이 시간 동안 안 쓴 리더는 제거
+    "OCR_AUTO_LANGS": ["en", "ja", "ko", "zh-CN"],  # 자동 감지 시 시도할 언어
+    "OCR_ROUTE_MIN_CONFIDENCE": 0.4,  # 평균 신뢰도가 이보다 낮으면 다른 언어 리더로 탐색
+    "OCR_ROUTE_PROBE_SECONDS": 5.0,  # 영역별 언어 탐색 최소 간격(초)
+    "OCR_ROUTE_PROBE_LINES": 3,  # 언어 탐색에서 다른 리더로 다시 읽어볼 검출 줄 수
+    "OCR_PREPROCESS": "none",  # 'none', 'fast', 'balanced', 'accurate', 'binary'
+    "OCR_REUSE_BOXES": True,  # 줄 배치가 같으면 검출 생략, 바뀐 줄만 인식
+    "OCR_FIXED_BOXES": [],  # 고정 줄 상자 [[x1, y1, x2, y2], ...] (영역 기준), 설정 시 검출 생략
+    "OCR_TILE_TRACKING": True,  # 넓은 영역은 바뀐 타일 주변만 인식
+    "OCR_TILE_SIZE": 32,
+    "OCR_TILE_MIN_AREA": 150000,  # 이 픽셀 수 이상인 영역에만 타일 추적 적용
+    # 여러 영역: [{"name": "subtitle", "region": [x1, y1, x2, y2], "interval": 0.5, "lang": "ja", "overlay": "main"}, ...]
+    # 비어 있으면 OCR_REGION 하나만 사용, overlay가 "main"이 아니면 별도 오버레이 창에 표시
+    "OCR_REGIONS": [],
+    "OVERLAY_POSITIONS": {},  # 추가 오버레이 창 위치 {이름: [x, y]}
+    "OCR_REGION_WORKERS": 4,
+    "OCR_PROCESS_WORKERS": 0,  # 1 이상이면 별도 프로세스에서 OCR 실행 (GUI 응답성 유지, 여러 코어 사용)
+    "OCR_PROCESS_SLOTS": 2,  # 작업자별 공유 메모리 프레임 슬롯 수
+    "OCR_PROCESS_SLOT_MB": 8,  # 슬롯 크기 (이보다 큰 프레임은 큐로 직접 전달)
+    "OCR_PROCESS_TIMEOUT": 30.0,
+    "OCR_BACKEND": "torch",  # 'torch' 또는 'onnx' (ONNX Runtime CPU 추론, 처음 실행 시 모델 변환)
+    "OCR_ONNX_QUANTIZE": True,  # ONNX 모델에 int8 동적 양자화 적용 (인식 모델의 행렬곱/LSTM만, 합성곱은 fp32 유지)
+    "OCR_ONNX_CACHE_DIR": "onnx_models",
+    "OCR_ENGINE": "easyocr",  # 'easyocr' 또는 'tesseract' (OCR_REGIONS 항목의 "engine"으로 영역별 지정 가능)
+    "OCR_ENGINE_BY_LANG": {},  # OCR 언어별 엔진, 예: {"en": "tesseract", "ja": "easyocr"}
+    "ADAPTIVE_INTERVAL": True,  # 화면 변화에 따라 OCR 주기 조절 (OCR_INTERVAL이 가장 느린 주기, 끄면 OCR_INTERVAL 고정)
+    "OCR_MIN_INTERVAL": 0.2,  # 변화 직후 가장 빠른 주기(초)
+    "OCR_BACKOFF": 1.5,  # 변화가 없을 때마다 주기를 늘리는 배수
+    "STABILIZE_SIMILARITY": 0.9,  # 확정된 텍스트와 이 유사도 이상이면 OCR 흔들림으로 보고 번역 생략
+    "STABILIZE_FRAMES": 2,  # 새 텍스트가 이 횟수만큼 연속으로 비슷하게 읽혀야 번역
+    "OVERLAY_WIDTH": 800,
+    "OVERLAY_HEIGHT": 120,
+    "LIBRE_API_URL": "http://localhost:5001/translate",
+    "LIBRE_API_KEY": "",
+    "DPI_SCALE": 1.0,
+    "SETTINGS_SAVE_DELAY": 0.5,  # 설정 저장을 미루는 시간(초), 이 시간 안의 변경은 한 번에 저장
+    "LOG_LEVEL": "INFO",  # DEBUG로 바꾸면 매 프레임 OCR/번역 로그도 기록
+    "LOG_FILE": "debug_log.txt",
+    "LOG_MAX_BYTES": 2 * 1024 * 1024,  # 로그 파일 최대 크기, 넘으면 로테이션
+    "LOG_BACKUPS": 3,  # 보관할 이전 로그 파일 수
+    "LOG_SUMMARY_SECONDS": 10.0,  # OCR 처리 요약 로그 주기(초)
+    "METRICS_ENABLED": True,  # 단계별 지연 시간/카운터 기록
+    "METRICS_WINDOW": 512,  # 백분위수 계산에 쓰는 최근 표본 수
+    "METRICS_EXPORT_FILE": "",  # 비어 있지 않으면 이 파일에 지표를 주기적으로 저장
+    "METRICS_EXPORT_FORMAT": "json",  # "json" 또는 "prometheus"
+    "METRICS_EXPORT_SECONDS": 10.0,
+    "METRICS_PORT": 0  # 0이 아니면 http://127.0.0.1:포트/metrics 에서 제공
 }
 
 # 현재 설정
 _settings = DEFAULT_SETTINGS.copy()
+_settings_lock = threading.RLock()
+
+SETTINGS_PATH = "settings.json"
+
+# 설정 변경 구독자 [(키 집합 또는 None(전체), 콜백)]
+_subscribers = []
+
+# 미뤄둔 저장 (짧은 시간에 여러 번 바뀌면 마지막에 한 번만 씀)
+_save_timer = None
+_save_pending = False
+
+def _coerce(key, value):
+    """기본값의 타입에 맞게 값 변환 (맞출 수 없으면 TypeError/ValueError)"""
+    default = DEFAULT_SETTINGS.get(key)
+    if default is None or value is None:
+        return value
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        raise TypeError(f"{key}: bool 값이 필요합니다 ({value!r})")
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"{key}: 숫자 값이 필요합니다 ({value!r})")
+        number = float(value)
+        if isinstance(default, int):
+            if not number.is_integer():
+                raise ValueError(f"{key}: 정수 값이 필요합니다 ({value!r})")
+            return int(number)
+        return number
+    if isinstance(default, (list, tuple)):
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f"{key}: 목록 값이 필요합니다 ({value!r})")
+        return value
+    if not isinstance(value, type(default)):
+        raise TypeError(f"{key}: {type(default).__name__} 값이 필요합니다 ({value!r})")
+    return value
+
+def _same(old, new):
+    # JSON에서 읽은 목록과 코드의 튜플은 같은 값으로 봄
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        return list(old) == list(new)
+    return old == new
+
+def subscribe(keys, callback):
+    """설정 변경 구독: 지정한 키(None이면 전체) 중 바뀐 것이 있으면 callback({키: 새 값}) 호출
+
+    여러 키를 update_settings로 한 번에 바꾸면 구독자마다 한 번만 호출된다.
+    콜백은 설정을 바꾼 스레드에서 실행된다. 구독 해제 함수를 반환한다.
+    """
+    entry = (frozenset([keys] if isinstance(keys, str) else keys) if keys is not None else None, callback)
+    with _settings_lock:
+        _subscribers.append(entry)
+
+    def unsubscribe():
+        with _settings_lock:
+            if entry in _subscribers:
+                _subscribers.remove(entry)
+    return unsubscribe
+
+def _notify(changed):
+    if not changed:
+        return
+    with _settings_lock:
+        subscribers = list(_subscribers)
+    for keys, callback in subscribers:
+        relevant = changed if keys is None else {k: v for k, v in changed.items() if k in keys}
+        if not relevant:
+            continue
+        try:
+            callback(relevant)
+        except Exception as e:
+            log.exception("[⚠️ 설정 변경 처리 오류] %s: %s", ", ".join(relevant), e)
+
+def _apply(values):
+    """여러 설정 반영 (잠금 상태에서 호출), 실제로 바뀐 {키: 새 값} 반환"""
+    changed = {}
+    for key, value in values.items():
+        if key not in _settings and key not in DEFAULT_SETTINGS:
+            continue
+        try:
+            value = _coerce(key, value)
+        except (TypeError, ValueError) as e:
+            log.warning("[⚠️ 잘못된 설정 값 무시] %s", e)
+            continue
+        if key in _settings and _same(_settings[key], value):
+            continue
+        _settings[key] = value
+        changed[key] = value
+    return changed
+
+def _write_settings(settings):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 종료돼도 기존 파일이 깨지지 않음)"""
+    path = os.path.abspath(SETTINGS_PATH)
+    fd, tmp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
-def save_settings():
-    """설정을 JSON 파일로 저장"""
+def flush_settings():
+    """미뤄둔 저장이 있으면 지금 저장"""
+    global _save_timer, _save_pending
+    with _settings_lock:
+        if not _save_pending:
+            return True
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+        _save_pending = False
+        snapshot = dict(_settings)
     try:
-        with open("settings.json", "w", encoding="utf-8") as f:
-            json.dump(_settings, f, indent=2, ensure_ascii=False)
-        print(f"[✅ 설정 저장 완료]")
+        _write_settings(snapshot)
+        log.info("[✅ 설정 저장 완료]")
         return True
     except Exception as e:
-        print(f"[⚠️ 설정 저장 실패]: {e}")
+        log.warning("[⚠️ 설정 저장 실패]: %s", e)
         return False
 
+def save_settings(delay=None):
+    """설정을 JSON 파일로 저장 (delay초 동안 추가 변경이 없으면 한 번에 저장, 0이면 즉시)"""
+    global _save_timer, _save_pending
+    if delay is None:
+        delay = _settings.get("SETTINGS_SAVE_DELAY", 0.5)
+    with _settings_lock:
+        _save_pending = True
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+        if delay > 0:
+            _save_timer = threading.Timer(delay, flush_settings)
+            _save_timer.daemon = True
+            _save_timer.start()
+            return True
+    return flush_settings()
+
 def load_settings():
     """JSON 파일에서 설정 로드"""
-    global _settings
     try:
-        if os.path.exists("settings.json"):
-            with open("settings.json", "r", encoding="utf-8") as f:
+        if os.path.exists(SETTINGS_PATH):
+            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
                 loaded = json.load(f)
-                # 기존 설정에 로드된 설정 병합
-                _settings.update(loaded)
-            print(f"[✅ 설정 로드 완료]")
+            # 기존 설정에 로드된 설정 병합 (기본값에 없는 키도 유지)
+            with _settings_lock:
+                for key in loaded:
+                    _settings.setdefault(key, None)
+                changed = _apply(loaded)
+            _notify(changed)
+            log.info("[✅ 설정 로드 완료]")
     except Exception as e:
-        print(f"[⚠️ 설정 로드 실패]: {e}")
+        log.warning("[⚠️ 설정 로드 실패]: %s", e)
     return _settings
 
 def get_setting(key, default=None):
@@ -49,32 +264,63 @@ def get_setting(key, default=None):
     return _settings.get(key, default)
 
 def update_setting(key, value):
-    """설정 값 업데이트"""
-    if key in _settings or key in DEFAULT_SETTINGS:
-        _settings[key] = value
-        return True
-    return False
+    """설정 값 업데이트 (알 수 없는 키나 타입이 맞지 않는 값이면 False)"""
+    with _settings_lock:
+        if key not in _settings and key not in DEFAULT_SETTINGS:
+            return False
+        try:
+            _coerce(key, value)
+        except (TypeError, ValueError) as e:
+            log.warning("[⚠️ 잘못된 설정 값 무시] %s", e)
+            return False
+        changed = _apply({key: value})
+    _notify(changed)
+    return True
+
+def update_settings(values):
+    """여러 설정을 한 번에 업데이트하고 구독자에게 알림, 실제로 바뀐 {키: 새 값} 반환"""
+    with _settings_lock:
+        changed = _apply(values)
+    _notify(changed)
+    return changed
 
-def get_dpi_scale():
-    """화면 DPI 배율 가져오기"""
+# 비정상 종료가 아니면 미뤄둔 저장을 마저 씀
+atexit.register(flush_settings)
+
+def set_dpi_awareness():
+    """DPI 인식 모드 설정 (Tk 창을 만들기 전에 호출, Windows가 아니면 무시)"""
     try:
         import ctypes
         user32 = ctypes.windll.user32
+    except Exception:
+        return
+    try:
+        # Windows 8.1 이상
+        user32.SetProcessDPIAware()
+    except AttributeError:
         try:
-            # Windows 8.1 이상
-            user32.SetProcessDPIAware()
+            # Windows 10 이상
+            user32.SetProcessDpiAwareness(1)
         except AttributeError:
-            try:
-                # Windows 10 이상
-                user32.SetProcessDpiAwareness(1)
-            except AttributeError:
-                pass
+            pass
+
+def get_dpi_scale(root=None):
+    """화면 DPI 배율 가져오기 (root가 없으면 기존 Tk 루트 사용, 그것도 없으면 임시로 생성)"""
+    try:
+        import ctypes
+        user32 = ctypes.windll.user32
+        set_dpi_awareness()
         
         # DPI 배율 계산
         try:
             import tkinter as tk
-            root = tk.Tk()
-            root.withdraw()
+            owns_root = False
+            if root is None:
+                root = tk._default_root
+            if root is None:
+                root = tk.Tk()
+                root.withdraw()
+                owns_root = True
             
             # 실제 물리적 화면 해상도 가져오기
             screen_width = root.winfo_screenwidth()
@@ -91,19 +337,27 @@ def get_dpi_scale():
                 # 두 값의 평균으로 배율 계산 (대체로 동일함)
                 scale = (scale_x + scale_y) / 2
                 
-                print(f"[🔍 DPI 배율 감지] 배율: {scale:.2f} (화면: {screen_width}x{screen_height}, 실제: {actual_width}x{actual_height})")
-                
-                root.destroy()
+                log.info("[🔍 DPI 배율 감지] 배율: %.2f (화면: %dx%d, 실제: %dx%d)", scale, screen_width, screen_height, actual_width, actual_height)
                 return scale
             except:
-                root.destroy()
                 return 1.0
+            finally:
+                if owns_root:
+                    root.destroy()
         except:
             return 1.0
     except:
         return 1.0
 
-# 프로그램 시작시 설정 로드
+_dpi_probed = False
+
+def ensure_dpi_scale(root=None):
+    """DPI 배율 반환 (처음 필요할 때 한 번만 측정해서 DPI_SCALE에 저장)"""
+    global _dpi_probed
+    if not _dpi_probed:
+        _dpi_probed = True
+        update_setting("DPI_SCALE", get_dpi_scale(root))
+    return get_setting("DPI_SCALE", 1.0)
+
+# 프로그램 시작시 설정 로드 (DPI 배율은 영역 선택 등 처음 필요할 때 측정)
 load_settings()
-# 설정에 DPI 배율 저장
-update_setting("DPI_SCALE", get_dpi_scale())
\ No newline at end of file
@@ -2,22 +2,108 @@
 import tkinter as tk
 import os
 import webbrowser
-import keyboard
 import threading
 import time
-import traceback
 from tkinter import simpledialog, messagebox, StringVar, BooleanVar
-from config import get_setting, update_setting, save_settings
-from ocr import start_ocr_thread, stop_ocr, reinit_ocr_reader
+from config import get_setting, update_setting, update_settings, save_settings, flush_settings, subscribe, ensure_dpi_scale
+from startup_profile import phase
+from app_log import get_logger, shutdown_logging
 
-def create_overlay_window():
+log = get_logger("gui")
+
+# OCR 모듈 (numpy/OpenCV/easyocr 등 무거운 의존성)은 창을 띄운 뒤 백그라운드에서 불러옴
+_ocr_module = None
+_ocr_import_lock = threading.Lock()
+
+def get_ocr():
+    """ocr 모듈 반환 (아직 안 불러왔으면 지금 불러옴, 백그라운드에서 불러오는 중이면 끝날 때까지 대기)"""
+    global _ocr_module
+    with _ocr_import_lock:
+        if _ocr_module is None:
+            with phase("OCR 모듈 임포트"):
+                import ocr
+            _ocr_module = ocr
+        return _ocr_module
+
+def preload_ocr_async(on_done=None):
+    """백그라운드 스레드에서 OCR 모듈과 기본 OCR 리더를 미리 불러옴"""
+    def run():
+        try:
+            ocr = get_ocr()
+            with phase("OCR 리더 로드"):
+                ocr.ensure_ocr_reader()
+        except Exception as e:
+            log.exception("[⚠️ OCR 미리 불러오기 실패] %s", e)
+        if on_done is not None:
+            on_done()
+    threading.Thread(target=run, name="ocr-preload", daemon=True).start()
+
+# 통계 창에 표시할 지연 시간 (이름, 지표)
+STATS_TIMINGS = (
+    ("캡처", "capture_seconds"),
+    ("OCR", "ocr_seconds"),
+    ("번역", "translation_seconds"),
+    ("엔진 요청", "engine_request_seconds"),
+    ("오버레이", "overlay_update_seconds"),
+    ("전체 지연", "pipeline_latency_seconds"),
+)
+
+def format_metrics_text():
+    """단계별 지연 시간(p50/p95)과 주요 카운터를 여러 줄 텍스트로"""
+    from metrics import metrics
+    lines = []
+    for label, name in STATS_TIMINGS:
+        summary = metrics.summary(name)
+        if summary["count"]:
+            lines.append(f"{label}: {summary['p50'] * 1000:.0f}/{summary['p95'] * 1000:.0f}ms ({summary['count']})")
+        else:
+            lines.append(f"{label}: -")
+    frames = metrics.total("frames")
+    skipped = metrics.total("frames_skipped")
+    lines.append(f"프레임 {frames}, 건너뜀 {skipped}")
+    lookups = metrics.total("translation_lookups")
+    if lookups:
+        cached = metrics.total("translation_lookups", result="cache") + metrics.total("translation_lookups", result="memory")
+        lines.append(f"캐시 적중 {cached * 100 / lookups:.0f}% ({lookups}건)")
+    lines.append(f"엔진 전송 {metrics.total('engine_chars')}자, 오류 {metrics.total('errors')}")
+    return "\n".join(lines)
+
+def get_reader_status():
+    """OCR 리더 준비 상태 (OCR 모듈을 아직 불러오는 중이면 'loading')"""
+    if _ocr_module is None:
+        return "loading"
+    return _ocr_module.get_reader_status()
+
+def get_overlay_position(name="main"):
+    """오버레이 창 위치 (추가 오버레이는 OVERLAY_POSITIONS, 없으면 기본 오버레이 위쪽에 쌓음)"""
+    x, y = get_setting("OUTPUT_POSITION", (600, 850))
+    if name == "main":
+        return x, y
+    positions = get_setting("OVERLAY_POSITIONS", {})
+    if name in positions:
+        return tuple(positions[name])
+    from regions import overlay_targets
+    targets = [t for t in overlay_targets() if t != "main"]
+    index = targets.index(name) + 1 if name in targets else 1
+    return x, max(y - index * (get_setting("OVERLAY_HEIGHT", 120) + 10), 0)
+
+def set_overlay_position(name, pos):
+    """오버레이 창 위치 설정 저장"""
+    if name == "main":
+        update_setting("OUTPUT_POSITION", pos)
+    else:
+        positions = dict(get_setting("OVERLAY_POSITIONS", {}))
+        positions[name] = list(pos)
+        update_setting("OVERLAY_POSITIONS", positions)
+
+def create_overlay_window(name="main"):
     """오버레이 윈도우 생성 (크기 조절 가능)"""
     overlay = tk.Toplevel()
     overlay.overrideredirect(True)
     overlay.attributes("-topmost", True)
     overlay.attributes("-alpha", 0.8)
     
-    x, y = get_setting("OUTPUT_POSITION", (600, 850))
+    x, y = get_overlay_position(name)
     width = get_setting("OVERLAY_WIDTH", 800)
     height = get_setting("OVERLAY_HEIGHT", 120)
     overlay.geometry(f"{width}x{height}+{x}+{y}")
@@ -57,8 +143,9 @@ def create_overlay_window():
         y = overlay.winfo_y() + deltay
         overlay.geometry(f"+{x}+{y}")
         
-        # 위치 설정 업데이트
-        update_setting("OUTPUT_POSITION", (x, y))
+        # 위치 설정 업데이트 (드래그가 멈추면 한 번에 저장)
+        set_overlay_position(name, (x, y))
+        save_settings()
     
     # 상단 드래그 바
     drag_bar = tk.Frame(overlay, height=8, bg="gray", cursor="fleur")
@@ -100,8 +187,8 @@ def create_overlay_window():
             label.config(wraplength=new_width-20)
             
             # 설정 저장
-            update_setting("OVERLAY_WIDTH", new_width)
-            update_setting("OVERLAY_HEIGHT", new_height)
+            update_settings({"OVERLAY_WIDTH": new_width, "OVERLAY_HEIGHT": new_height})
+            save_settings()
         
         # 이벤트 바인딩
         resize_handle.bind("<Button-1>", start_resize)
@@ -114,7 +201,7 @@ def create_overlay_window():
     
     # 오버레이 설정 업데이트 함수
     def update_overlay_position():
-        x, y = get_setting("OUTPUT_POSITION", (600, 850))
+        x, y = get_overlay_position(name)
         width = get_setting("OVERLAY_WIDTH", 800)
         height = get_setting("OVERLAY_HEIGHT", 120)
         overlay.geometry(f"{width}x{height}+{x}+{y}")
@@ -123,12 +210,26 @@ def create_overlay_window():
     # 오버레이 객체에 업데이트 함수 추가
     overlay.update_position = update_overlay_position
     
+    # 위치/크기 설정이 바뀌면 (다른 오버레이 크기 조절, 위치 재설정 등) 바로 반영
+    def on_overlay_settings(changes):
+        x, y = get_overlay_position(name)
+        geometry = f"{get_setting('OVERLAY_WIDTH', 800)}x{get_setting('OVERLAY_HEIGHT', 120)}+{x}+{y}"
+        if overlay.winfo_exists() and overlay.geometry() != geometry:
+            update_overlay_position()
+    
+    unsubscribe = subscribe(("OUTPUT_POSITION", "OVERLAY_POSITIONS", "OVERLAY_WIDTH", "OVERLAY_HEIGHT"),
+                            lambda changes: overlay.after(0, on_overlay_settings, changes))
+    overlay.bind("<Destroy>", lambda event: unsubscribe() if event.widget is overlay else None)
+    
     return overlay, label
 
 def select_area(callback):
     """마우스로 드래그해서 영역 선택 (다중 모니터 지원)"""
     import tkinter as tk
     
+    # DPI 배율은 처음 영역을 선택할 때 한 번만 측정
+    dpi_scale = ensure_dpi_scale()
+    
     # 전체 가상 화면 크기 가져오기
     try:
         root = tk.Tk()
@@ -172,11 +273,11 @@ def select_area(callback):
                 virtual_width = max_right - min_left
                 virtual_height = max_bottom - min_top
                 
-                print(f"[📏 다중 모니터 감지] 가상 화면 크기: {virtual_width}x{virtual_height}")
+                log.info("[📏 다중 모니터 감지] 가상 화면 크기: %dx%d", virtual_width, virtual_height)
             
         except Exception as e:
             # 다중 모니터 정보를 가져오지 못한 경우 기본값 사용
-            print(f"[⚠️ 다중 모니터 정보 가져오기 실패]: {e}")
+            log.warning("[⚠️ 다중 모니터 정보 가져오기 실패]: %s", e)
         
         root.destroy()
     except:
@@ -216,14 +317,14 @@ def select_area(callback):
         x2, y2 = max(start_x, end_x), max(start_y, end_y)
         
         # DPI 배율 적용
-        dpi_scale = get_setting("DPI_SCALE", 1.0)
         if dpi_scale != 1.0:
             # 실제 화면 좌표로 변환
             x1 = int(x1 * dpi_scale)
             y1 = int(y1 * dpi_scale)
             x2 = int(x2 * dpi_scale)
             y2 = int(y2 * dpi_scale)
-            print(f"[🔍 DPI 배율 적용] 원본: ({x1/dpi_scale}, {y1/dpi_scale}) - ({x2/dpi_scale}, {y2/dpi_scale}), 변환: ({x1}, {y1}) - ({x2}, {y2})")
+            log.debug("[🔍 DPI 배율 적용] 원본: (%s, %s) - (%s, %s), 변환: (%s, %s) - (%s, %s)",
+                      x1 / dpi_scale, y1 / dpi_scale, x2 / dpi_scale, y2 / dpi_scale, x1, y1, x2, y2)
         
         temp.destroy()
         callback((x1, y1, x2, y2))
@@ -274,8 +375,8 @@ def open_settings_window(parent, overlay_label):
     tk.Checkbutton(win, text="GPU 사용 (속도 향상)", 
                    variable=gpu_var).grid(row=2, column=0, columnspan=2, sticky="w", pady=4)
     
-    # OCR 주기 설정
-    tk.Label(win, text="OCR 주기 (초)").grid(row=3, column=0, sticky="e", pady=4)
+    # OCR 주기 설정 (적응형 주기가 켜져 있으면 화면이 그대로일 때의 가장 느린 주기)
+    tk.Label(win, text="OCR 주기 (초, 최대)").grid(row=3, column=0, sticky="e", pady=4)
     interval_spin = tk.Spinbox(win, from_=0.1, to=10.0, increment=0.1, format="%.1f")
     interval_spin.delete(0, "end")
     interval_spin.insert(0, get_setting("OCR_INTERVAL"))
@@ -308,21 +409,21 @@ def open_settings_window(parent, overlay_label):
     
     # 저장 버튼
     def save_and_close():
-        update_setting("HOTKEY", hotkey_entry.get().strip())
-        update_setting("GLOBAL_HOTKEY", global_hotkey_var.get())
-        update_setting("USE_GPU", gpu_var.get())
-        update_setting("OCR_INTERVAL", float(interval_spin.get()))
-        # "ENGINE" 설정 저장 부분 제거
-        update_setting("AUTO_DETECT_LANG", auto_detect_var.get())
-        update_setting("SOURCE_LANG", source_var.get())
-        update_setting("TARGET_LANG", target_var.get())
+        # 한 번에 반영: 바뀐 설정에 해당하는 부분만 다시 구성됨
+        # (언어/GPU가 바뀐 경우에만 OCR 리더 교체, 단축키만 바뀌면 단축키만 다시 등록)
+        update_settings({
+            "HOTKEY": hotkey_entry.get().strip(),
+            "GLOBAL_HOTKEY": global_hotkey_var.get(),
+            "USE_GPU": gpu_var.get(),
+            "OCR_INTERVAL": float(interval_spin.get()),
+            "AUTO_DETECT_LANG": auto_detect_var.get(),
+            "SOURCE_LANG": source_var.get(),
+            "TARGET_LANG": target_var.get(),
+        })
         
         # 설정 저장
         save_settings()
         
-        # 필요시 OCR 리더 재초기화
-        reinit_ocr_reader()
-        
         win.destroy()
     
     tk.Button(win, text="저장", command=save_and_close).grid(row=7, column=0, columnspan=2, pady=10)
@@ -370,6 +471,8 @@ def create_main_window():
     translating = False
     overlay, overlay_label = create_overlay_window()
     overlay.withdraw()  # 초기에는 숨김
+    # 영역별 추가 오버레이 창 {이름: (창, 레이블)} (번역 시작 시 필요한 것만 생성)
+    extra_overlays = {}
     
     win = tk.Toplevel()
     win.title("간소화된 OCR 번역기")
@@ -410,36 +513,88 @@ def create_main_window():
     
     def update_status(running):
         engine = get_setting("ENGINE").upper()
-        status.config(
-            text=f"🟢 번역 켬 ({engine})" if running else "⚫ 번역 미사용",
-            bg="#3cb043" if running else "#888888"
-        )
+        if running:
+            status.config(text=f"🟢 번역 켬 ({engine})", bg="#3cb043")
+        else:
+            reader = get_reader_status()
+            if reader == "loading":
+                status.config(text="⏳ OCR 모델 로딩 중...", bg="#c98a00")
+            elif reader == "failed":
+                status.config(text="⚠️ OCR 초기화 실패", bg="#b03c3c")
+            else:
+                status.config(text="⚫ 번역 미사용", bg="#888888")
         toggle_btn.config(text="⏸️ 번역 중단" if running else "▶️ 번역 시작")
     
+    # OCR 리더 준비 상태 표시 (로딩이 끝날 때까지 주기적으로 확인)
+    def refresh_reader_status():
+        update_status(translating)
+        if get_reader_status() == "loading":
+            win.after(300, refresh_reader_status)
+    
+    win.after(300, refresh_reader_status)
+    
+    def stop_translation():
+        nonlocal translating
+        translating = False
+        get_ocr().stop_ocr()
+        overlay.withdraw()
+        for extra, _ in extra_overlays.values():
+            extra.withdraw()
+        update_status(False)
+    
+    # 파이프라인이 스스로 멈추면 (캡처 백엔드 초기화 실패 등) 버튼/상태를 되돌리고 이유 표시
+    def watch_pipeline():
+        if not translating:
+            return
+        ocr = get_ocr()
+        if ocr.ocr_running:
+            win.after(1000, watch_pipeline)
+            return
+        error = ocr.get_pipeline_error()
+        stop_translation()
+        if error:
+            messagebox.showerror("오류", f"번역이 중단되었습니다: {error}")
+    
     def toggle_translate():
         nonlocal translating
         
         try:
             if translating:
-                translating = False
-                stop_ocr()
-                overlay.withdraw()
-                update_status(False)
+                stop_translation()
             else:
-                if not get_setting("OCR_REGION"):
+                if not get_setting("OCR_REGION") and not get_setting("OCR_REGIONS"):
                     messagebox.showerror("오류", "OCR 영역이 설정되지 않았습니다. OCR 위치 재설정을 먼저 해주세요.")
                     return
                 
+                # 아직 백그라운드에서 불러오는 중이면 끝날 때까지 기다림
+                ocr = get_ocr()
+                from regions import overlay_targets
+                from translator import prewarm_async
+                
                 translating = True
                 engine = engine_var.get()
-                update_setting("ENGINE", engine)
+                if engine == get_setting("ENGINE"):
+                    prewarm_async(engine)
+                else:
+                    # 엔진이 바뀌면 번역 모듈이 변경 알림을 받고 새 서버에 미리 연결
+                    update_setting("ENGINE", engine)
                 
-                start_ocr_thread(overlay_label)
-                overlay.deiconify()
-                x, y = get_setting("OUTPUT_POSITION")
-                overlay.geometry(f"800x120+{x}+{y}")
+                # 영역마다 지정한 오버레이 창 준비
+                for name in overlay_targets():
+                    if name != "main" and name not in extra_overlays:
+                        extra_overlays[name] = create_overlay_window(name)
+                targets = overlay_targets()
+                ocr.start_ocr_thread(overlay_label, {name: extra_overlays[name][1] for name in targets if name != "main"})
+                if "main" in targets:
+                    overlay.deiconify()
+                    x, y = get_setting("OUTPUT_POSITION")
+                    overlay.geometry(f"800x120+{x}+{y}")
+                for name in targets:
+                    if name != "main":
+                        extra_overlays[name][0].deiconify()
                 
                 update_status(True)
+                win.after(1000, watch_pipeline)
         except Exception as e:
             messagebox.showerror("오류", f"번역 시작 중 오류가 발생했습니다: {str(e)}")
     
@@ -484,11 +639,42 @@ def create_main_window():
     # 설정 버튼
     tk.Button(content_frame, text="⚙️ 설정", command=lambda: open_settings_window(win, overlay_label), width=20).pack(pady=5)
     
+    # 성능 통계 (p50/p95 ms, 표본 수), 펼쳐져 있을 때만 1초마다 갱신
+    stats_label = tk.Label(content_frame, justify="left", anchor="w", font=("Consolas", 8))
+    stats_visible = False
+    
+    def refresh_stats():
+        if not stats_visible:
+            return
+        stats_label.config(text=format_metrics_text())
+        win.after(1000, refresh_stats)
+    
+    def toggle_stats():
+        nonlocal stats_visible
+        stats_visible = not stats_visible
+        if stats_visible:
+            stats_label.pack(after=stats_btn, pady=5, fill="x")
+            refresh_stats()
+        else:
+            stats_label.pack_forget()
+    
+    stats_btn = tk.Button(content_frame, text="📊 성능 통계", command=toggle_stats, width=20)
+    stats_btn.pack(pady=5)
+    
     # 종료 버튼
     def quit_program():
-        stop_ocr()
+        if _ocr_module is not None:
+            _ocr_module.stop_ocr()
+            _ocr_module.close_process_pool()
+        flush_settings()
+        from metrics import stop_metrics_export
+        stop_metrics_export()
         win.destroy()
         overlay.destroy()
+        for extra, _ in extra_overlays.values():
+            extra.destroy()
+        # os._exit는 atexit를 건너뛰므로 쌓인 로그를 먼저 기록
+        shutdown_logging()
         os._exit(0)
     
     tk.Button(content_frame, text="❌ 프로그램 종료", command=quit_program, width=20).pack(pady=5)
@@ -501,32 +687,44 @@ def create_main_window():
     # 종료 시 정리
     win.protocol("WM_DELETE_WINDOW", quit_program)
     
+    hotkey_lock = threading.Lock()
+    
     def register_hotkey():
+        with hotkey_lock, phase("단축키 등록"):
+            register_hotkey_locked()
+    
+    def register_hotkey_locked():
         try:
+            # keyboard 모듈은 후킹을 설치하므로 처음 등록할 때 불러옴
+            import keyboard
+            
             # 기존 단축키 제거
             try:
                 keyboard.unhook_all_hotkeys()
-                print("[✅ 기존 단축키 제거됨]")
+                log.debug("[✅ 기존 단축키 제거됨]")
             except Exception as e:
-                print(f"[⚠️ 기존 단축키 제거 실패] {e}")
+                log.warning("[⚠️ 기존 단축키 제거 실패] %s", e)
             
             # 새 단축키 등록
             hotkey = get_setting("HOTKEY", "f8")
-            print(f"[🔍 단축키 등록 시도] 키: {hotkey}")
+            log.debug("[🔍 단축키 등록 시도] 키: %s", hotkey)
             
             # 직접 함수 참조로 변경 (toggle_btn.invoke 대신)
             keyboard.add_hotkey(hotkey, toggle_translate)
-            print(f"[✅ 단축키 '{hotkey}' 등록됨]")
+            log.info("[✅ 단축키 '%s' 등록됨]", hotkey)
             
             # 테스트용 추가 코드 - 잘 작동하는지 확인하기 위한 임시 코드
-            keyboard.add_hotkey('ctrl+shift+t', lambda: print("테스트 핫키 작동 확인!"))
+            keyboard.add_hotkey('ctrl+shift+t', lambda: log.info("테스트 핫키 작동 확인!"))
             
         except Exception as e:
-            print(f"[⚠️ 단축키 등록 실패] {e}")
-            print(traceback.format_exc())  # 전체 오류 스택 표시
+            log.exception("[⚠️ 단축키 등록 실패] %s", e)  # 전체 오류 스택 기록
+    
+    # 초기 단축키 등록 (창 표시를 늦추지 않도록 백그라운드, 단축키 설정이 바뀌면 다시 등록)
+    def register_hotkey_async():
+        threading.Thread(target=register_hotkey, name="hotkey-register", daemon=True).start()
     
-    # 초기 단축키 등록
-    register_hotkey()
+    register_hotkey_async()
+    subscribe(("HOTKEY", "GLOBAL_HOTKEY"), lambda changes: register_hotkey_async())
 
         # 프레임 크기가 변경될 때 캔버스 스크롤 영역 업데이트
     def on_frame_configure(event):
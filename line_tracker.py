@@ -0,0 +1,134 @@
+# line_tracker.py - 검출한 글자 상자 재사용 + 바뀐 줄만 다시 인식
+import zlib
+from collections import OrderedDict
+import numpy as np
+from preprocess import to_gray, text_row_runs
+
+# 배치가 바뀌었다고 볼 최소 이동량(px)
+LAYOUT_TOLERANCE = 6
+# 줄 이미지 해시 → 인식 결과 캐시 크기
+CROP_CACHE_SIZE = 512
+
+def layout_signature(gray):
+    """줄 배치 요약: 글자 행 구간마다 (위, 아래, 왼쪽 끝, 오른쪽 끝)"""
+    background = int(np.median(gray[::4, ::4]))
+    signature = []
+    for start, end in text_row_runs(gray):
+        band = np.abs(gray[start:end].astype(np.int16) - background) > 40
+        cols = np.flatnonzero(band.any(axis=0))
+        if cols.size:
+            signature.append((start, end, int(cols[0]), int(cols[-1])))
+    return signature
+
+def layout_changed(old, new, tolerance=LAYOUT_TOLERANCE):
+    """두 배치 요약이 허용 오차 이상 다른지"""
+    if old is None or len(old) != len(new):
+        return True
+    for a, b in zip(old, new):
+        if any(abs(x - y) > tolerance for x, y in zip(a, b)):
+            return True
+    return False
+
+def crop_hash(gray, box):
+    """줄 이미지 해시 (상자 크기 포함)"""
+    x_min, x_max, y_min, y_max = box
+    crop = np.ascontiguousarray(gray[max(y_min, 0):y_max, max(x_min, 0):x_max])
+    return (crop.shape, zlib.crc32(crop.data))
+
+def _box_top_left(result_box):
+    """recognize 결과 상자 [[x, y] × 4]의 왼쪽 위 좌표"""
+    return result_box[0][0], result_box[0][1]
+
+def _corners(box):
+    """[x_min, x_max, y_min, y_max] → readtext 형식 꼭짓점 목록"""
+    x_min, x_max, y_min, y_max = box
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+
+class LineTracker:
+    """easyocr의 검출(detect)과 인식(recognize)을 나눠서 실행
+
+    - 줄 배치가 그대로면 이전에 검출한 상자를 재사용한다 (CRAFT 검출 생략).
+    - 상자별 줄 이미지 해시가 같으면 이전 인식 결과를 재사용한다.
+    - fixed_boxes를 주면 검출 없이 해당 상자만 인식한다.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.reader_id = None
+        self.layout = None
+        self.boxes = None          # [[x_min, x_max, y_min, y_max], ...]
+        self.free_boxes = []       # 기울어진 상자 (매번 인식)
+        self._crop_cache = OrderedDict()
+        self.detections = 0
+        self.detections_skipped = 0
+        self.lines_recognized = 0
+        self.lines_reused = 0
+
+    def _remember(self, key, value):
+        self._crop_cache[key] = value
+        self._crop_cache.move_to_end(key)
+        while len(self._crop_cache) > CROP_CACHE_SIZE:
+            self._crop_cache.popitem(last=False)
+
+    def _detect(self, reader, image):
+        horizontal_list, free_list = reader.detect(image)
+        self.detections += 1
+        return [list(map(int, box)) for box in horizontal_list[0]], free_list[0]
+
+    def read(self, reader, image, fixed_boxes=None):
+        """(상자, 텍스트, 신뢰도) 목록 반환 (readtext(detail=1)과 같은 형식)"""
+        if id(reader) != self.reader_id:
+            # 리더(언어)가 바뀌면 인식 결과 캐시는 쓸 수 없음
+            self.reset()
+            self.reader_id = id(reader)
+        gray = to_gray(image)
+
+        if fixed_boxes:
+            boxes, free_boxes = fixed_boxes, []
+        else:
+            layout = layout_signature(gray)
+            if self.boxes is None or layout_changed(self.layout, layout):
+                self.boxes, self.free_boxes = self._detect(reader, image)
+                self.layout = layout
+            else:
+                self.detections_skipped += 1
+            boxes, free_boxes = self.boxes, self.free_boxes
+
+        results = {}
+        changed = []
+        for i, box in enumerate(boxes):
+            key = crop_hash(gray, box)
+            cached = self._crop_cache.get(key)
+            if cached is not None:
+                self._crop_cache.move_to_end(key)
+                results[i] = (_corners(box), cached[0], cached[1])
+                self.lines_reused += 1
+            else:
+                changed.append((i, box, key))
+
+        if changed:
+            recognized = reader.recognize(gray, horizontal_list=[box for _, box, _ in changed],
+                                          free_list=[], detail=1)
+            # recognize는 결과를 위치순으로 정렬하므로 왼쪽 위 좌표로 원래 상자와 대응
+            for result_box, text, conf in recognized:
+                rx, ry = _box_top_left(result_box)
+                i, box, key = min(changed, key=lambda c: abs(max(c[1][0], 0) - rx) + abs(max(c[1][2], 0) - ry))
+                results[i] = (_corners(box), text, conf)
+                self._remember(key, (text, conf))
+            self.lines_recognized += len(changed)
+
+        ordered = [results[i] for i in sorted(results, key=lambda i: (boxes[i][2], boxes[i][0]))]
+        if free_boxes:
+            ordered.extend(reader.recognize(gray, horizontal_list=[], free_list=free_boxes, detail=1))
+        return ordered
+
+    def stats(self):
+        """검출/인식 재사용 통계"""
+        return {
+            "detections": self.detections,
+            "detections_skipped": self.detections_skipped,
+            "lines_recognized": self.lines_recognized,
+            "lines_reused": self.lines_reused,
+        }
@@ -1,27 +1,33 @@
 # main.py - 프로그램 시작점 (아이콘 제거, 블로그 자동 열기 추가)
+import sys
+import threading
+
+# --profile-startup: 단계별/임포트별 시작 시간 출력 (이후 임포트가 기록되도록 가장 먼저 켬)
+from startup_profile import profiler, phase
+if "--profile-startup" in sys.argv[1:]:
+    profiler.enable()
+
 import tkinter as tk
-import traceback
 import time
-import os
-import sys
 import webbrowser
+from app_log import get_logger, setup_logging, set_log_level
 
-# 로그 기록 함수 정의
-def write_log(message):
-    try:
-        with open("debug_log.txt", "a", encoding="utf-8") as log_file:
-            log_file.write(f"{message}\n")
-        print(message)  # 콘솔에도 출력
-    except Exception as e:
-        print(f"로그 기록 실패: {e}")
+log = get_logger("main")
+
+def init_logging():
+    """설정에 맞게 로그 시작 (백그라운드 기록 스레드, 이전 실행 로그는 로테이션해서 보관)
 
-# 초기 로그 파일 생성
-try:
-    with open("debug_log.txt", "w", encoding="utf-8") as log_file:
-        log_file.write(f"프로그램 시작: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    write_log("로그 파일 생성 완료")
-except Exception as e:
-    print(f"로그 파일 생성 실패: {e}")
+    OCR 작업자 프로세스가 이 모듈을 다시 불러올 때 로그 파일을 건드리지 않도록 진입점에서만 호출한다.
+    """
+    from config import get_setting, subscribe
+    setup_logging(
+        path=get_setting("LOG_FILE", "debug_log.txt"),
+        level=get_setting("LOG_LEVEL", "INFO"),
+        max_bytes=get_setting("LOG_MAX_BYTES", 2 * 1024 * 1024),
+        backups=get_setting("LOG_BACKUPS", 3),
+    )
+    subscribe("LOG_LEVEL", lambda changes: set_log_level(changes["LOG_LEVEL"]))
+    log.info("프로그램 시작: %s", time.strftime('%Y-%m-%d %H:%M:%S'))
 
 # 전역 변수
 root = None
@@ -31,50 +37,65 @@ overlay_label = None
 toggle_button = None
 register_hotkey_func = None
 
+def open_blog():
+    """블로그 자동 열기 (브라우저 실행이 창 표시를 늦추지 않도록 백그라운드에서)"""
+    try:
+        webbrowser.open("https://sonagi-psy.tistory.com/15")
+        log.info("[🔗 광고 후원 블로그 자동 오픈됨]")
+    except Exception as e:
+        log.warning("[⚠️ 블로그 열기 실패]: %s", e)
+
+def on_window_shown():
+    """메인 창이 뜬 뒤: 프로파일 출력, 블로그 열기, 지표 내보내기 시작, OCR 모듈/리더 백그라운드 로드"""
+    from gui import preload_ocr_async
+    profiler.mark("메인 창 표시")
+    profiler.report("메인 창 표시까지")
+    threading.Thread(target=open_blog, name="open-blog", daemon=True).start()
+    # 지표 파일/HTTP 내보내기 (설정에서 켠 경우)
+    from metrics import start_metrics_export
+    start_metrics_export()
+    # OCR 모듈(numpy/OpenCV/easyocr)과 모델은 창을 띄운 뒤 백그라운드에서 로드
+    preload_ocr_async(on_done=lambda: profiler.report("백그라운드 로딩 완료"))
+    log.info("[⏳ OCR 모듈/리더 백그라운드 로드 시작]")
+
 def main():
     global root, main_window, overlay, overlay_label, toggle_button, register_hotkey_func
     
     try:
-        write_log("[main 함수 시작]")
-        
-        # 블로그 자동 열기
-        try:
-            webbrowser.open("https://sonagi-psy.tistory.com/15")
-            write_log("[🔗 광고 후원 블로그 자동 오픈됨]")
-        except Exception as e:
-            write_log(f"[⚠️ 블로그 열기 실패]: {e}")
+        log.info("[main 함수 시작]")
         
-        # 기본 모듈 임포트
+        # 기본 모듈 임포트 (설정은 config 임포트 시 로드됨, OCR 모듈은 창을 띄운 뒤 로드)
         try:
-            from config import load_settings
-            from gui import create_main_window
+            with phase("GUI 모듈 임포트"):
+                from config import set_dpi_awareness
+                from gui import create_main_window
             
-            write_log("[✅ 기본 모듈 임포트 완료]")
+            log.info("[✅ 기본 모듈 임포트 완료]")
         except Exception as e:
-            write_log(f"[⚠️ 모듈 임포트 오류]: {e}")
-            write_log(traceback.format_exc())
+            log.exception("[⚠️ 모듈 임포트 오류]: %s", e)
             raise
         
-        # GUI 메인 루트 생성
-        root = tk.Tk()
-        root.withdraw()  # 메인 루트 숨기기
-        write_log("[✅ Tkinter 루트 초기화 완료]")
+        # DPI 인식 모드는 창을 만들기 전에 설정 (배율 측정은 영역 선택 시)
+        set_dpi_awareness()
         
-        # 설정 로드
-        load_settings()
-        write_log("[✅ 설정 로드 완료]")
+        # GUI 메인 루트 생성
+        with phase("Tk 루트 생성"):
+            root = tk.Tk()
+            root.withdraw()  # 메인 루트 숨기기
+        log.info("[✅ Tkinter 루트 초기화 완료]")
         
         # 메인 창 생성
-        main_window, overlay, overlay_label, toggle_button, register_hotkey_func = create_main_window()
-        write_log("[✅ 메인 창 생성 완료]")
+        with phase("메인 창 생성"):
+            main_window, overlay, overlay_label, toggle_button, register_hotkey_func = create_main_window()
+        log.info("[✅ 메인 창 생성 완료]")
+        root.after(0, on_window_shown)
         
         # GUI 루프 실행
-        write_log("[✅ GUI 메인 루프 시작]")
+        log.info("[✅ GUI 메인 루프 시작]")
         root.mainloop()
         
     except Exception as e:
-        write_log(f"[⚠️ main 함수 실행 중 오류 발생]: {e}")
-        write_log(traceback.format_exc())
+        log.exception("[⚠️ main 함수 실행 중 오류 발생]: %s", e)
         
         try:
             from tkinter import messagebox
@@ -85,16 +106,20 @@ def main():
         except:
             pass
     finally:
-        write_log("[종료됨]")
-        write_log(f"[로그 종료] {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        log.info("[종료됨]")
+        log.info("[로그 종료] %s", time.strftime('%Y-%m-%d %H:%M:%S'))
 
 if __name__ == "__main__":
+    # OCR 작업자 프로세스(spawn)를 exe 패키징 환경에서도 쓸 수 있도록
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
-        write_log("[프로그램 진입점 실행]")
+        with phase("설정 모듈 임포트/로그 시작"):
+            init_logging()
+        log.info("[프로그램 진입점 실행]")
         main()
     except Exception as e:
-        write_log(f"[⚠️ 예상치 못한 오류 발생]: {e}")
-        write_log(traceback.format_exc())
+        log.exception("[⚠️ 예상치 못한 오류 발생]: %s", e)
         
         try:
             from tkinter import messagebox
@@ -0,0 +1,357 @@
+# metrics.py - 단계별 성능 지표 (지연 시간 히스토그램, 카운터, 파일/로컬 HTTP 내보내기)
+#
+# 캡처/OCR/번역/오버레이 갱신 중 어디가 느린지 보기 위한 지표.
+# 기록은 잠금 한 번과 덧셈 몇 번이라 매 프레임 호출해도 부담이 없고,
+# 백분위수는 최근 표본(window개)으로 통계 창이나 내보내기 때만 계산한다.
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app_log import get_logger
+
+log = get_logger("metrics")
+
+PREFIX = "ocr_translator_"
+# 지연 시간 버킷 경계(초), Prometheus 히스토그램과 같은 누적 방식
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _percentile(values, q):
+    """정렬된 값 목록의 백분위수 (비어 있으면 0)"""
+    if not values:
+        return 0.0
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+class Histogram:
+    """지연 시간 히스토그램: 전체 누적 버킷 + 최근 window개 표본"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=512):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)   # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.bucket_counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _summarize(recent, count, total):
+    values = sorted(recent)
+    return {
+        "count": count,
+        "sum": total,
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "max": values[-1] if values else 0.0,
+    }
+
+class Metrics:
+    """지표 저장소 (이름 + 레이블별 히스토그램/카운터, 읽을 때 값을 계산하는 게이지)"""
+
+    def __init__(self, window=512):
+        self.enabled = True
+        self.window = window
+        self._lock = threading.Lock()
+        self._histograms = {}   # (이름, 레이블) → Histogram
+        self._counters = {}     # (이름, 레이블) → 값
+        self._gauges = {}       # 이름 → 함수 ({레이블 dict 튜플: 값} 또는 숫자 반환)
+        self._help = {}
+        self.started = time.time()
+
+    def describe(self, name, text):
+        """내보낼 때 붙일 설명"""
+        self._help[name] = text
+
+    def observe(self, name, seconds, **labels):
+        """지연 시간(초) 기록"""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(window=self.window)
+            histogram.observe(seconds)
+
+    def inc(self, name, n=1, **labels):
+        """카운터 증가"""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 시간을 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def gauge(self, name, func):
+        """읽을 때마다 func()로 값을 구하는 게이지 등록 (func는 숫자나 {레이블 튜플: 값} 반환)"""
+        with self._lock:
+            self._gauges[name] = func
+
+    def summary(self, name, **match):
+        """이름이 같은 히스토그램을 (레이블이 match와 맞는 것만) 합친 요약"""
+        wanted = set(_label_key(match))
+        recent, count, total = [], 0, 0.0
+        with self._lock:
+            for (key_name, labels), histogram in self._histograms.items():
+                if key_name == name and wanted <= set(labels):
+                    recent.extend(histogram.recent)
+                    count += histogram.count
+                    total += histogram.sum
+        return _summarize(recent, count, total)
+
+    def total(self, name, **match):
+        """이름이 같은 카운터를 (레이블이 match와 맞는 것만) 합친 값"""
+        wanted = set(_label_key(match))
+        with self._lock:
+            return sum(value for (key_name, labels), value in self._counters.items()
+                       if key_name == name and wanted <= set(labels))
+
+    def _gauge_values(self):
+        with self._lock:
+            gauges = list(self._gauges.items())
+        values = []
+        for name, func in gauges:
+            try:
+                value = func()
+            except Exception as e:
+                log.debug("[⚠️ 게이지 읽기 실패] %s: %s", name, e)
+                continue
+            if isinstance(value, dict):
+                values.extend((name, labels, v) for labels, v in value.items())
+            else:
+                values.append((name, (), value))
+        return values
+
+    def snapshot(self):
+        """모든 지표를 JSON으로 바꿀 수 있는 dict로 반환"""
+        with self._lock:
+            histograms = [(name, labels, h.buckets, list(h.bucket_counts), list(h.recent), h.count, h.sum)
+                          for (name, labels), h in self._histograms.items()]
+            counters = list(self._counters.items())
+        result = {"time": time.time(), "uptime": time.time() - self.started,
+                  "histograms": [], "counters": [], "gauges": []}
+        for name, labels, buckets, bucket_counts, recent, count, total in sorted(histograms):
+            entry = {"name": name, "labels": dict(labels)}
+            entry.update(_summarize(recent, count, total))
+            entry["buckets"] = dict(zip([str(b) for b in buckets] + ["+Inf"], bucket_counts))
+            result["histograms"].append(entry)
+        for (name, labels), value in sorted(counters):
+            result["counters"].append({"name": name, "labels": dict(labels), "value": value})
+        for name, labels, value in self._gauge_values():
+            result["gauges"].append({"name": name, "labels": dict(labels), "value": value})
+        return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식"""
+        snapshot = self.snapshot()
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name in typed:
+                return
+            typed.add(name)
+            if name in self._help:
+                lines.append(f"# HELP {PREFIX}{name} {self._help[name]}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        def label_text(labels, extra=None):
+            items = list(labels.items()) + ([extra] if extra else [])
+            if not items:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+        for entry in snapshot["histograms"]:
+            name, labels = entry["name"], entry["labels"]
+            header(name, "histogram")
+            cumulative = 0
+            for bound, n in entry["buckets"].items():
+                cumulative += n
+                lines.append(f"{PREFIX}{name}_bucket{label_text(labels, ('le', bound))} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{label_text(labels)} {entry['sum']:.6f}")
+            lines.append(f"{PREFIX}{name}_count{label_text(labels)} {entry['count']}")
+        for entry in snapshot["counters"]:
+            name = entry["name"]
+            header(name, "counter")
+            lines.append(f"{PREFIX}{name}_total{label_text(entry['labels'])} {entry['value']}")
+        for entry in snapshot["gauges"]:
+            name = entry["name"]
+            header(name, "gauge")
+            lines.append(f"{PREFIX}{name}{label_text(entry['labels'])} {entry['value']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def render(self, fmt):
+        return self.to_prometheus() if fmt == "prometheus" else self.to_json()
+
+# 전역 지표 저장소
+metrics = Metrics()
+observe = metrics.observe
+inc = metrics.inc
+timer = metrics.timer
+
+metrics.describe("capture_seconds", "화면 캡처 시간")
+metrics.describe("ocr_seconds", "영역 하나의 OCR 처리 시간 (화면이 바뀐 경우)")
+metrics.describe("translation_seconds", "번역 단계 시간 (캐시 조회 포함, 텍스트 전달부터 결과까지)")
+metrics.describe("engine_request_seconds", "번역 엔진 요청 시간")
+metrics.describe("overlay_update_seconds", "오버레이 레이블 갱신 시간 (Tk 스레드)")
+metrics.describe("pipeline_latency_seconds", "캡처부터 오버레이 표시까지 걸린 시간")
+metrics.describe("frames", "캡처한 프레임 수")
+metrics.describe("frames_skipped", "번역까지 가지 않은 프레임 수 (reason별)")
+metrics.describe("translation_lookups", "번역 조회 결과 (cache/memory/engine)")
+metrics.describe("engine_chars", "번역 엔진에 보낸 글자 수")
+metrics.describe("errors", "단계별 오류 수")
+
+class MetricsExporter:
+    """지표를 주기적으로 파일에 쓰거나 127.0.0.1:port 에서 HTTP로 제공
+
+    /metrics 는 Prometheus 텍스트, /metrics.json 은 JSON을 돌려준다.
+    """
+
+    def __init__(self, registry, path="", fmt="json", interval=10.0, port=0):
+        self.registry = registry
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self.port = port
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def start(self):
+        if self.path:
+            self._thread = threading.Thread(target=self._write_loop, name="metrics-export", daemon=True)
+            self._thread.start()
+        if self.port:
+            try:
+                self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+            except OSError as e:
+                log.warning("[⚠️ 지표 HTTP 서버 시작 실패] 포트 %d: %s", self.port, e)
+            else:
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+                log.info("[📈 지표 제공] http://127.0.0.1:%d/metrics", self.port)
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body, kind = registry.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/metrics.json":
+                    body, kind = registry.to_json(), "application/json; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                log.debug("[📈 지표 요청] " + format, *args)
+
+        return Handler
+
+    def write(self):
+        """지표를 파일에 저장 (임시 파일에 쓴 뒤 교체해서 읽는 쪽이 반쯤 쓴 파일을 보지 않게)"""
+        path = os.path.abspath(self.path)
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.registry.render(self.fmt))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except Exception as e:
+                log.warning("[⚠️ 지표 파일 저장 실패] %s: %s", self.path, e)
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None and self.path:
+            try:
+                self.write()   # 마지막 값 저장
+            except Exception:
+                pass
+
+# 설정으로 켜는 전역 내보내기
+EXPORT_SETTINGS = ("METRICS_ENABLED", "METRICS_WINDOW", "METRICS_EXPORT_FILE", "METRICS_EXPORT_FORMAT",
+                   "METRICS_EXPORT_SECONDS", "METRICS_PORT")
+_exporter = None
+_exporter_lock = threading.Lock()
+_subscribed = False
+
+def start_metrics_export():
+    """설정에 맞게 지표 기록/내보내기 시작 (설정이 바뀌면 다시 시작)"""
+    global _exporter, _subscribed
+    from config import get_setting, subscribe
+    with _exporter_lock:
+        if _exporter is not None:
+            _exporter.stop()
+            _exporter = None
+        metrics.enabled = get_setting("METRICS_ENABLED", True)
+        metrics.window = get_setting("METRICS_WINDOW", 512)
+        path = get_setting("METRICS_EXPORT_FILE", "")
+        port = get_setting("METRICS_PORT", 0)
+        if metrics.enabled and (path or port):
+            _exporter = MetricsExporter(metrics, path=path, fmt=get_setting("METRICS_EXPORT_FORMAT", "json"),
+                                        interval=get_setting("METRICS_EXPORT_SECONDS", 10.0), port=port)
+            _exporter.start()
+        if not _subscribed:
+            _subscribed = True
+            subscribe(EXPORT_SETTINGS, lambda changes: start_metrics_export())
+
+def stop_metrics_export():
+    global _exporter
+    with _exporter_lock:
+        if _exporter is not None:
+            _exporter.stop()
+            _exporter = None
@@ -1,165 +1,704 @@
 # ocr.py - OCR 기능 (OBS 제외)
 import time
-import pyautogui
 import numpy as np
 import threading
-import traceback
-from config import get_setting
-from translator import translate_text
+from concurrent.futures import ThreadPoolExecutor
+from config import get_setting, subscribe
+from app_log import get_logger, RateLimitedSummary
+from metrics import metrics
+from translator import translate_text, translate_batch
+from pipeline import LatestQueue
+from capture import create_capture_backend
+from async_translator import AsyncTranslationClient
+from reader_pool import ReaderPool, detect_script, langs_for_script, script_for_langs
+from preprocess import preprocess
+from onnx_backend import create_reader as create_easyocr_reader
+from ocr_engines import EasyOcrEngine, create_ocr_engine, get_lang, onnx_options
+from regions import OcrRegion, load_regions, union_box, slice_region
+
+log = get_logger("ocr")
 
 # 전역 변수
-ocr_thread = None
 ocr_running = False
 ocr_reader = None
-last_text = ""
 last_translated = ""
-repeat_count = 0
-MAX_REPEAT = 3
-
-def get_lang(lang_code):
-    """언어 코드에 따른 OCR 언어 목록 반환"""
-    if lang_code.startswith("ja"):
-        return ["ja", "en"]
-    elif lang_code.startswith("zh"):
-        return ["ch_sim", "en"]
-    elif lang_code.startswith("ko"):
-        return ["ko", "en"]
-    else:
-        return ["en"]
+pipeline_error = None   # 파이프라인이 스스로 멈춘 이유 (GUI에 표시)
+
+# OCR 리더 준비 상태 ('idle', 'loading', 'ready', 'failed')
+reader_status = "idle"
+_reader_lock = threading.Lock()
+# 영역별 인식 상태 (변화 감지, 검출 상자 재사용, 타일 추적, 문자 체계, 중복 감지)
+# 기본 영역은 OCR_REGION/OCR_INTERVAL/SOURCE_LANG 설정을 따름
+default_region = OcrRegion()
+change_detector = default_region.change_detector
+line_tracker = default_region.line_tracker
+tile_tracker = default_region.tile_tracker
+active_regions = [default_region]
+
+# 파이프라인 (캡처 → OCR → 번역 → 오버레이 갱신)
+# 실행마다 새 중지 이벤트와 큐를 만들어서, 멈추는 중인 이전 스레드와 섞이지 않게 함
+RENDER_POLL_MS = 50
+stop_event = threading.Event()
+pipeline_threads = []
+wake_event = threading.Event()            # 영역 처리가 끝나면 캡처 단계를 깨움
+frame_queue = LatestQueue(maxsize=1)      # (캡처 시각, 캡처 원점, 프레임)
+text_queue = LatestQueue(maxsize=1)       # (영역 이름, 오버레이 이름, OCR 텍스트), 영역별 최신 항목
+render_queue = LatestQueue(maxsize=1)     # (오버레이 이름, 번역 결과), 오버레이별 최신 항목
+
+# 프레임마다 로그를 남기는 대신 몇 초마다 한 줄로 요약 (프레임별 로그는 LOG_LEVEL이 DEBUG일 때만)
+frame_summary = RateLimitedSummary(log, "OCR 요약", {
+    "captured": "캡처",
+    "unchanged": "변화 없음",
+    "ocr": "인식",
+    "empty": "텍스트 없음",
+    "jitter": "흔들림 무시",
+    "new_text": "새 텍스트",
+    "translated": "번역",
+    "errors": "오류",
+}, interval=get_setting("LOG_SUMMARY_SECONDS", 10.0))
+
+def translate_for_overlay(text, source_lang=None):
+    """오버레이에 표시할 번역 (설정에 따라 줄 단위 묶음 번역, source_lang은 영역별 원본 언어)"""
+    if get_setting("TRANSLATE_PER_LINE", False):
+        # 줄마다 따로 번역하되 한 요청으로 묶어서 전송
+        return "\n".join(translate_batch(text.split("\n"), source_lang))
+    return translate_text(text, source_lang)
+
+# 새 텍스트가 들어오면 이전 번역 요청을 취소하는 비동기 번역 클라이언트
+translation_client = AsyncTranslationClient(translate_func=translate_for_overlay,
+                                            max_workers=get_setting("TRANSLATE_WORKERS", 4))
+
+def get_skip_stats():
+    """변화 감지로 생략된 OCR 횟수 통계 반환"""
+    return change_detector.stats()
+
+def get_pipeline_stats():
+    """단계 사이에서 버려진(오래된) 항목 수 반환"""
+    return {
+        "dropped_frames": frame_queue.dropped,
+        "dropped_texts": text_queue.dropped,
+        "dropped_renders": render_queue.dropped,
+    }
+
+metrics.describe("queue_dropped", "다음 단계가 밀려서 버려진 항목 수 (현재 실행 기준)")
+metrics.gauge("queue_dropped", lambda: {
+    (("queue", "frames"),): frame_queue.dropped,
+    (("queue", "texts"),): text_queue.dropped,
+    (("queue", "renders"),): render_queue.dropped,
+})
+
+# 작업자 프로세스 OCR 풀 (OCR_PROCESS_WORKERS > 0일 때 처음 리더를 만들 때 생성)
+process_pool = None
+_process_pool_lock = threading.Lock()
+
+def get_process_pool():
+    """OCR 작업자 프로세스 풀 반환 (사용하지 않도록 설정되어 있으면 None)"""
+    global process_pool
+    workers = get_setting("OCR_PROCESS_WORKERS", 0)
+    if not workers:
+        return None
+    with _process_pool_lock:
+        if process_pool is None:
+            from ocr_workers import ProcessOcrPool
+            process_pool = ProcessOcrPool(
+                workers=workers,
+                slots=get_setting("OCR_PROCESS_SLOTS", 2),
+                slot_mb=get_setting("OCR_PROCESS_SLOT_MB", 8),
+                timeout=get_setting("OCR_PROCESS_TIMEOUT", 30.0),
+                onnx=onnx_options(),
+            )
+            log.info("[✅ OCR 작업자 프로세스 시작] %d개", workers)
+        return process_pool
+
+def close_process_pool():
+    """OCR 작업자 프로세스 종료 (프로그램 종료 시)"""
+    global process_pool
+    with _process_pool_lock:
+        if process_pool is not None:
+            process_pool.close()
+            process_pool = None
+
+def create_reader(lang_list, use_gpu, engine="easyocr"):
+    """OCR 엔진 생성 + 워밍업 (실패 시 None)
+
+    easyocr 이외 엔진(tesseract 등)은 ocr_engines에서 생성한다 (torch를 불러오지 않음).
+    OCR_PROCESS_WORKERS가 1 이상이면 작업자 프로세스에 easyocr 리더를 올리고 대리 객체를 사용한다.
+    영역들이 기본으로 읽는 언어는 모든 작업자에 올려 여러 영역을 동시에 처리하고,
+    언어 탐색 등으로만 쓰는 언어는 작업자 하나에만 올린다 (작업자마다 모든 언어 모델을 두지 않음).
+    """
+    if engine != "easyocr":
+        try:
+            log.info("[🔍 OCR 엔진 초기화] %s 언어: %s", engine, lang_list)
+            return create_ocr_engine(engine, lang_list, use_gpu)
+        except Exception as e:
+            log.warning("[⚠️ OCR 엔진 초기화 오류] %s: %s", engine, e)
+            return None
+    try:
+        pool = get_process_pool()
+        if pool is not None:
+            serving = [get_lang(region.get_lang()) for region in active_regions]
+            copies = None if list(lang_list) in serving else 1
+            log.info("[🔍 OCR 작업자 리더 초기화] 언어: %s, GPU: %s", lang_list, use_gpu)
+            return EasyOcrEngine(pool.reader(lang_list, use_gpu, copies))
+        log.info("[🔍 OCR 리더 초기화] 언어: %s, GPU: %s", lang_list, use_gpu)
+        # OCR_BACKEND가 'onnx'면 검출/인식 모델을 ONNX Runtime으로 교체 (CPU 전용)
+        reader = create_easyocr_reader(lang_list, use_gpu, onnx_options())
+    except Exception as e:
+        log.exception("[⚠️ OCR 리더 초기화 오류]: %s", e)
+        return None
+    warm_up_reader(reader)
+    return EasyOcrEngine(reader)
+
+# 언어/장치별 리더 풀 (설정 저장 시 같은 조합이면 재사용)
+reader_pool = ReaderPool(
+    create_reader,
+    max_memory_mb=get_setting("OCR_READER_MEMORY_MB", 1500),
+    idle_seconds=get_setting("OCR_READER_IDLE_SECONDS", 600),
+)
+
+def engine_for(lang_list, region=default_region):
+    """사용할 OCR 엔진 이름 (영역 설정 > 언어별 설정 OCR_ENGINE_BY_LANG > OCR_ENGINE)"""
+    if region.engine:
+        return region.engine
+    by_lang = get_setting("OCR_ENGINE_BY_LANG", {})
+    return by_lang.get(lang_list[0], get_setting("OCR_ENGINE", "easyocr"))
 
 def init_ocr_reader():
-    """OCR 리더 초기화"""
+    """현재 설정(SOURCE_LANG, USE_GPU)에 맞는 OCR 리더 반환 (풀에 있으면 재사용)"""
+    langs = get_lang(get_setting("SOURCE_LANG"))
+    return reader_pool.get(langs, get_setting("USE_GPU"), engine_for(langs))
+
+def warm_up_reader(reader):
+    """빈 이미지로 검출/인식을 한 번씩 실행해서 첫 추론 비용을 미리 치름"""
+    started = time.perf_counter()
+    blank = np.full((64, 320, 3), 255, dtype=np.uint8)
     try:
-        import easyocr
-        lang_list = get_lang(get_setting("SOURCE_LANG"))
-        use_gpu = get_setting("USE_GPU")
-        print(f"[🔍 OCR 리더 초기화] 언어: {lang_list}, GPU: {use_gpu}")
-        return easyocr.Reader(lang_list, gpu=use_gpu)
+        reader.readtext(blank, detail=0)
+        # 빈 이미지는 검출 결과가 없으므로 인식 모델은 영역을 직접 지정해서 실행
+        reader.recognize(blank[..., 0], horizontal_list=[[0, 320, 0, 64]], free_list=[], detail=0)
     except Exception as e:
-        print(f"[⚠️ OCR 리더 초기화 오류]: {str(e)}")
-        print(traceback.format_exc())
+        log.warning("[⚠️ OCR 워밍업 실패] %s", e)
+        return
+    log.info("[🔥 OCR 워밍업 완료] %.2f초", time.perf_counter() - started)
+
+def _load_reader():
+    """설정에 맞는 기본 리더 준비 (잠금 상태에서 호출)"""
+    global ocr_reader, reader_status
+    reader_status = "loading"
+    # 기본 리더는 ocr_reader로 계속 참조하므로 풀에서 제거하지 않음 (이전 기본 리더는 제거 대상으로)
+    langs = get_lang(get_setting("SOURCE_LANG"))
+    reader_pool.pin(langs, get_setting("USE_GPU"), engine_for(langs))
+    reader = init_ocr_reader()
+    if reader is None:
+        reader_status = "failed"
         return None
+    ocr_reader = reader
+    reader_status = "ready"
+    return reader
+
+def ensure_ocr_reader():
+    """OCR 리더 반환 (없으면 생성, 백그라운드 로딩 중이면 완료될 때까지 대기)"""
+    with _reader_lock:
+        if ocr_reader is not None:
+            return ocr_reader
+        return _load_reader()
+
+def get_reader_status():
+    """OCR 리더 준비 상태 반환"""
+    return reader_status
 
 def reinit_ocr_reader():
-    """OCR 리더 재초기화"""
-    global ocr_reader
-    ocr_reader = init_ocr_reader()
-
-def ocr_loop(overlay_label):
-    """OCR 및 번역 메인 루프"""
-    global ocr_running, last_text, last_translated, repeat_count, ocr_reader
-    
-    # OCR 리더가 없으면 초기화
-    if ocr_reader is None:
-        ocr_reader = init_ocr_reader()
-        if ocr_reader is None:
-            print("[⚠️ OCR 리더 초기화 실패로 OCR 루프 종료]")
-            ocr_running = False
-            return
-    
-    print("[✅ OCR 루프 시작]")
-    
-    while ocr_running:
-        try:
-            # OCR 영역 가져오기
-            region = get_setting("OCR_REGION")
-            if not region:
-                print("[⚠️ OCR 영역이 설정되지 않음]")
-                time.sleep(1)
+    """설정 변경 후 기본 리더 교체 (같은 언어/장치 조합이면 기존 리더 재사용)"""
+    with _reader_lock:
+        for region in active_regions:
+            region.current_script = None
+        _load_reader()
+
+def pick_reader(region=default_region):
+    """이번 프레임에 사용할 (언어 목록, 리더) 선택
+
+    언어 탐색으로 정한 문자 체계의 리더는 이미 불러온 경우에만 쓴다 (OCR 루프에서 리더를 만들지 않음).
+    그 리더가 풀에서 제거됐으면 기본 언어로 돌아가고 필요하면 다시 탐색한다.
+    """
+    default_langs = get_lang(region.get_lang())
+    use_gpu = get_setting("USE_GPU")
+    if get_setting("AUTO_DETECT_LANG", True) and region.current_script:
+        langs = langs_for_script(region.current_script, default_langs)
+        if langs != default_langs:
+            reader = reader_pool.peek(langs, use_gpu, engine_for(langs, region))
+            if reader is not None:
+                return langs, reader
+            region.current_script = None
+    reader = reader_pool.get(default_langs, use_gpu, engine_for(default_langs, region))
+    if reader is None:
+        reader = ensure_ocr_reader()
+    return default_langs, reader
+
+def mean_confidence(results):
+    """readtext(detail=1) 결과의 평균 신뢰도"""
+    if not results:
+        return 0.0
+    return sum(conf for _, _, conf in results) / len(results)
+
+def uses_tile_tracking(image, scale=1.0):
+    """타일 추적 대상 영역인지 (OCR_TILE_MIN_AREA는 전처리 전 원본 영역 픽셀 수 기준)"""
+    area = image.shape[0] * image.shape[1] / (scale * scale)
+    return get_setting("OCR_TILE_TRACKING", True) and area >= get_setting("OCR_TILE_MIN_AREA", 150000)
+
+def read_lines(reader, image, scale=1.0, region=default_region):
+    """한 리더로 인식, (상자, 텍스트, 신뢰도) 목록 반환
+
+    OCR_REUSE_BOXES가 켜져 있으면 검출 상자를 재사용하고 바뀐 줄만 인식한다.
+    OCR_TILE_TRACKING이 켜져 있고 영역이 넓으면 바뀐 타일 주변만 인식한다.
+    OCR_FIXED_BOXES([[x1, y1, x2, y2], ...], 원본 영역 기준)가 있으면 검출 없이 그 상자만 인식한다.
+    검출/인식을 나눌 수 없는 엔진(tesseract 등)은 상자 재사용 없이 readtext를 쓴다.
+    """
+    supports_boxes = getattr(reader, "supports_boxes", True)
+    fixed = region.fixed_boxes
+    if fixed is None:
+        fixed = get_setting("OCR_FIXED_BOXES", [])
+    if fixed:
+        fixed_boxes = [[int(x1 * scale), int(x2 * scale), int(y1 * scale), int(y2 * scale)]
+                       for x1, y1, x2, y2 in fixed]
+        if supports_boxes:
+            return region.line_tracker.read(reader, image, fixed_boxes)
+        results = []
+        for x_min, x_max, y_min, y_max in fixed_boxes:
+            for box, text, conf in reader.readtext(image[y_min:y_max, x_min:x_max], detail=1):
+                results.append(([[x + x_min, y + y_min] for x, y in box], text, conf))
+        return results
+
+    def full_read():
+        if supports_boxes and get_setting("OCR_REUSE_BOXES", True):
+            return region.line_tracker.read(reader, image)
+        return reader.readtext(image, detail=1)
+
+    # 넓은 영역은 바뀐 타일 주변만 인식해서 이전 결과에 끼워넣음
+    if uses_tile_tracking(image, scale):
+        return region.tile_tracker.read(reader, image, full_read)
+    return full_read()
+
+def line_crops(image, results, limit):
+    """인식 결과 상자 중 앞쪽 limit개 줄을 잘라낸 이미지 (다른 스레드에서 쓰므로 복사본)"""
+    crops = []
+    for box, _, _ in results[:limit]:
+        xs = [int(x) for x, _ in box]
+        ys = [int(y) for _, y in box]
+        crop = image[max(min(ys), 0):max(ys), max(min(xs), 0):max(xs)]
+        if crop.size:
+            crops.append(crop.copy())
+    return crops
+
+def probe_scripts(region, langs, crops, confidence):
+    """검출된 줄을 다른 언어 리더로 읽어보고 가장 잘 읽은 리더의 문자 체계를 영역에 반영 (백그라운드)
+
+    문자 체계는 이긴 리더가 읽은 텍스트로 정한다 (현재 리더가 잘못 읽은 텍스트로는 판별할 수 없음).
+    """
+    best_conf, best_script = confidence, None
+    try:
+        for code in get_setting("OCR_AUTO_LANGS", ["en", "ja", "ko", "zh-CN"]):
+            candidate_langs = get_lang(code)
+            if candidate_langs == langs:
                 continue
-            
-            # 스크린샷 촬영
-            x1, y1, x2, y2 = region
-            try:
-                img = pyautogui.screenshot(region=(x1, y1, x2 - x1, y2 - y1))
-                print(f"[📸 스크린샷 촬영 성공] 영역: {region}")
-            except Exception as e:
-                print(f"[⚠️ 스크린샷 실패] {str(e)}")
-                time.sleep(1)
+            candidate = reader_pool.get(candidate_langs, get_setting("USE_GPU"), engine_for(candidate_langs, region))
+            if candidate is None:
                 continue
-            
-            # OCR 텍스트 인식
-            try:
-                result = ocr_reader.readtext(np.array(img), detail=0)
-                text = "\n".join(result).strip()
-                print(f"[🧾 OCR 텍스트 인식 완료] 길이: {len(text)}")
-            except Exception as e:
-                print(f"[⚠️ OCR 텍스트 인식 실패] {str(e)}")
-                time.sleep(1)
+            results = [line for crop in crops for line in candidate.readtext(crop, detail=1)]
+            if mean_confidence(results) > best_conf:
+                best_conf = mean_confidence(results)
+                best_script = detect_script(" ".join(text for _, text, _ in results)) or script_for_langs(candidate_langs)
+    except Exception as e:
+        metrics.inc("errors", stage="route")
+        log.warning("[⚠️ 언어 탐색 실패] %s: %s", region.name, e)
+        return
+    log.debug("[🔀 언어 탐색] %s 신뢰도: %.2f → %.2f", region.name, confidence, best_conf)
+    if best_script and best_script != region.current_script:
+        log.info("[🔀 OCR 리더 전환] %s 문자 체계: %s", region.name, best_script)
+        region.current_script = best_script
+
+def maybe_probe_scripts(region, langs, image, results):
+    """평균 신뢰도가 낮으면 언어 탐색 시작 (영역마다 하나씩, OCR_ROUTE_PROBE_SECONDS마다 최대 한 번)"""
+    confidence = mean_confidence(results)
+    if confidence >= get_setting("OCR_ROUTE_MIN_CONFIDENCE", 0.4):
+        return
+    now = time.monotonic()
+    probe = region.route_probe
+    if probe is not None and probe.is_alive():
+        return
+    if now - region.route_checked_at < get_setting("OCR_ROUTE_PROBE_SECONDS", 5.0):
+        return
+    crops = line_crops(image, results, get_setting("OCR_ROUTE_PROBE_LINES", 3))
+    if not crops:
+        return
+    region.route_checked_at = now
+    region.route_probe = threading.Thread(target=probe_scripts, args=(region, langs, crops, confidence),
+                                          name=f"ocr-route-{region.name}", daemon=True)
+    region.route_probe.start()
+
+def read_with_routing(frame, scale=1.0, region=default_region):
+    """영역 문자 체계에 맞는 리더로 인식
+
+    자동 감지가 켜져 있고 평균 신뢰도가 낮으면 검출된 줄 몇 개를 백그라운드에서 다른 언어 리더로
+    다시 읽어보고, 가장 잘 읽은 리더의 문자 체계를 다음 프레임부터 쓴다 (이번 프레임은 기다리지 않음).
+    """
+    langs, reader = pick_reader(region)
+    results = read_lines(reader, frame, scale, region)
+    if get_setting("AUTO_DETECT_LANG", True) and results:
+        maybe_probe_scripts(region, langs, frame, results)
+    return results
+
+def open_capture_backend():
+    """설정에 맞는 캡처 백엔드 생성"""
+    return create_capture_backend(
+        get_setting("CAPTURE_BACKEND", "auto"),
+        replay_source=get_setting("REPLAY_SOURCE", ""),
+        replay_loop=get_setting("REPLAY_LOOP", True),
+        replay_fps=get_setting("REPLAY_FPS", None),
+    )
+
+def recognize_frame(frame, detect_change=True, region=default_region):
+    """프레임에서 텍스트 인식 (화면 변화가 없으면 None)
+
+    타일 추적 대상 영역은 타일 추적기의 변화 타일 지도로, 나머지는 변화 감지기로 OCR 여부를 정한다.
+    """
+    detector = region.change_detector
+    detector.threshold = get_setting("CHANGE_THRESHOLD", 0.5)
+    detector.noise = get_setting("CHANGE_NOISE", 8)
+    detector.tile_pixels = get_setting("CHANGE_TILE_PIXELS", 2)
+    tracker = region.tile_tracker
+    tracker.tile = get_setting("OCR_TILE_SIZE", 32)
+    tracker.noise = get_setting("CHANGE_NOISE", 8)
+    fixed = region.fixed_boxes if region.fixed_boxes is not None else get_setting("OCR_FIXED_BOXES", [])
+    tile_gate = detect_change and not fixed and uses_tile_tracking(frame)
+    if detect_change and not tile_gate and not detector.has_changed(frame):
+        log.debug("[⏩ 화면 변화 없음, OCR 스킵] %s", region.name)
+        return None
+    image, scale = preprocess(frame, get_setting("OCR_PREPROCESS", "none"))
+    if tile_gate:
+        changed = tracker.has_changed(image)
+        detector.count(changed)
+        if not changed:
+            log.debug("[⏩ 바뀐 타일 없음, OCR 스킵] %s", region.name)
+            return None
+    results = read_with_routing(image, scale, region)
+    # 인식에 성공한 프레임만 다음 비교 기준으로 (예외가 나면 다음 프레임에서 다시 인식)
+    detector.commit()
+    return "\n".join(text for _, text, _ in results).strip()
+
+def next_capture_delay(regions, now):
+    """다음 캡처까지 기다릴 시간 (처리 중인 영역은 끝날 때 깨우므로 제외)"""
+    waiting = [region.next_due for region in regions if region.next_due != float("inf")]
+    if not waiting:
+        return max(region.scheduler.max_interval for region in regions)
+    return max(min(waiting) - now, 0)
+
+def fail_pipeline(stop, message):
+    """파이프라인 전체를 멈추고 이유를 남김 (GUI가 ocr_running으로 확인해서 표시)"""
+    global ocr_running, pipeline_error
+    pipeline_error = message
+    ocr_running = False
+    stop.set()
+    wake_event.set()
+
+def get_pipeline_error():
+    """파이프라인이 스스로 멈춘 이유 (없으면 None)"""
+    return pipeline_error
+
+def capture_loop(stop, frames, regions, wake):
+    """캡처 단계: 모든 영역을 포함하는 범위를 한 번만 찍어 최신 프레임만 넘김
+
+    주기는 영역별 스케줄러가 정하며, OCR 단계가 영역 처리를 마치면 wake로 깨운다.
+    """
+    try:
+        # 백엔드는 캡처 스레드 안에서 생성 (mss 등은 스레드 간 공유 불가)
+        backend = open_capture_backend()
+    except Exception as e:
+        log.error("[⚠️ 캡처 백엔드 초기화 실패] %s", e)
+        fail_pipeline(stop, f"캡처 백엔드 초기화 실패: {e}")
+        return
+    log.info("[✅ 캡처 단계 시작]")
+    while not stop.is_set():
+        due = [region for region in regions if region.is_due(time.monotonic())]
+        if not due:
+            wake.clear()
+            wake.wait(next_capture_delay(regions, time.monotonic()))
+            continue
+        boxes = [region.get_box() for region in regions]
+        if not all(boxes):
+            log.warning("[⚠️ OCR 영역이 설정되지 않음]")
+            stop.wait(1)
+            continue
+        box = union_box(boxes)
+        try:
+            grab_started = time.perf_counter()
+            frame = backend.grab(box)
+            metrics.observe("capture_seconds", time.perf_counter() - grab_started)
+            if frame is None:
+                log.info("[⏹️ 재생할 프레임 없음]")
+                stop.wait(1)
                 continue
-            
-            # 텍스트가 없으면 건너뜀
-            if not text:
-                print("[⚠️ 인식된 텍스트 없음, 건너뜀]")
-                time.sleep(get_setting("OCR_INTERVAL"))
+            for region in due:
+                region.start()
+            frames.put((time.time(), box[:2], frame))
+            frame_summary.count("captured")
+            metrics.inc("frames")
+            log.debug("[📸 스크린샷 촬영 성공] 영역: %s", box)
+        except Exception as e:
+            metrics.inc("errors", stage="capture")
+            log.warning("[⚠️ 스크린샷 실패] %s", e)
+            stop.wait(1)
+            continue
+    backend.close()
+    log.info("[🛑 캡처 단계 종료됨]")
+
+def process_region(region, frame, texts, captured_at=None):
+    """영역 하나 인식 + 흔들림 안정화 후 확정된 텍스트만 번역 단계로 넘김, 화면 변화 여부 반환
+
+    captured_at은 프레임 캡처 시각이며 캡처부터 표시까지의 지연 시간 측정에 쓴다.
+    """
+    try:
+        text = recognize_frame(frame, region=region)
+        if text is None:
+            # 화면 그대로: 확정 대기 중인 후보가 있으면 한 번 더 확인된 것으로 셈
+            frame_summary.count("unchanged")
+            committed = region.stabilizer.confirm()
+            if committed is not None:
+                frame_summary.count("new_text")
+                texts.put((region.name, region.overlay, committed, captured_at, region.lang), key=region.name)
+            else:
+                metrics.inc("frames_skipped", reason="unchanged")
+            return False
+        log.debug("[🧾 OCR 텍스트 인식 완료] %s 길이: %d", region.name, len(text))
+
+        # 텍스트가 없으면 건너뜀
+        if not text:
+            frame_summary.count("empty")
+            metrics.inc("frames_skipped", reason="empty")
+            log.debug("[⚠️ 인식된 텍스트 없음, 건너뜀]")
+            return True
+
+        log.debug("[🧾 OCR 원본 텍스트]: %s", text)
+
+        # 확정된 텍스트와 비슷하면(OCR 흔들림) 번역 스킵, 새 텍스트는 여러 프레임에서 확인된 뒤 번역
+        committed = region.stabilizer.update(text)
+        if committed is None:
+            frame_summary.count("jitter")
+            metrics.inc("frames_skipped", reason="jitter")
+            log.debug("[⏩ 번역 스킵] 이전 텍스트와 유사하거나 확인 대기 중")
+            return True
+
+        frame_summary.count("new_text")
+        texts.put((region.name, region.overlay, committed, captured_at, region.lang), key=region.name)
+        return True
+    except Exception as e:
+        frame_summary.count("errors")
+        metrics.inc("errors", stage="ocr")
+        log.exception("[⚠️ OCR 루프 오류] %s: %s", region.name, e)
+        return False
+
+def run_region(region, frame, texts, wake, captured_at=None):
+    """영역 처리 후 스케줄러에 변화 여부를 알리고 캡처 단계를 깨움"""
+    started = time.monotonic()
+    changed = process_region(region, frame, texts, captured_at) if frame.size else False
+    if changed:
+        elapsed = time.monotonic() - started
+        frame_summary.timing("ocr", elapsed)
+        metrics.observe("ocr_seconds", elapsed, region=region.name)
+    region.finish(started, changed)
+    wake.set()
+
+def ocr_loop(stop, frames, texts, regions, wake):
+    """OCR 단계: 가장 최근 프레임에서 캡처된 영역들을 작업자 풀에서 동시에 인식"""
+    # OCR 리더가 없으면 초기화 (미리 로드 중이면 완료까지 대기)
+    if ensure_ocr_reader() is None:
+        log.error("[⚠️ OCR 리더 초기화 실패로 OCR 루프 종료]")
+        fail_pipeline(stop, "OCR 리더 초기화 실패")
+        return
+
+    log.info("[✅ OCR 루프 시작]")
+    workers = ThreadPoolExecutor(max_workers=max(min(len(regions), get_setting("OCR_REGION_WORKERS", 4)), 1),
+                                 thread_name_prefix="ocr-region")
+
+    while not stop.is_set():
+        item = frames.get(timeout=0.5)
+        if item is None:
+            continue
+        captured_at, origin, frame = item
+        for region in regions:
+            # 밀려서 버려진 프레임 차례였던 영역도 최신 프레임으로 처리
+            if not region.take():
                 continue
-            
-            print(f"[🧾 OCR 원본 텍스트]: {text}")
-            
-            # 이전 텍스트와 동일한지 확인
-            if text == last_text:
-                repeat_count += 1
-                print(f"[🔄 동일 텍스트 감지] 반복 횟수: {repeat_count}/{MAX_REPEAT}")
-                
-                # 최대 반복 횟수 이상이면 이전 번역 결과 재사용
-                if repeat_count >= MAX_REPEAT:
-                    print(f"[⏩ 번역 스킵] 이전 번역 결과 재사용")
-                    translated = last_translated
-                else:
-                    # 최대 반복 횟수 미만이면 새로 번역
-                    translated = translate_text(text)
-                    last_translated = translated
+            view = slice_region(frame, origin, region.get_box())
+            if len(regions) == 1:
+                run_region(region, view, texts, wake, captured_at)
             else:
-                # 새로운 텍스트면 초기화 후 번역
-                last_text = text
-                repeat_count = 0
-                try:
-                    translated = translate_text(text)
-                    last_translated = translated
-                    print(f"[🌐 번역 성공]")
-                except Exception as e:
-                    print(f"[⚠️ 번역 실패] {str(e)}")
-                    time.sleep(1)
-                    continue
-            
-            print(f"[🌐 번역 결과]: {translated[:50]}..." if len(translated) > 50 else f"[🌐 번역 결과]: {translated}")
-            
-            # 오버레이 업데이트
-            try:
-                overlay_label.config(text=translated)
-                print("[✅ 오버레이 텍스트 업데이트 완료]")
-            except Exception as e:
-                print(f"[⚠️ 오버레이 업데이트 실패] {str(e)}")
-            
+                region.pending = workers.submit(run_region, region, view, texts, wake, captured_at)
+
+    workers.shutdown(wait=False, cancel_futures=True)
+    log.info("[🛑 OCR 루프 종료됨]")
+
+def translate_loop(stop, texts, renders):
+    """번역 단계: 영역마다 밀린 텍스트는 버리고 가장 최근 텍스트만 번역"""
+    log.info("[✅ 번역 단계 시작]")
+
+    def deliver(overlay, translated, started, captured_at):
+        global last_translated
+        last_translated = translated
+        frame_summary.count("translated")
+        metrics.observe("translation_seconds", time.monotonic() - started)
+        log.debug("[🌐 번역 결과]: %s", translated)
+        if not stop.is_set():
+            renders.put((overlay, translated, captured_at), key=overlay)
+
+    while not stop.is_set():
+        item = texts.get(timeout=0.5)
+        if item is None:
+            continue
+        name, overlay, text, captured_at, source_lang = item
+        started = time.monotonic()
+        if get_setting("ASYNC_TRANSLATION", True):
+            # 응답을 기다리지 않음: 같은 영역에 새 텍스트가 오면 이전 요청은 취소되고
+            # 영역마다 따로 동시에 번역되며 결과는 콜백으로 도착
+            translation_client.submit(name, text, callback=lambda t, o=overlay, s=started, c=captured_at: deliver(o, t, s, c),
+                                      source_lang=source_lang)
+            continue
+        try:
+            translated = translate_for_overlay(text, source_lang)
+            log.debug("[🌐 번역 성공]")
+        except Exception as e:
+            metrics.inc("errors", stage="translate")
+            log.warning("[⚠️ 번역 실패] %s", e)
+            continue
+        deliver(overlay, translated, started, captured_at)
+    translation_client.cancel_all()
+    log.info("[🛑 번역 단계 종료됨]")
+
+def render_poll(overlay_labels, stop, renders):
+    """오버레이 갱신 단계: Tk 스레드에서 오버레이마다 최신 번역 결과만 반영"""
+    if stop.is_set():
+        return
+    while True:
+        item = renders.get_nowait()
+        if item is None:
+            break
+        overlay, translated, captured_at = item
+        label = overlay_labels.get(overlay) or overlay_labels["main"]
+        try:
+            started = time.perf_counter()
+            label.config(text=translated)
+            metrics.observe("overlay_update_seconds", time.perf_counter() - started, overlay=overlay)
+            if captured_at is not None:
+                metrics.observe("pipeline_latency_seconds", time.time() - captured_at)
+            log.debug("[✅ 오버레이 텍스트 업데이트 완료] %s", overlay)
         except Exception as e:
-            print(f"[⚠️ OCR 루프 오류] {str(e)}")
-            print(traceback.format_exc())
-        
-        time.sleep(get_setting("OCR_INTERVAL"))
-    
-    print("[🛑 OCR 루프 종료됨]")
-
-def start_ocr_thread(overlay_label):
-    """OCR 스레드 시작"""
-    global ocr_thread, ocr_running, last_text, last_translated, repeat_count
-    
-    if ocr_thread and ocr_thread.is_alive():
-        print("[⚠️ OCR 스레드 이미 실행 중]")
+            metrics.inc("errors", stage="overlay")
+            log.warning("[⚠️ 오버레이 업데이트 실패] %s", e)
+    overlay_labels["main"].after(RENDER_POLL_MS, render_poll, overlay_labels, stop, renders)
+
+def start_ocr_thread(overlay_label, overlay_labels=None):
+    """OCR 파이프라인 (캡처/OCR/번역 스레드 + 오버레이 갱신) 시작
+
+    overlay_labels는 {오버레이 이름: 레이블}이며, 영역의 오버레이가 없으면 overlay_label에 표시한다.
+    """
+    global pipeline_threads, ocr_running, last_translated, active_regions, pipeline_error
+    global stop_event, wake_event, frame_queue, text_queue, render_queue
+
+    if ocr_running and any(t.is_alive() for t in pipeline_threads):
+        log.warning("[⚠️ OCR 스레드 이미 실행 중]")
         return
-    
-    # 중복 감지 변수 초기화
-    last_text = ""
+
+    # 영역 목록과 영역별 상태(중복 감지, 변화 감지 등) 초기화
     last_translated = ""
-    repeat_count = 0
-    
+    regions = load_regions()
+    if len(regions) == 1 and regions[0].box is None:
+        # 단일 영역 설정이면 기본 영역 상태를 그대로 사용
+        regions = [default_region]
+    for region in regions:
+        region.reset()
+    active_regions = regions
+    reader_pool.evict_idle()
+    labels = dict(overlay_labels or {})
+    labels["main"] = overlay_label
+    stop_event = threading.Event()
+    wake_event = threading.Event()
+    frame_queue = LatestQueue(maxsize=1)
+    text_queue = LatestQueue(maxsize=len(regions))
+    render_queue = LatestQueue(maxsize=len(labels))
+
     ocr_running = True
-    print("[OCR 스레드 시작]")
-    ocr_thread = threading.Thread(target=ocr_loop, args=(overlay_label,), daemon=True)
-    ocr_thread.start()
-    print("[✅ OCR 스레드 시작됨]")
+    pipeline_error = None
+    log.info("[OCR 스레드 시작] 영역: %s", [region.name for region in regions])
+    pipeline_threads = [
+        threading.Thread(target=capture_loop, args=(stop_event, frame_queue, regions, wake_event),
+                         name="ocr-capture", daemon=True),
+        threading.Thread(target=ocr_loop, args=(stop_event, frame_queue, text_queue, regions, wake_event),
+                         name="ocr-recognize", daemon=True),
+        threading.Thread(target=translate_loop, args=(stop_event, text_queue, render_queue), name="ocr-translate", daemon=True),
+    ]
+    for t in pipeline_threads:
+        t.start()
+    overlay_label.after(RENDER_POLL_MS, render_poll, labels, stop_event, render_queue)
+    log.info("[✅ OCR 스레드 시작됨]")
 
 def stop_ocr():
-    """OCR 스레드 중지"""
+    """OCR 파이프라인 중지"""
     global ocr_running
-    print("[🛑 OCR 중지 요청됨]")
-    ocr_running = False
\ No newline at end of file
+    log.info("[🛑 OCR 중지 요청됨]")
+    ocr_running = False
+    stop_event.set()
+    wake_event.set()
+    for q in (frame_queue, text_queue, render_queue):
+        q.clear()
+    frame_summary.flush()
+    for region in active_regions:
+        stats = region.change_detector.stats()
+        log.info("[📊 OCR 스킵 통계] %s: %d/%d (%.1f%%)", region.name, stats["skipped"], stats["checked"],
+                 stats["skip_rate"])
+        schedule = region.scheduler.stats()
+        log.info("[📊 OCR 주기 통계] %s: 처리 %d회, 변화 %d회, 마지막 주기 %.2f초",
+                 region.name, schedule["polls"], schedule["changes"], schedule["interval"])
+        stable = region.stabilizer.stats()
+        log.info("[📊 텍스트 안정화 통계] %s: 번역 %d회, 흔들림 무시 %d회",
+                 region.name, stable["commits"], stable["suppressed"])
+
+# 설정 변경 반영 (바뀐 설정에 해당하는 부분만 다시 구성)
+READER_SETTINGS = ("SOURCE_LANG", "USE_GPU", "OCR_ENGINE", "OCR_ENGINE_BY_LANG")
+SCHEDULE_SETTINGS = ("OCR_INTERVAL", "ADAPTIVE_INTERVAL", "OCR_MIN_INTERVAL", "OCR_BACKOFF")
+STABILIZE_SETTINGS = ("STABILIZE_SIMILARITY", "STABILIZE_FRAMES")
+# 번역 결과가 달라지는 설정 (화면이 그대로여도 현재 텍스트를 다시 번역)
+RETRANSLATE_SETTINGS = ("ENGINE", "SOURCE_LANG", "TARGET_LANG", "AUTO_DETECT_LANG")
+
+def _on_reader_settings(changes):
+    """언어/장치/엔진이 바뀐 경우에만 기본 리더 교체 (백그라운드, 풀에 있으면 재사용)"""
+    if reader_status == "idle":
+        return
+    log.info("[🔁 OCR 리더 교체] %s 변경", ", ".join(changes))
+    threading.Thread(target=reinit_ocr_reader, name="ocr-reload", daemon=True).start()
+
+def _on_schedule_settings(changes):
+    for region in active_regions:
+        region.scheduler = region.create_scheduler()
+    wake_event.set()
+
+def _on_stabilize_settings(changes):
+    for region in active_regions:
+        region.stabilizer = region.create_stabilizer()
+
+def _on_retranslate_settings(changes):
+    global last_translated
+    last_translated = ""
+    for region in active_regions:
+        if "AUTO_DETECT_LANG" in changes:
+            region.current_script = None
+        region.stabilizer = region.create_stabilizer()
+        region.change_detector.reset()
+        region.tile_tracker.reset()
+        if not region.awaiting and region.next_due != float("inf"):
+            # 처리 중이 아니면 다음 주기를 기다리지 않고 바로 다시 인식
+            region.next_due = min(region.next_due, time.monotonic())
+    wake_event.set()
+
+subscribe(READER_SETTINGS, _on_reader_settings)
+subscribe(SCHEDULE_SETTINGS, _on_schedule_settings)
+subscribe(STABILIZE_SETTINGS, _on_stabilize_settings)
+subscribe(RETRANSLATE_SETTINGS, _on_retranslate_settings)
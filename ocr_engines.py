@@ -0,0 +1,132 @@
+# ocr_engines.py - OCR 엔진 인터페이스 (easyocr, Tesseract)
+#
+# 엔진은 readtext(image, detail=1)로 (상자 꼭짓점 4개, 텍스트, 신뢰도 0~1) 목록을 돌려준다.
+# supports_boxes가 True인 엔진은 detect/recognize도 제공해서 검출 상자 재사용(LineTracker)을 쓸 수 있다.
+# 영문 자막처럼 단순한 경우 Tesseract는 torch 없이 가볍게 동작한다 (tesseract 실행 파일 필요).
+# 가져오기만으로는 모델 로드나 스레드 시작 같은 부작용이 없어야 한다 (batch_ocr 등 도구가 가져다 씀).
+import numpy as np
+from config import get_setting
+
+# easyocr 언어 코드 → Tesseract 언어 코드
+TESSERACT_LANGS = {
+    "en": "eng",
+    "ja": "jpn",
+    "ko": "kor",
+    "ch_sim": "chi_sim",
+    "ch_tra": "chi_tra",
+}
+
+def get_lang(lang_code):
+    """언어 코드에 따른 OCR 언어 목록 반환"""
+    if lang_code.startswith("ja"):
+        return ["ja", "en"]
+    elif lang_code.startswith("zh"):
+        return ["ch_sim", "en"]
+    elif lang_code.startswith("ko"):
+        return ["ko", "en"]
+    else:
+        return ["en"]
+
+def onnx_options():
+    """OCR_BACKEND가 'onnx'이면 ONNX 변환 옵션, 아니면 None"""
+    if get_setting("OCR_BACKEND", "torch") != "onnx":
+        return None
+    return {
+        "cache_dir": get_setting("OCR_ONNX_CACHE_DIR", "onnx_models"),
+        "use_quantize": get_setting("OCR_ONNX_QUANTIZE", True),
+    }
+
+# 단어 사이에 공백을 넣지 않는 언어
+_NO_SPACE_LANGS = ("ja", "ch_sim", "ch_tra")
+
+class OcrEngine:
+    """OCR 엔진 공통 인터페이스"""
+    name = ""
+    supports_boxes = False
+
+    def readtext(self, image, detail=1):
+        """(상자, 텍스트, 신뢰도) 목록 반환 (detail=0이면 텍스트 목록)"""
+        raise NotImplementedError
+
+class EasyOcrEngine(OcrEngine):
+    """easyocr Reader (또는 작업자 프로세스 대리 객체) 래퍼"""
+    name = "easyocr"
+    supports_boxes = True
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def readtext(self, image, detail=1, **kwargs):
+        return self.reader.readtext(image, detail=detail, **kwargs)
+
+    def detect(self, image, **kwargs):
+        return self.reader.detect(image, **kwargs)
+
+    def recognize(self, image, **kwargs):
+        return self.reader.recognize(image, **kwargs)
+
+    def release(self):
+        release = getattr(self.reader, "release", None)
+        if release is not None:
+            release()
+
+    def __getattr__(self, attr):
+        # detector/recognizer 등 나머지 속성은 원래 Reader에서 (메모리 추정 등)
+        return getattr(self.reader, attr)
+
+class TesseractEngine(OcrEngine):
+    """pytesseract 기반 엔진 (줄 단위 결과)"""
+    name = "tesseract"
+    memory_mb = 20   # 인식은 별도 tesseract 프로세스에서 실행
+
+    def __init__(self, lang_list, psm=6):
+        import pytesseract
+        self._tesseract = pytesseract
+        self.lang_list = list(lang_list)
+        self.lang = "+".join(TESSERACT_LANGS.get(code, "eng") for code in self.lang_list)
+        self.config = f"--psm {psm}"
+        self.joiner = "" if self.lang_list[0] in _NO_SPACE_LANGS else " "
+        # tesseract 실행 파일 확인 (없으면 여기서 실패)
+        self._tesseract.get_tesseract_version()
+
+    def readtext(self, image, detail=1):
+        data = self._tesseract.image_to_data(np.ascontiguousarray(image), lang=self.lang, config=self.config,
+                                             output_type=self._tesseract.Output.DICT)
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if not word.strip() or conf < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            left, top = data["left"][i], data["top"][i]
+            lines.setdefault(key, []).append((left, top, left + data["width"][i], top + data["height"][i],
+                                              word, conf / 100.0))
+        results = []
+        for words in lines.values():
+            x1 = min(w[0] for w in words)
+            y1 = min(w[1] for w in words)
+            x2 = max(w[2] for w in words)
+            y2 = max(w[3] for w in words)
+            text = self.joiner.join(w[4] for w in words)
+            conf = sum(w[5] for w in words) / len(words)
+            results.append(([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], text, conf))
+        results.sort(key=lambda r: (r[0][0][1], r[0][0][0]))
+        if not detail:
+            return [text for _, text, _ in results]
+        return results
+
+# 엔진 이름 → 생성 함수 factory(lang_list, use_gpu) (easyocr는 ocr.create_reader가 직접 생성)
+OCR_ENGINES = {
+    "tesseract": lambda lang_list, use_gpu: TesseractEngine(lang_list),
+}
+
+def register_ocr_engine(name, factory):
+    """OCR 엔진 추가 (factory(lang_list, use_gpu) -> OcrEngine)"""
+    OCR_ENGINES[name] = factory
+
+def create_ocr_engine(name, lang_list, use_gpu):
+    """easyocr 이외 엔진 생성"""
+    factory = OCR_ENGINES.get(name)
+    if factory is None:
+        raise ValueError(f"알 수 없는 OCR 엔진: {name}")
+    return factory(lang_list, use_gpu)
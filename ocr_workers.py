@@ -0,0 +1,368 @@
+# ocr_workers.py - 별도 프로세스에서 OCR 실행 (공유 메모리 링 버퍼로 프레임 전달)
+#
+# Tk 프로세스 안의 스레드에서 easyocr를 돌리면 추론이 GUI/단축키 처리와 GIL을 다투고,
+# 한 번에 한 프레임만 처리된다. 작업자 프로세스마다 리더를 올려두고 프레임은
+# multiprocessing.shared_memory 슬롯에 복사해서 넘긴다 (배열 피클링 없음).
+# 작업자 모듈은 설정/GUI 모듈을 가져오지 않는다 (spawn 시 가볍게 시작).
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+import numpy as np
+from app_log import get_logger, get_log_level, setup_logging
+
+log = get_logger("ocr_workers")
+
+def _create_reader(langs, gpu, onnx=None):
+    from onnx_backend import create_reader
+    reader = create_reader(langs, gpu, onnx)
+    # 첫 추론 비용을 미리 치름
+    blank = np.full((64, 320, 3), 255, dtype=np.uint8)
+    reader.readtext(blank, detail=0)
+    reader.recognize(blank[..., 0], horizontal_list=[[0, 320, 0, 64]], free_list=[], detail=0)
+    return reader
+
+def _worker_main(index, shm_name, slot_bytes, requests, results, torch_threads, onnx, log_level):
+    """작업자 프로세스: 요청 큐에서 작업을 받아 리더 메서드를 실행하고 결과 큐로 반환"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    parent = mp.parent_process()
+    readers = {}
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except Exception:
+        pass
+    # 작업자 프로세스는 콘솔에만 기록 (로그 파일은 주 프로세스가 관리)
+    setup_logging(path=None, level=log_level)
+    log.info("[✅ OCR 작업자 %d 시작] PID: %d", index, os.getpid())
+    while True:
+        try:
+            message = requests.get(timeout=1.0)
+        except queue.Empty:
+            # 부모가 os._exit 등으로 끝나면 작업자도 종료
+            if parent is not None and not parent.is_alive():
+                break
+            continue
+        if message is None:
+            break
+        kind, job_id = message[0], message[1]
+        try:
+            if kind == "load":
+                langs, gpu = message[2], message[3]
+                if (langs, gpu) not in readers:
+                    readers[(langs, gpu)] = _create_reader(langs, gpu, onnx)
+                results.put((job_id, index, None, True, None))
+            elif kind == "release":
+                readers.pop((message[2], message[3]), None)
+                results.put((job_id, index, None, True, None))
+            else:
+                _, _, slot, shape, dtype, inline, langs, gpu, method, kwargs = message
+                if inline is not None:
+                    image = inline
+                else:
+                    start = slot * slot_bytes
+                    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                    image = np.ndarray(shape, dtype=dtype, buffer=shm.buf[start:start + size])
+                reader = readers.get((langs, gpu))
+                if reader is None:
+                    reader = readers[(langs, gpu)] = _create_reader(langs, gpu, onnx)
+                value = getattr(reader, method)(image, **kwargs)
+                # 결과를 돌려보내기 전에 공유 메모리 뷰 해제
+                del image
+                results.put((job_id, index, slot, value, None))
+        except Exception as e:
+            slot = message[2] if kind == "call" else None
+            results.put((job_id, index, slot, None, f"{e}\n{traceback.format_exc()}"))
+    shm.close()
+
+class _Worker:
+    """작업자 프로세스 하나와 그 공유 메모리 링 버퍼 (슬롯 목록)"""
+
+    def __init__(self, ctx, index, slots, slot_bytes, torch_threads, onnx):
+        self.index = index
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self.free_slots = list(range(slots))
+        self.pending = 0
+        self.langs_loaded = set()
+        self.requests = ctx.Queue()
+        # 결과 큐도 작업자마다 따로 둠 (공유하면 비정상 종료된 작업자가 쓰기 잠금을 쥔 채 죽을 수 있음)
+        self.results = ctx.Queue()
+        self.process = ctx.Process(target=_worker_main, name=f"ocr-worker-{index}", daemon=True,
+                                   args=(index, self.shm.name, slot_bytes, self.requests, self.results, torch_threads, onnx,
+                                         get_log_level()))
+        self.process.start()
+
+    def write(self, slot, image):
+        """슬롯에 프레임 복사"""
+        start = slot * self.slot_bytes
+        view = np.ndarray(image.shape, dtype=image.dtype, buffer=self.shm.buf[start:start + image.nbytes])
+        view[...] = image
+        del view
+
+    def close(self):
+        try:
+            self.requests.put(None)
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+        except Exception:
+            pass
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class ProcessOcrPool:
+    """OCR 작업자 프로세스 풀
+
+    - 작업자마다 공유 메모리 링 버퍼(slots개 슬롯)를 두고, 빈 슬롯에 프레임을 복사해서 보낸다.
+    - 언어 리더는 맡은 작업자에만 올리고 (load의 copies), 작업은 그 작업자 중 대기 작업이 가장 적은 곳으로 보낸다.
+    - 슬롯보다 큰 프레임은 예외적으로 큐로 직접(피클링) 보낸다.
+    - 비정상 종료된 작업자는 max_restarts번까지 다시 띄우고 맡은 리더를 다시 올린다.
+      살아 있는 작업자가 없으면 call은 기다리지 않고 바로 실패한다.
+    - onnx(apply_onnx 인자)를 주면 작업자 리더도 ONNX Runtime으로 실행한다.
+    """
+
+    def __init__(self, workers=2, slots=2, slot_mb=8, timeout=30.0, onnx=None, max_restarts=3):
+        self._ctx = mp.get_context("spawn")
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self._cond = threading.Condition()
+        self._futures = {}
+        self._ids = itertools.count()
+        self._slots = slots
+        self._slot_bytes = int(slot_mb * 1024 * 1024)
+        self._torch_threads = max((os.cpu_count() or 1) // workers, 1)
+        self._onnx = onnx
+        self._workers = [self._spawn(i) for i in range(workers)]
+        self._assigned = {}   # (언어, GPU) -> 리더를 맡은 작업자 번호 목록
+        self._closed = False
+        self.inline_frames = 0
+        self.restarts = 0
+        for worker in self._workers:
+            self._start_listener(worker)
+
+    def _spawn(self, index):
+        return _Worker(self._ctx, index, self._slots, self._slot_bytes, self._torch_threads, self._onnx)
+
+    def _start_listener(self, worker):
+        threading.Thread(target=self._listen, args=(worker,), name=f"ocr-worker-results-{worker.index}",
+                         daemon=True).start()
+
+    def _listen(self, worker):
+        """작업자 결과 큐를 읽어 Future 완료 + 슬롯 반환 (작업자가 죽으면 다시 띄우고 종료)"""
+        while not self._closed:
+            try:
+                job_id, index, slot, value, error = worker.results.get(timeout=0.5)
+            except (queue.Empty, EOFError, OSError):
+                if not worker.process.is_alive():
+                    self._fail_worker(worker)
+                    self._respawn(worker)
+                    return
+                continue
+            with self._cond:
+                worker.pending -= 1
+                if slot is not None:
+                    worker.free_slots.append(slot)
+                future = self._futures.pop(job_id, (None, None))[0]
+                self._cond.notify_all()
+            if future is None:
+                continue
+            if error:
+                future.set_exception(RuntimeError(f"OCR 작업자 {index} 오류: {error}"))
+            else:
+                future.set_result(value)
+
+    def _fail_worker(self, worker):
+        """비정상 종료된 작업자에 맡긴 작업은 오류로 완료 (기다리는 쪽이 멈추지 않도록)"""
+        failed = []
+        with self._cond:
+            for job_id, (future, index) in list(self._futures.items()):
+                if index == worker.index:
+                    del self._futures[job_id]
+                    failed.append(future)
+            worker.pending = 0
+        for future in failed:
+            future.set_exception(RuntimeError(f"OCR 작업자 {worker.index} 비정상 종료"))
+
+    def _respawn(self, worker):
+        """죽은 작업자 자리에 새 프로세스를 띄우고 맡았던 리더를 다시 올림 (완료를 기다리지 않음)"""
+        with self._cond:
+            if self._closed:
+                return
+            if self.restarts >= self.max_restarts:
+                log.error("[⚠️ OCR 작업자 %d 비정상 종료, 재시작 한도 초과] (%d회)", worker.index, self.restarts)
+                # 살아 있는 작업자가 없으면 기다리던 call이 바로 실패하도록 깨움
+                self._cond.notify_all()
+                return
+            self.restarts += 1
+        log.warning("[⚠️ OCR 작업자 %d 비정상 종료, 다시 시작] (%d/%d)", worker.index, self.restarts,
+                    self.max_restarts)
+        worker.close()
+        try:
+            new = self._spawn(worker.index)
+        except Exception as e:
+            log.error("[⚠️ OCR 작업자 %d 재시작 실패] %s", worker.index, e)
+            with self._cond:
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._workers[self._workers.index(worker)] = new
+            for key, indexes in self._assigned.items():
+                if new.index in indexes:
+                    job_id, _ = self._new_future(new)
+                    new.langs_loaded.add(key)
+                    new.requests.put(("load", job_id, key[0], key[1]))
+            self._cond.notify_all()
+        self._start_listener(new)
+
+    def _new_future(self, worker):
+        """잠금 상태에서 호출"""
+        job_id = next(self._ids)
+        future = Future()
+        self._futures[job_id] = (future, worker.index)
+        worker.pending += 1
+        return job_id, future
+
+    def _assign(self, key, copies):
+        """key 리더를 맡을 작업자를 copies개까지 정함 (맡은 리더가 적은 작업자 우선), 새로 맡은 작업자 반환
+
+        잠금 상태에서 호출. copies가 None이면 모든 작업자.
+        """
+        alive = [w for w in self._workers if w.process.is_alive()]
+        indexes = [i for i in self._assigned.get(key, []) if any(w.index == i for w in alive)]
+        wanted = len(alive) if copies is None else min(max(copies, 1), len(alive))
+        spare = sorted((w for w in alive if w.index not in indexes), key=lambda w: (len(w.langs_loaded), w.pending))
+        added = spare[:max(wanted - len(indexes), 0)]
+        self._assigned[key] = indexes + [w.index for w in added]
+        return added
+
+    def load(self, langs, gpu, copies=None):
+        """리더를 맡을 작업자(copies개, None이면 모두)에 올리고 완료될 때까지 대기"""
+        key = (tuple(langs), gpu)
+        futures = []
+        with self._cond:
+            if not any(w.process.is_alive() for w in self._workers):
+                raise RuntimeError("살아 있는 OCR 작업자 없음")
+            for worker in self._assign(key, copies):
+                job_id, future = self._new_future(worker)
+                worker.langs_loaded.add(key)
+                worker.requests.put(("load", job_id, key[0], gpu))
+                futures.append(future)
+        for future in futures:
+            future.result()
+
+    def release(self, langs, gpu):
+        """맡은 작업자에서 리더 제거 (완료를 기다리지 않음)"""
+        key = (tuple(langs), gpu)
+        with self._cond:
+            indexes = self._assigned.pop(key, [])
+            for worker in self._workers:
+                if worker.index not in indexes:
+                    continue
+                worker.langs_loaded.discard(key)
+                job_id, _ = self._new_future(worker)
+                worker.requests.put(("release", job_id, key[0], gpu))
+
+    def _pick_worker(self, key):
+        """key 리더를 맡은 작업자 중 빈 슬롯이 있고 대기 작업이 적은 곳 (잠금 상태에서 호출)
+
+        맡은 작업자가 모두 죽었으면 다른 작업자에게 맡긴다 (첫 호출에서 리더를 올림).
+        """
+        indexes = self._assigned.get(key)
+        if not indexes or not any(w.index in indexes and w.process.is_alive() for w in self._workers):
+            self._assign(key, 1)
+            indexes = self._assigned[key]
+        candidates = [w for w in self._workers
+                      if w.index in indexes and w.free_slots and w.process.is_alive()]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: w.pending)
+
+    def _any_alive(self):
+        return any(w.process.is_alive() for w in self._workers)
+
+    def call(self, langs, gpu, method, image, **kwargs):
+        """작업자에서 리더 메서드 실행, Future 반환 (살아 있는 작업자가 없으면 바로 RuntimeError)"""
+        if self._closed:
+            raise RuntimeError("OCR 작업자 풀이 종료됨")
+        key = (tuple(langs), gpu)
+        image = np.ascontiguousarray(image)
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._any_alive() or self._pick_worker(key) is not None,
+                                       timeout=self.timeout):
+                raise TimeoutError("사용 가능한 OCR 작업자 슬롯 없음")
+            worker = self._pick_worker(key) if self._any_alive() else None
+            if worker is None:
+                raise RuntimeError("살아 있는 OCR 작업자 없음")
+            job_id, future = self._new_future(worker)
+            worker.langs_loaded.add(key)
+            if image.nbytes <= worker.slot_bytes:
+                slot = worker.free_slots.pop(0)
+                worker.write(slot, image)
+                inline = None
+            else:
+                slot, inline = None, image
+                self.inline_frames += 1
+            worker.requests.put(("call", job_id, slot, image.shape, image.dtype.str, inline,
+                                 key[0], gpu, method, kwargs))
+        return future
+
+    def reader(self, langs, gpu, copies=None):
+        """작업자 copies개(None이면 모두)에 리더를 올리고 easyocr Reader처럼 쓸 수 있는 대리 객체 반환"""
+        self.load(langs, gpu, copies)
+        return RemoteReader(self, langs, gpu)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "workers": len(self._workers),
+                "alive": sum(w.process.is_alive() for w in self._workers),
+                "pending": [w.pending for w in self._workers],
+                "readers": {"+".join(key[0]): len(indexes) for key, indexes in self._assigned.items()},
+                "restarts": self.restarts,
+                "inline_frames": self.inline_frames,
+            }
+
+    def close(self):
+        self._closed = True
+        for worker in self._workers:
+            worker.close()
+        with self._cond:
+            for future, _ in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+
+class RemoteReader:
+    """작업자 프로세스의 easyocr Reader 대리 객체 (readtext/detect/recognize)
+
+    호출한 스레드는 결과를 기다리지만 추론은 다른 프로세스에서 돌므로,
+    여러 영역을 동시에 처리하면 작업자 수만큼 병렬로 실행된다.
+    """
+
+    def __init__(self, pool, langs, gpu):
+        self.pool = pool
+        self.langs = tuple(langs)
+        self.gpu = gpu
+
+    def _call(self, method, image, **kwargs):
+        return self.pool.call(self.langs, self.gpu, method, image, **kwargs).result(timeout=self.pool.timeout)
+
+    def readtext(self, image, **kwargs):
+        return self._call("readtext", image, **kwargs)
+
+    def detect(self, image, **kwargs):
+        return self._call("detect", image, **kwargs)
+
+    def recognize(self, image, **kwargs):
+        return self._call("recognize", image, **kwargs)
+
+    def release(self):
+        """작업자에서 리더 제거 (리더 풀에서 밀려날 때 호출)"""
+        self.pool.release(self.langs, self.gpu)
@@ -0,0 +1,199 @@
+# onnx_backend.py - easyocr 검출(CRAFT)/인식(CRNN) 모델을 ONNX Runtime(CPU)으로 실행
+#
+# 처음 한 번 torch 모델을 ONNX로 내보내고 (선택) int8 동적 양자화를 적용해 디스크에 저장한다.
+# 이후에는 저장된 모델을 불러와서 easyocr Reader의 detector/recognizer 자리에 끼워넣는다.
+# easyocr는 모델을 torch 텐서로 호출하고 결과도 torch 텐서로 받으므로 래퍼가 변환을 맡는다.
+# 정확도/속도 비교: python benchmark.py --frames <폴더> --compare-ocr-backends
+import hashlib
+import inspect
+import os
+import numpy as np
+from app_log import get_logger
+
+log = get_logger("onnx_backend")
+
+# 내보내기 방식이 바뀌면 올려서 캐시에 남은 이전 모델을 다시 만들게 함
+EXPORT_VERSION = 2
+
+def _session(path):
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+class OnnxModel:
+    """torch 모듈처럼 호출할 수 있는 ONNX Runtime 세션 래퍼
+
+    입력 torch 텐서 → numpy → 세션 실행 → 출력 torch 텐서. 추가 인자(인식 모델의 text)는 무시한다.
+    """
+
+    def __init__(self, path, single_output=False):
+        self.path = path
+        self.session = _session(path)
+        self.input_name = self.session.get_inputs()[0].name
+        self.single_output = single_output
+
+    def __call__(self, x, *args, **kwargs):
+        import torch
+        outputs = self.session.run(None, {self.input_name: x.detach().cpu().numpy().astype(np.float32)})
+        tensors = [torch.from_numpy(out) for out in outputs]
+        return tensors[0] if self.single_output else tuple(tensors)
+
+    def eval(self):
+        return self
+
+    def to(self, *args, **kwargs):
+        return self
+
+def _mean_pool_module():
+    """AdaptiveAvgPool2d((None, 1))과 같은 계산 (ONNX는 입력 크기가 바뀌는 적응형 풀링을 내보내지 못함)"""
+    import torch
+
+    class MeanPool(torch.nn.Module):
+        def forward(self, x):
+            return x.mean(dim=3, keepdim=True)
+
+    return MeanPool()
+
+def _recognizer_export_module(recognizer):
+    import torch
+
+    class RecognizerExport(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    return RecognizerExport(recognizer)
+
+def _export(model, dummy, path, **kwargs):
+    """TorchScript 기반 ONNX 내보내기
+
+    torch 2.9부터 기본인 torch.export 기반 내보내기는 dynamic_axes를 제대로 따르지 않아
+    인식 모델의 시퀀스 길이가 예시 입력 너비로 고정되고 (다른 너비에서 Reshape 실패) onnxscript도 필요하다.
+    """
+    import torch
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+    with torch.no_grad():
+        torch.onnx.export(model, dummy, path, **kwargs)
+
+def model_fingerprint(reader):
+    """인식 모델 종류/문자 집합/easyocr 버전으로 캐시 파일 이름 구분"""
+    import easyocr
+    source = "|".join([
+        str(getattr(reader, "model_lang", "")),
+        str(getattr(reader, "character", "")),
+        getattr(easyocr, "__version__", ""),
+    ])
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+def export_detector(reader, path):
+    """CRAFT 검출 모델 → ONNX (배치/높이/너비 가변)"""
+    import torch
+    model = reader.detector
+    model = getattr(model, "module", model)   # DataParallel 해제
+    model.eval()
+    _export(
+        model, torch.randn(1, 3, 640, 640), path, opset_version=17,
+        input_names=["image"], output_names=["score", "feature"],
+        dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"},
+                      "score": {0: "batch", 1: "out_height", 2: "out_width"},
+                      "feature": {0: "batch", 2: "feature_height", 3: "feature_width"}},
+    )
+
+def export_recognizer(reader, path):
+    """CRNN 인식 모델 → ONNX (배치/너비 가변, 높이 64 고정)"""
+    import torch
+    model = reader.recognizer
+    model = getattr(model, "module", model)
+    model.eval()
+    pool = getattr(model, "AdaptiveAvgPool", None)
+    if pool is not None:
+        model.AdaptiveAvgPool = _mean_pool_module()
+    try:
+        _export(
+            _recognizer_export_module(model), torch.randn(1, 1, 64, 256), path, opset_version=17,
+            input_names=["image"], output_names=["prediction"],
+            dynamic_axes={"image": {0: "batch", 3: "width"}, "prediction": {0: "batch", 1: "steps"}},
+        )
+    finally:
+        # torch 경로는 원래 모듈 그대로 유지
+        if pool is not None:
+            model.AdaptiveAvgPool = pool
+
+def quantize(src, dst):
+    """가중치 int8 동적 양자화 (행렬곱/LSTM만)
+
+    합성곱까지 양자화하면 ConvInteger가 되는데 ONNX Runtime CPU에서 fp32 Conv보다 4~7배 느리다.
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul", "Gemm", "LSTM"])
+
+def ensure_onnx_models(reader, cache_dir="onnx_models", use_quantize=True):
+    """캐시에 없으면 내보내기(+양자화), (검출 모델 경로, 인식 모델 경로) 반환"""
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = {}
+    # 검출 모델은 합성곱뿐이라 양자화할 층이 없으므로 항상 fp32
+    for kind, export, name, quantizable in (
+            ("detector", export_detector, f"craft-v{EXPORT_VERSION}", False),
+            ("recognizer", export_recognizer, f"crnn-v{EXPORT_VERSION}-{model_fingerprint(reader)}", True)):
+        suffix = "int8" if use_quantize and quantizable else "fp32"
+        path = os.path.join(cache_dir, f"{name}-{suffix}.onnx")
+        if not os.path.exists(path):
+            fp32_path = os.path.join(cache_dir, f"{name}-fp32.onnx")
+            if not os.path.exists(fp32_path):
+                log.info("[🔧 ONNX 변환] %s → %s", kind, fp32_path)
+                export(reader, fp32_path + ".tmp")
+                os.replace(fp32_path + ".tmp", fp32_path)
+            if suffix == "int8":
+                log.info("[🔧 int8 양자화] %s → %s", kind, path)
+                quantize(fp32_path, path + ".tmp")
+                os.replace(path + ".tmp", path)
+        paths[kind] = path
+    return paths["detector"], paths["recognizer"]
+
+def apply_onnx(reader, cache_dir="onnx_models", use_quantize=True):
+    """easyocr Reader의 검출/인식 모델을 ONNX Runtime 세션으로 교체 (같은 Reader 객체 반환)"""
+    detector_path, recognizer_path = ensure_onnx_models(reader, cache_dir, use_quantize)
+    reader.detector = OnnxModel(detector_path)
+    reader.recognizer = OnnxModel(recognizer_path, single_output=True)
+    reader.onnx_backend = True
+    log.info("[⚡ ONNX Runtime 사용] 검출: %s, 인식: %s", detector_path, recognizer_path)
+    return reader
+
+def quantize_torch(reader):
+    """easyocr가 CPU에서 기본으로 하는 torch 동적 양자화 (quantize=False로 만든 리더를 torch로 쓸 때)"""
+    import torch
+    for name in ("detector", "recognizer"):
+        torch.quantization.quantize_dynamic(getattr(reader, name), dtype=torch.qint8, inplace=True)
+
+def try_apply_onnx(reader, use_gpu, options):
+    """options(apply_onnx 인자)가 있고 CPU 실행이면 ONNX로 교체, 실패하면 torch 모델 그대로 사용"""
+    if not options:
+        return reader
+    if use_gpu:
+        log.warning("[⚠️ GPU 사용 중이라 ONNX 백엔드 생략, torch 사용]")
+        return reader
+    try:
+        return apply_onnx(reader, **options)
+    except Exception as e:
+        log.warning("[⚠️ ONNX 백엔드 적용 실패, torch 사용] %s", e)
+        return reader
+
+def create_reader(langs, use_gpu, options=None):
+    """easyocr Reader 생성 + (options가 있으면) ONNX 교체
+
+    easyocr는 CPU에서 torch 동적 양자화를 기본으로 적용하는데, 양자화된 torch 모듈은
+    ONNX로 내보낼 수 없으므로 ONNX를 쓸 때는 quantize=False로 만든다.
+    ONNX 적용에 실패해서 torch로 돌아가면 원래대로 양자화한다.
+    """
+    import easyocr
+    onnx = bool(options) and not use_gpu
+    reader = easyocr.Reader(list(langs), gpu=use_gpu, quantize=not onnx)
+    reader = try_apply_onnx(reader, use_gpu, options)
+    if onnx and not getattr(reader, "onnx_backend", False):
+        quantize_torch(reader)
+    return reader
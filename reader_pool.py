@@ -0,0 +1,184 @@
+# reader_pool.py - OCR 리더 풀 (언어/장치별 재사용, 메모리 기준 LRU 제거)
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from app_log import get_logger
+
+log = get_logger("reader_pool")
+
+# 모델 크기를 알 수 없을 때 사용할 리더 1개당 메모리 추정치(MB)
+DEFAULT_READER_MB = 300
+
+def detect_script(text):
+    """텍스트의 주 문자 체계 판별 ('ko', 'ja', 'zh', 'latin', None)
+
+    가나가 하나라도 있으면 일본어로 본다 (일본어 문장에는 한자가 섞이므로).
+    """
+    counts = {"ko": 0, "ja": 0, "han": 0, "latin": 0}
+    for ch in text:
+        code = ord(ch)
+        if 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+            counts["ko"] += 1
+        elif 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+            counts["ja"] += 1
+        elif 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            counts["han"] += 1
+        elif ch.isalpha() and unicodedata.name(ch, "").startswith("LATIN"):
+            counts["latin"] += 1
+    if counts["ja"]:
+        return "ja"
+    if counts["ko"] and counts["ko"] >= counts["han"]:
+        return "ko"
+    if counts["han"]:
+        return "zh"
+    if counts["latin"]:
+        return "latin"
+    return None
+
+def langs_for_script(script, default):
+    """문자 체계에 맞는 OCR 언어 목록"""
+    return {
+        "ko": ["ko", "en"],
+        "ja": ["ja", "en"],
+        "zh": ["ch_sim", "en"],
+        "latin": ["en"],
+    }.get(script, default)
+
+def script_for_langs(lang_list):
+    """OCR 언어 목록이 주로 읽는 문자 체계 (langs_for_script의 반대)"""
+    return {"ko": "ko", "ja": "ja", "ch_sim": "zh", "ch_tra": "zh"}.get(lang_list[0] if lang_list else None, "latin")
+
+def estimate_reader_mb(reader):
+    """리더의 모델 파라미터 크기로 메모리 사용량(MB) 추정"""
+    # 모델이 없는 엔진은 직접 밝힌 값 사용
+    declared = getattr(reader, "memory_mb", None)
+    if declared is not None:
+        return declared
+    total = 0
+    for attr in ("detector", "recognizer"):
+        model = getattr(reader, attr, None)
+        parameters = getattr(model, "parameters", None)
+        if parameters is None:
+            continue
+        try:
+            total += sum(p.numel() * p.element_size() for p in parameters())
+        except Exception:
+            pass
+    if not total:
+        return DEFAULT_READER_MB
+    # 추론 중 활성화 메모리 등 여유분 포함
+    return total * 2 / (1024 * 1024)
+
+class ReaderPool:
+    """(언어 목록, GPU 여부, OCR 엔진)별 리더를 재사용하고, 메모리 한도를 넘으면 오래 안 쓴 것부터 제거
+
+    pin()으로 고정한 리더(밖에서 계속 참조하는 기본 리더)는 제거하지 않는다.
+    참조가 남은 리더를 풀에서 빼봐야 메모리는 풀리지 않고 다음에 같은 리더를 또 만들게 되기 때문.
+    """
+
+    def __init__(self, factory, max_memory_mb=1500, idle_seconds=600):
+        self.factory = factory            # factory(lang_list, gpu, engine) -> reader 또는 None
+        self.max_memory_mb = max_memory_mb
+        self.idle_seconds = idle_seconds
+        self._readers = OrderedDict()     # 키 -> [리더, 메모리 추정치, 마지막 사용 시각]
+        self._lock = threading.RLock()
+        self._loading = {}                # 키 -> 생성 중 잠금
+        self.pinned = None                # 제거하지 않을 키
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @staticmethod
+    def make_key(lang_list, gpu, engine="easyocr"):
+        return (tuple(lang_list), bool(gpu), engine)
+
+    def pin(self, lang_list, gpu, engine="easyocr"):
+        """이 리더를 제거 대상에서 제외 (이전에 고정한 리더는 해제)"""
+        with self._lock:
+            self.pinned = self.make_key(lang_list, gpu, engine)
+
+    def peek(self, lang_list, gpu, engine="easyocr"):
+        """이미 로드된 리더만 반환 (없으면 None, 새로 만들지 않음)"""
+        key = self.make_key(lang_list, gpu, engine)
+        with self._lock:
+            entry = self._readers.get(key)
+            if entry is None:
+                return None
+            entry[2] = time.monotonic()
+            self._readers.move_to_end(key)
+            return entry[0]
+
+    def get(self, lang_list, gpu, engine="easyocr"):
+        """리더 반환 (없으면 생성 후 메모리 한도에 맞게 다른 리더 제거)"""
+        key = self.make_key(lang_list, gpu, engine)
+        reader = self.peek(lang_list, gpu, engine)
+        if reader is not None:
+            self.reused += 1
+            return reader
+        # 같은 키는 한 번만 생성 (다른 키 생성은 막지 않음)
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            reader = self.peek(lang_list, gpu, engine)
+            if reader is not None:
+                self.reused += 1
+                return reader
+            reader = self.factory(list(lang_list), gpu, engine)
+            if reader is None:
+                return None
+            with self._lock:
+                self._readers[key] = [reader, estimate_reader_mb(reader), time.monotonic()]
+                self.created += 1
+                self._evict(keep=key)
+            return reader
+
+    def _evict(self, keep=None):
+        """유휴 리더와 메모리 한도 초과분 제거 (잠금 상태에서 호출)"""
+        now = time.monotonic()
+        removable = [key for key in self._readers if key != keep and key != self.pinned]
+        for key in removable:
+            if now - self._readers[key][2] > self.idle_seconds:
+                self._remove(key, "유휴")
+        for key in removable:
+            if self.memory_mb() <= self.max_memory_mb:
+                break
+            if key in self._readers:
+                self._remove(key, "메모리 한도")
+
+    def _remove(self, key, reason):
+        reader = self._readers.pop(key)[0]
+        # 작업자 프로세스 리더 등 따로 정리할 것이 있으면 정리
+        release = getattr(reader, "release", None)
+        if release is not None:
+            release()
+        self.evicted += 1
+        log.info("[🧹 OCR 리더 제거] %s %s GPU=%s (%s)", key[2], list(key[0]), key[1], reason)
+
+    def evict_idle(self):
+        """오래 사용하지 않은 리더 제거"""
+        with self._lock:
+            self._evict()
+
+    def memory_mb(self):
+        with self._lock:
+            return sum(entry[1] for entry in self._readers.values())
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._readers)
+
+    def clear(self):
+        with self._lock:
+            self._readers.clear()
+
+    def stats(self):
+        """풀 통계"""
+        with self._lock:
+            return {
+                "readers": [f"{k[2]}:{'+'.join(k[0])}" for k in self._readers],
+                "memory_mb": round(self.memory_mb(), 1),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,130 @@
+# regions.py - 여러 OCR 영역 (영역별 주기/언어/오버레이와 영역별 인식 상태)
+from config import get_setting
+from change_detect import ChangeDetector
+from line_tracker import LineTracker
+from tile_tracker import TileTracker
+from scheduler import AdaptiveScheduler
+from stabilizer import TextStabilizer
+
+class OcrRegion:
+    """이름 있는 OCR 영역 하나와 그 영역의 변화 감지/상자 재사용/텍스트 안정화 상태
+
+    box, interval, lang이 None이면 OCR_REGION, OCR_INTERVAL, SOURCE_LANG 설정을 따른다
+    (기존 단일 영역 설정과 호환). engine이 None이면 언어별/기본 OCR 엔진 설정을 따른다.
+    ADAPTIVE_INTERVAL이 켜져 있으면 주기(interval 또는 OCR_INTERVAL)는 고정 주기 대신
+    화면이 그대로일 때 가장 느린 주기 상한으로 쓰고, 변화 직후에는 OCR_MIN_INTERVAL까지 빨라진다.
+    """
+
+    def __init__(self, name="main", box=None, interval=None, lang=None, overlay="main", fixed_boxes=None,
+                 engine=None):
+        self.name = name
+        self.box = tuple(int(v) for v in box) if box else None
+        self.interval = interval
+        self.lang = lang
+        self.overlay = overlay
+        self.fixed_boxes = fixed_boxes   # None이면 OCR_FIXED_BOXES 설정 사용
+        self.engine = engine             # 'easyocr', 'tesseract' 등
+        self.change_detector = ChangeDetector()
+        self.line_tracker = LineTracker()
+        self.tile_tracker = TileTracker()
+        self.reset()
+
+    def reset(self):
+        self.current_script = None    # 언어 탐색으로 정한 문자 체계 (리더 선택에 사용)
+        self.route_probe = None       # 백그라운드 언어 탐색 작업
+        self.route_checked_at = float("-inf")
+        self.stabilizer = self.create_stabilizer()
+        self.next_due = 0.0
+        self.pending = None           # 처리 중인 작업 (같은 영역은 동시에 한 번만 처리)
+        self.awaiting = False         # 캡처됐고 OCR 단계에서 처리할 차례
+        self.scheduler = self.create_scheduler()
+        self.change_detector.reset()
+        self.line_tracker.reset()
+        self.tile_tracker.reset()
+
+    def get_box(self):
+        box = self.box or get_setting("OCR_REGION")
+        return tuple(int(v) for v in box) if box else None
+
+    def get_interval(self):
+        return self.interval if self.interval is not None else get_setting("OCR_INTERVAL")
+
+    def create_scheduler(self):
+        """설정에 맞는 주기 스케줄러 (적응형이 꺼져 있으면 고정 주기, 켜져 있으면 주기가 상한)"""
+        interval = self.get_interval()
+        if not get_setting("ADAPTIVE_INTERVAL", True):
+            return AdaptiveScheduler(interval, interval)
+        return AdaptiveScheduler(
+            min_interval=min(get_setting("OCR_MIN_INTERVAL", 0.2), interval),
+            max_interval=interval,
+            backoff=get_setting("OCR_BACKOFF", 1.5),
+        )
+
+    def create_stabilizer(self):
+        """설정에 맞는 텍스트 안정화 상태"""
+        return TextStabilizer(get_setting("STABILIZE_SIMILARITY", 0.9), get_setting("STABILIZE_FRAMES", 2))
+
+    def get_lang(self):
+        return self.lang or get_setting("SOURCE_LANG")
+
+    def is_due(self, now):
+        """주기가 돌아왔고 이전 작업이 끝났는지 (캡처 단계에서 확인)"""
+        return now >= self.next_due and (self.pending is None or self.pending.done())
+
+    def start(self):
+        """캡처됨: OCR 단계가 처리를 마칠 때까지 다음 시각은 정하지 않음"""
+        self.next_due = float("inf")
+        self.awaiting = True
+
+    def take(self):
+        """OCR 단계에서 처리할 차례이면 True (한 번만)"""
+        if self.awaiting and (self.pending is None or self.pending.done()):
+            self.awaiting = False
+            return True
+        return False
+
+    def finish(self, started, changed):
+        """처리 끝: 변화 여부로 주기를 조절하고 처리 시작 시각 기준으로 다음 시각 결정"""
+        self.scheduler.record(changed)
+        self.next_due = self.scheduler.next_due(started)
+
+def load_regions():
+    """OCR_REGIONS 설정으로 영역 목록 생성 (비어 있으면 OCR_REGION 하나)
+
+    OCR_REGIONS 항목 예: {"name": "subtitle", "region": [x1, y1, x2, y2],
+                          "interval": 0.5, "lang": "ja", "overlay": "main", "engine": "tesseract"}
+    """
+    specs = get_setting("OCR_REGIONS") or []
+    if not specs:
+        return [OcrRegion()]
+    regions = []
+    for i, spec in enumerate(specs):
+        regions.append(OcrRegion(
+            name=spec.get("name") or f"region{i + 1}",
+            box=spec["region"],
+            interval=spec.get("interval"),
+            lang=spec.get("lang"),
+            overlay=spec.get("overlay", "main"),
+            fixed_boxes=spec.get("fixed_boxes", []),
+            engine=spec.get("engine"),
+        ))
+    return regions
+
+def overlay_targets():
+    """설정된 영역들이 사용하는 오버레이 이름 목록 (순서 유지)"""
+    names = []
+    for region in load_regions():
+        if region.overlay not in names:
+            names.append(region.overlay)
+    return names
+
+def union_box(boxes):
+    """여러 영역을 모두 포함하는 최소 사각형 (한 번에 캡처할 범위)"""
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def slice_region(frame, origin, box):
+    """한 번에 캡처한 프레임에서 영역 부분만 잘라냄 (복사 없는 NumPy 뷰)"""
+    ox, oy = origin[0], origin[1]
+    x1, y1, x2, y2 = box
+    return frame[max(y1 - oy, 0):max(y2 - oy, 0), max(x1 - ox, 0):max(x2 - ox, 0)]
@@ -0,0 +1,38 @@
+# scheduler.py - 화면 변화에 따라 OCR 주기 조절 (변화 직후 빠르게, 그대로면 점점 느리게)
+
+class AdaptiveScheduler:
+    """OCR 주기 스케줄러
+
+    - 화면이 바뀌면 주기를 min_interval로 줄인다 (대사가 넘어간 직후 빠르게 따라감).
+    - 바뀌지 않으면 backoff배씩 늘려서 max_interval까지 느려진다 (정지 화면에서 CPU 절약).
+    - 다음 시각은 처리를 시작한 시각 기준이므로 OCR에 걸린 시간만큼 덜 기다린다.
+    min_interval == max_interval이면 고정 주기와 같다.
+    """
+
+    def __init__(self, min_interval=0.2, max_interval=2.0, backoff=1.5):
+        self.min_interval = max(min_interval, 0.0)
+        self.max_interval = max(max_interval, self.min_interval)
+        self.backoff = max(backoff, 1.0)
+        self.reset()
+
+    def reset(self):
+        self.interval = self.min_interval
+        self.polls = 0
+        self.changes = 0
+
+    def record(self, changed):
+        """이번 처리에서 화면이 바뀌었는지 반영하고 다음 주기(초) 반환"""
+        self.polls += 1
+        if changed:
+            self.changes += 1
+            self.interval = self.min_interval
+        else:
+            self.interval = min(max(self.interval, 0.01) * self.backoff, self.max_interval)
+        return self.interval
+
+    def next_due(self, started):
+        """처리를 시작한 시각(time.monotonic) 기준 다음 처리 시각"""
+        return started + self.interval
+
+    def stats(self):
+        return {"polls": self.polls, "changes": self.changes, "interval": self.interval}
@@ -0,0 +1,145 @@
+# stabilizer.py - OCR 흔들림(l/1 뒤바뀜, 튀는 문장부호 등) 때문에 같은 문장을 다시 번역하지 않도록 안정화
+import re
+import unicodedata
+
+# 비교할 때 같은 글자로 보는 OCR 혼동 문자
+CONFUSABLES = str.maketrans({
+    "1": "l", "I": "l", "|": "l", "í": "l",
+    "0": "o", "O": "o",
+    "“": '"', "”": '"', "‘": "'", "’": "'",
+})
+
+# 글자에 붙지 않은 숫자 (He11o 같은 단어 속 숫자는 l/1 혼동일 수 있으므로 제외)
+NUMBER_RE = re.compile(r"(?<![^\W\d_])\d+(?:[.,]\d+)*(?![^\W\d_])")
+# 부정 표현 (영어 단어, 축약형, 한/중/일 부정 표지)
+NEGATION_RE = re.compile(r"\b(?:not|no|never|nothing|none|nobody|nowhere|neither|nor|without|cannot)\b|n['’]t\b"
+                         r"|않|못|없|안 |ない|ません|なかった|不|没|沒|别|別|無|无|非")
+# 이 글자 수까지는 한 글자도 다르면 다른 텍스트 (짧은 문장은 한 글자 차이가 곧 다른 뜻)
+SHORT_TEXT_CHARS = 8
+
+def content_signature(text):
+    """정확히 같아야 하는 내용: (숫자 목록, 부정 표현 목록)
+
+    "3개 → 5개", "will → won't"는 글자 몇 개 차이지만 뜻이 바뀌므로 흔들림으로 보면 안 된다.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return tuple(NUMBER_RE.findall(text)), tuple(m.lower() for m in NEGATION_RE.findall(text.lower()))
+
+def normalize_ocr_text(text):
+    """비교용 정규화: 전각/반각 통일, 혼동 문자 통일, 소문자, 문장부호/공백 제거"""
+    text = unicodedata.normalize("NFKC", text).translate(CONFUSABLES).lower()
+    return "".join(ch for ch in text if not ch.isspace() and not unicodedata.category(ch).startswith("P"))
+
+def edit_distance(a, b, max_distance=None):
+    """레벤슈타인 거리 (max_distance를 넘으면 max_distance + 1 반환, 대각선 띠만 계산)"""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+    over = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [over] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_min = current[0]
+        a_char = a[i - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (a_char != b[j - 1])
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+def similarity(a, b, threshold=0.0):
+    """1 - 편집 거리 / 긴 쪽 길이 (threshold 미만인 것이 확실하면 계산을 일찍 멈춤)"""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    max_distance = int(longest * (1.0 - threshold))
+    return 1.0 - min(edit_distance(a, b, max_distance), longest) / longest
+
+def allowed_edits(length, threshold):
+    """길이 length인 텍스트에서 흔들림으로 볼 최대 편집 거리 (짧을수록 엄격, SHORT_TEXT_CHARS 이하는 0)"""
+    return max(int((length - SHORT_TEXT_CHARS) * (1.0 - threshold)), 0)
+
+def is_jitter(a, b, threshold):
+    """두 (정규화 텍스트, 내용 서명)이 같은 텍스트를 흔들리게 읽은 것인지"""
+    (a_key, a_signature), (b_key, b_signature) = a, b
+    if a_signature != b_signature:
+        return False
+    if a_key == b_key:
+        return True
+    max_distance = allowed_edits(max(len(a_key), len(b_key)), threshold)
+    return max_distance > 0 and edit_distance(a_key, b_key, max_distance) <= max_distance
+
+class TextStabilizer:
+    """새 텍스트를 바로 번역하지 않고 여러 프레임에서 같게 읽힐 때 확정
+
+    - 확정된 텍스트와 숫자/부정 표현이 같고 정규화 후 편집 거리가 길이에 따른 허용치 이내면
+      (allowed_edits, 긴 문장일수록 1 - threshold 비율에 가까워짐) OCR 흔들림으로 보고 무시한다.
+    - 다른 텍스트는 후보가 되고, confirm_frames번 연속 비슷하게 읽히면 확정해서 반환한다.
+    - 화면이 바뀌지 않은 프레임(OCR 생략)도 후보가 그대로라는 뜻이므로 확인으로 센다.
+    """
+
+    def __init__(self, threshold=0.9, confirm_frames=2):
+        self.threshold = threshold
+        self.confirm_frames = max(confirm_frames, 1)
+        self.reset()
+
+    def reset(self):
+        self.committed_key = None
+        self.committed_text = ""
+        self.candidate_key = None
+        self.candidate_texts = {}     # 후보로 읽힌 원문별 횟수 (확정 시 가장 많이 읽힌 원문 사용)
+        self.candidate_count = 0
+        self.suppressed = 0
+        self.commits = 0
+
+    def update(self, text):
+        """OCR 텍스트 반영, 새로 확정된 텍스트 반환 (번역할 필요가 없으면 None)"""
+        key = (normalize_ocr_text(text), content_signature(text))
+        if self.committed_key is not None and is_jitter(key, self.committed_key, self.threshold):
+            # 확정된 텍스트가 흔들린 것: 후보 취소
+            self.candidate_key = None
+            self.candidate_count = 0
+            self.suppressed += 1
+            return None
+        if self.candidate_key is None or not is_jitter(key, self.candidate_key, self.threshold):
+            self.candidate_key = key
+            self.candidate_texts = {}
+            self.candidate_count = 0
+        self.candidate_count += 1
+        # 같은 횟수면 최근 것이 앞서도록 다시 넣음
+        self.candidate_texts[text] = self.candidate_texts.pop(text, 0) + 1
+        return self._commit_if_stable()
+
+    def confirm(self):
+        """화면 변화가 없는 프레임: 후보가 있으면 한 번 더 확인된 것으로 셈"""
+        if self.candidate_key is None:
+            return None
+        self.candidate_count += 1
+        return self._commit_if_stable()
+
+    def _commit_if_stable(self):
+        if self.candidate_count < self.confirm_frames:
+            return None
+        self.committed_key = self.candidate_key
+        self.committed_text = max(reversed(self.candidate_texts.items()), key=lambda item: item[1])[0]
+        self.candidate_key = None
+        self.candidate_count = 0
+        self.commits += 1
+        return self.committed_text
+
+    def stats(self):
+        return {"commits": self.commits, "suppressed": self.suppressed}
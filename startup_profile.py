@@ -0,0 +1,111 @@
+# startup_profile.py - 시작 시간 측정 (python main.py --profile-startup)
+#
+# 단계별 소요 시간과 모듈 임포트 비용(누적/자체)을 기록해서 창이 뜬 뒤와 백그라운드 로딩이 끝난 뒤 출력한다.
+# 꺼져 있으면 phase()는 아무 일도 하지 않는다.
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """시작 단계/임포트 시간 기록기"""
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.phases = []        # (이름, 시작 오프셋, 소요 시간, 스레드 이름)
+        self.imports = {}       # 모듈 이름 → [누적 시간, 자체 시간, 최상위 임포트 여부]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    def enable(self, started=None):
+        """측정 시작 (임포트 훅 설치)"""
+        if self.enabled:
+            return
+        self.enabled = True
+        if started is not None:
+            self.started = started
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 이미 불러온 모듈이나 상대 임포트는 측정하지 않음
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)   # 하위 임포트에 쓴 시간
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                entry = self.imports.setdefault(name, [0.0, 0.0, False])
+                entry[0] += elapsed
+                entry[1] += elapsed - children
+                entry[2] = entry[2] or not stack
+
+    def offset(self):
+        """시작 후 지난 시간(초)"""
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name):
+        """단계 시간 측정"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases.append((name, started - self.started, elapsed, threading.current_thread().name))
+            print(f"[⏱️ 시작 단계] {name}: {elapsed * 1000:.0f}ms")
+
+    def mark(self, name):
+        """시점 기록 (소요 시간 0인 단계)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.phases.append((name, self.offset(), 0.0, threading.current_thread().name))
+        print(f"[⏱️ 시작 시점] {name}: 시작 후 {self.offset() * 1000:.0f}ms")
+
+    def report(self, title, top=15):
+        """단계별 시간과 비용이 큰 임포트 출력"""
+        if not self.enabled:
+            return
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+            imports = [(name, total, own) for name, (total, own, root) in self.imports.items() if root]
+            owners = sorted(((name, own) for name, (_, own, _) in self.imports.items()), key=lambda i: -i[1])
+        print(f"[📊 시작 프로파일] {title} (시작 후 {self.offset() * 1000:.0f}ms)")
+        print(f"  {'단계':<28} {'시작':>8} {'소요':>8}  스레드")
+        for name, offset, elapsed, thread in phases:
+            print(f"  {name:<28} {offset * 1000:>6.0f}ms {elapsed * 1000:>6.0f}ms  {thread}")
+        print(f"  최상위 임포트 (누적/자체, 상위 {top}개)")
+        for name, total, own in sorted(imports, key=lambda i: -i[1])[:top]:
+            print(f"    {name:<32} {total * 1000:>7.1f}ms {own * 1000:>7.1f}ms")
+        print(f"  자체 시간이 큰 모듈 (상위 {top}개)")
+        for name, own in owners[:top]:
+            print(f"    {name:<32} {own * 1000:>7.1f}ms")
+
+# 전역 프로파일러 (main.py가 --profile-startup일 때 켬)
+profiler = StartupProfiler()
+
+def phase(name):
+    """전역 프로파일러의 단계 측정 (꺼져 있으면 아무 일도 하지 않음)"""
+    return profiler.phase(name)
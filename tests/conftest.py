@@ -0,0 +1,5 @@
+# 저장소 최상위 모듈을 테스트에서 바로 가져올 수 있도록
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
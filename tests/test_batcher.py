@@ -0,0 +1,85 @@
+# batcher.py 테스트 (그룹별 묶음, 개수/시간 전송, 오류 전달) + 번역기의 묶음 전송
+import threading
+
+import pytest
+
+from batcher import MicroBatcher
+
+class Recorder:
+    def __init__(self, fail=None):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, group, items):
+        self.calls.append((group, list(items)))
+        if self.fail:
+            raise self.fail
+        return [f"{group}:{item}" for item in items]
+
+def test_groups_are_batched_separately():
+    batch = Recorder()
+    batcher = MicroBatcher(batch, window=0.05, max_size=10)
+    futures = [batcher.submit("a", 1), batcher.submit("b", 2), batcher.submit("a", 3)]
+    assert [f.result(timeout=2) for f in futures] == ["a:1", "b:2", "a:3"]
+    assert sorted(batch.calls) == [("a", [1, 3]), ("b", [2])]
+    assert batcher.stats() == {"batches": 2, "items": 3, "avg_batch_size": 1.5}
+
+def test_flushes_immediately_when_full():
+    batch = Recorder()
+    # 시간으로는 전송되지 않을 만큼 긴 window
+    batcher = MicroBatcher(batch, window=60, max_size=lambda group: 2)
+    first = batcher.submit("a", 1)
+    assert not first.done()
+    second = batcher.submit("a", 2)
+    assert first.done() and second.done()
+    assert batch.calls == [("a", [1, 2])]
+    assert not batcher._timers
+
+def test_flushes_after_window():
+    batch = Recorder()
+    batcher = MicroBatcher(batch, window=0.01, max_size=50)
+    assert batcher.submit("a", 1).result(timeout=2) == "a:1"
+    assert batch.calls == [("a", [1])]
+
+def test_errors_reach_every_caller():
+    batcher = MicroBatcher(Recorder(fail=RuntimeError("down")), window=60, max_size=2)
+    futures = [batcher.submit("a", 1), batcher.submit("a", 2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="down"):
+            future.result(timeout=2)
+
+def test_result_count_mismatch_is_an_error():
+    batcher = MicroBatcher(lambda group, items: [], window=60, max_size=1)
+    with pytest.raises(ValueError):
+        batcher.submit("a", 1).result(timeout=2)
+
+def test_translator_sends_group_languages(monkeypatch):
+    import translator
+    calls = []
+
+    def request(texts, source, target):
+        calls.append((source, target, list(texts)))
+        return [f"{target}:{t}" for t in texts]
+
+    monkeypatch.setitem(translator.ENGINES, "rec", (request, None, 50))
+    monkeypatch.setattr(translator._batcher, "window", 0.01)
+    assert translator._request_translations("rec", "ja", "ko", ["a"]) == ["ko:a"]
+    assert translator._request_translations("rec", "fr", "en", ["b"]) == ["en:b"]
+    assert calls == [("ja", "ko", ["a"]), ("fr", "en", ["b"])]
+
+def test_translator_stops_waiting_for_stuck_engine(monkeypatch):
+    import translator
+    release = threading.Event()
+
+    def stuck(texts, source, target):
+        release.wait(5)
+        return list(texts)
+
+    monkeypatch.setitem(translator.ENGINES, "stuck", (stuck, None, 50))
+    monkeypatch.setattr(translator._batcher, "window", 0.01)
+    monkeypatch.setattr(translator, "_batch_timeout", lambda: 0.1)
+    try:
+        with pytest.raises(translator.TranslationError, match="시간 초과"):
+            translator._request_translations("stuck", "en", "ko", ["a"])
+    finally:
+        release.set()
@@ -0,0 +1,111 @@
+# config.py 테스트 (타입 변환, 변경 구독, 미뤄둔 저장)
+import json
+import time
+
+import pytest
+
+import config
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """설정 파일은 임시 폴더에, 테스트가 바꾼 설정은 끝나면 되돌림"""
+    monkeypatch.setattr(config, "SETTINGS_PATH", str(tmp_path / "settings.json"))
+    saved = dict(config._settings)
+    yield tmp_path / "settings.json"
+    if config._save_timer is not None:
+        config._save_timer.cancel()
+    config._save_timer = None
+    config._save_pending = False
+    config._settings.clear()
+    config._settings.update(saved)
+
+def test_coerce_matches_default_types():
+    assert config._coerce("AUTO_DETECT_LANG", 0) is False
+    assert config._coerce("AUTO_DETECT_LANG", True) is True
+    assert config._coerce("TM_MAX_ENTRIES", 5.0) == 5 and isinstance(config._coerce("TM_MAX_ENTRIES", 5.0), int)
+    assert config._coerce("HTTP_READ_TIMEOUT", 3) == 3.0 and isinstance(config._coerce("HTTP_READ_TIMEOUT", 3), float)
+    assert config._coerce("OCR_REGION", [1, 2, 3, 4]) == [1, 2, 3, 4]
+    assert config._coerce("ENGINE", "libretranslate") == "libretranslate"
+    # 기본값이 없는 키와 None은 그대로
+    assert config._coerce("NOT_A_SETTING", object) is object
+    assert config._coerce("ENGINE", None) is None
+
+@pytest.mark.parametrize("key, value, error", [
+    ("AUTO_DETECT_LANG", "yes", TypeError),
+    ("AUTO_DETECT_LANG", 2, TypeError),
+    ("TM_MAX_ENTRIES", True, TypeError),
+    ("TM_MAX_ENTRIES", "10", TypeError),
+    ("TM_MAX_ENTRIES", 1.5, ValueError),
+    ("OCR_REGION", "1,2,3,4", TypeError),
+    ("ENGINE", 3, TypeError),
+])
+def test_coerce_rejects_wrong_types(key, value, error):
+    with pytest.raises(error):
+        config._coerce(key, value)
+
+def test_update_setting_rejects_unknown_and_invalid(settings):
+    assert not config.update_setting("NOT_A_SETTING", 1)
+    assert not config.update_setting("TM_MAX_ENTRIES", "many")
+    assert config.get_setting("TM_MAX_ENTRIES") == config.DEFAULT_SETTINGS["TM_MAX_ENTRIES"]
+    assert config.update_setting("TM_MAX_ENTRIES", 10.0)
+    assert config.get_setting("TM_MAX_ENTRIES") == 10
+
+def test_subscribers_get_only_their_changed_keys(settings):
+    seen, everything = [], []
+    unsubscribe = config.subscribe(("HTTP_READ_TIMEOUT", "TM_MAX_ENTRIES"), seen.append)
+    unsubscribe_all = config.subscribe(None, everything.append)
+    try:
+        config.update_settings({"HTTP_READ_TIMEOUT": 4, "TM_MAX_ENTRIES": 7, "HOTKEY": "f9"})
+        # 값이 같으면 알리지 않음
+        config.update_setting("TM_MAX_ENTRIES", 7)
+        config.update_setting("HOTKEY", "f10")
+    finally:
+        unsubscribe()
+        unsubscribe_all()
+    config.update_setting("TM_MAX_ENTRIES", 8)
+    assert seen == [{"HTTP_READ_TIMEOUT": 4.0, "TM_MAX_ENTRIES": 7}]
+    assert everything == [{"HTTP_READ_TIMEOUT": 4.0, "TM_MAX_ENTRIES": 7, "HOTKEY": "f9"}, {"HOTKEY": "f10"}]
+
+def test_subscriber_errors_do_not_stop_others(settings):
+    seen = []
+
+    def broken(changes):
+        raise RuntimeError("boom")
+
+    unsubscribe = [config.subscribe("HOTKEY", broken), config.subscribe("HOTKEY", seen.append)]
+    try:
+        assert config.update_setting("HOTKEY", "f9")
+    finally:
+        for func in unsubscribe:
+            func()
+    assert seen == [{"HOTKEY": "f9"}]
+
+def test_save_is_debounced(settings):
+    config.update_setting("HOTKEY", "f9")
+    config.save_settings(delay=0.1)
+    config.update_setting("HOTKEY", "f10")
+    config.save_settings(delay=0.1)   # 앞선 저장 예약을 미룸
+    assert not settings.exists()
+    deadline = time.monotonic() + 2
+    while not settings.exists() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert json.loads(settings.read_text(encoding="utf-8"))["HOTKEY"] == "f10"
+    assert not config._save_pending
+
+def test_flush_writes_pending_save_now(settings):
+    config.update_setting("HOTKEY", "f9")
+    config.save_settings(delay=60)
+    assert not settings.exists()
+    assert config.flush_settings()
+    assert json.loads(settings.read_text(encoding="utf-8"))["HOTKEY"] == "f9"
+    assert config._save_timer is None
+    # 미뤄둔 저장이 없으면 아무것도 하지 않음
+    settings.unlink()
+    assert config.flush_settings()
+    assert not settings.exists()
+
+def test_load_coerces_and_skips_invalid_values(settings):
+    settings.write_text(json.dumps({"TM_MAX_ENTRIES": 9.0, "HTTP_READ_TIMEOUT": "slow"}), encoding="utf-8")
+    config.load_settings()
+    assert config.get_setting("TM_MAX_ENTRIES") == 9
+    assert config.get_setting("HTTP_READ_TIMEOUT") == config.DEFAULT_SETTINGS["HTTP_READ_TIMEOUT"]
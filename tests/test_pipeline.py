@@ -0,0 +1,58 @@
+# pipeline.py 테스트 (LatestQueue: 가득 차면 오래된 항목 버림, 같은 key는 교체)
+import threading
+import time
+
+from pipeline import LatestQueue
+
+def drain(queue):
+    items = []
+    while True:
+        item = queue.get_nowait()
+        if item is None:
+            return items
+        items.append(item)
+
+def test_full_queue_drops_oldest():
+    queue = LatestQueue(maxsize=2)
+    for i in range(5):
+        queue.put(i)
+    assert queue.dropped == 3
+    assert drain(queue) == [3, 4]
+
+def test_same_key_replaces_only_that_item():
+    queue = LatestQueue(maxsize=3)
+    queue.put("a1", key="a")
+    queue.put("b1", key="b")
+    queue.put("a2", key="a")
+    assert queue.dropped == 1
+    # 교체된 항목은 순서상 뒤로 감, 다른 key의 항목은 밀려나지 않음
+    assert drain(queue) == ["b1", "a2"]
+
+def test_keyed_items_still_respect_maxsize():
+    queue = LatestQueue(maxsize=2)
+    queue.put("a", key="a")
+    queue.put("b", key="b")
+    queue.put("c", key="c")
+    assert queue.dropped == 1
+    assert drain(queue) == ["b", "c"]
+
+def test_get_times_out_when_empty():
+    queue = LatestQueue()
+    started = time.monotonic()
+    assert queue.get(timeout=0.05) is None
+    assert time.monotonic() - started >= 0.04
+
+def test_get_wakes_on_put():
+    queue = LatestQueue()
+    timer = threading.Timer(0.05, queue.put, args=("x",))
+    timer.start()
+    assert queue.get(timeout=2) == "x"
+    timer.join()
+
+def test_clear_empties_queue():
+    queue = LatestQueue(maxsize=3)
+    queue.put(1)
+    queue.put(2)
+    queue.clear()
+    assert len(queue) == 0
+    assert queue.get_nowait() is None
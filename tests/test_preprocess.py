@@ -0,0 +1,38 @@
+# preprocess.py 테스트 (글자 높이 추정, 프리셋 배율)
+import cv2
+import numpy as np
+
+from preprocess import estimate_text_height, preprocess, to_gray
+
+def subtitle(cap_height, background):
+    """cap_height px 대문자 높이의 자막 한 줄 (200x1500 RGB)"""
+    rng = np.random.default_rng(0)
+    if background == "noisy":
+        small = rng.integers(0, 255, (25, 188, 3), dtype=np.uint8)
+        image = cv2.resize(small, (1500, 200), interpolation=cv2.INTER_LINEAR)
+    else:
+        image = np.full((200, 1500, 3), 30, dtype=np.uint8)
+    font = cv2.FONT_HERSHEY_DUPLEX
+    scale = cap_height / cv2.getTextSize("H", font, 1.0, 1)[0][1]
+    origin = (40, 100 + cap_height // 2)
+    cv2.putText(image, "The ancient gate will open at dawn.", origin, font, scale, (0, 0, 0), 5, cv2.LINE_AA)
+    cv2.putText(image, "The ancient gate will open at dawn.", origin, font, scale, (255, 255, 255), 2, cv2.LINE_AA)
+    return image
+
+def test_estimates_text_height_on_plain_background():
+    height = estimate_text_height(to_gray(subtitle(48, "plain")))
+    assert 36 <= height <= 60
+
+def test_busy_background_is_not_taken_for_text():
+    # 모든 행이 배경과 달라 보여도 이미지 전체 높이를 글자 높이로 보지 않음
+    assert estimate_text_height(to_gray(subtitle(16, "noisy"))) is None
+    image, scale = preprocess(subtitle(16, "noisy"), "fast")
+    assert scale == 1.0 and image.shape == (200, 1500)
+
+def test_presets_scale_large_text_down():
+    frame = subtitle(48, "plain")
+    image, scale = preprocess(frame, "none")
+    assert image is frame and scale == 1.0
+    image, scale = preprocess(frame, "fast")
+    assert scale < 0.6
+    assert image.shape == (round(200 * scale), round(1500 * scale))
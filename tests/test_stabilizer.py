@@ -0,0 +1,86 @@
+# stabilizer.py 테스트 (편집 거리, 흔들림 판정)
+import pytest
+
+from stabilizer import TextStabilizer, edit_distance, is_jitter, normalize_ocr_text, content_signature
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0),
+    ("abc", "", 3),
+    ("", "abc", 3),
+    ("kitten", "sitting", 3),
+    ("flaw", "lawn", 2),
+    ("same", "same", 0),
+    ("abcdef", "azcdxf", 2),
+])
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b) == expected
+    assert edit_distance(b, a) == expected
+
+def test_edit_distance_stops_at_max_distance():
+    # 한도를 넘으면 정확한 값 대신 max_distance + 1
+    assert edit_distance("kitten", "sitting", max_distance=1) == 2
+    assert edit_distance("a" * 50, "b" * 50, max_distance=3) == 4
+    # 길이 차이만으로 한도를 넘는 경우
+    assert edit_distance("abcdefgh", "ab", max_distance=2) == 3
+    # 한도 안이면 정확한 값
+    assert edit_distance("kitten", "sitting", max_distance=3) == 3
+
+def key(text):
+    return normalize_ocr_text(text), content_signature(text)
+
+def commit(stabilizer, text):
+    """confirm_frames번 읽혀서 확정된 텍스트 반환"""
+    result = None
+    for _ in range(stabilizer.confirm_frames):
+        result = stabilizer.update(text)
+    return result
+
+def test_ocr_jitter_is_suppressed():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=2)
+    text = "The quick brown fox jumps over the lazy dog"
+    assert commit(stabilizer, text) == text
+    # l/1, O/0 혼동과 문장부호/공백 흔들림
+    assert stabilizer.update("The quick brown fox jumps 0ver the Iazy dog.") is None
+    assert stabilizer.update("The quick  brown fox jumps over the lazy dog") is None
+    assert stabilizer.stats()["suppressed"] == 2
+
+def test_number_change_is_retranslated():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=2)
+    assert commit(stabilizer, "You got 3 Potions from the chest") is not None
+    assert stabilizer.update("You got 5 Potions from the chest") is None   # 후보 (확인 대기)
+    assert stabilizer.update("You got 5 Potions from the chest") == "You got 5 Potions from the chest"
+
+def test_digit_confusable_with_letter_still_counts_as_number():
+    assert not is_jitter(key("Level 10 reached"), key("Level 1o reached"), 0.9)
+
+def test_negation_change_is_retranslated():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=1)
+    assert stabilizer.update("I will go to the castle tomorrow morning") is not None
+    assert stabilizer.update("I won't go to the castle tomorrow morning") is not None
+    assert stabilizer.update("I will not go to the castle tomorrow morning") is not None
+    assert not is_jitter(key("행복하다"), key("행복하지 않다"), 0.9)
+    assert not is_jitter(key("行きます"), key("行きません"), 0.9)
+
+def test_short_text_requires_exact_match():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=1)
+    assert stabilizer.update("Yes") == "Yes"
+    assert stabilizer.update("Yes.") is None        # 문장부호만 다름
+    assert stabilizer.update("Yet") == "Yet"        # 짧은 텍스트는 한 글자 차이도 새 텍스트
+
+def test_allowed_edits_grow_with_length():
+    long_text = "This is a fairly long line of dialogue that keeps going on"
+    assert is_jitter(key(long_text), key(long_text.replace("dialogue", "dia1ogue").replace("fairly", "fairy")), 0.9)
+    assert not is_jitter(key("Open door"), key("Open doer"), 0.9)
+
+def test_candidate_needs_confirmation_and_uses_most_common_reading():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=3)
+    text = "Welcome back to the village, traveler"
+    assert stabilizer.update(text) is None
+    assert stabilizer.update("Welcome back to the viIlage, traveler") is None
+    assert stabilizer.update(text) == text
+
+def test_confirm_counts_unchanged_frames():
+    stabilizer = TextStabilizer(threshold=0.9, confirm_frames=2)
+    assert stabilizer.confirm() is None
+    assert stabilizer.update("Hello there") is None
+    assert stabilizer.confirm() == "Hello there"
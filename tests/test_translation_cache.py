@@ -0,0 +1,76 @@
+# translation_cache.py 테스트 (키 정규화, 메모리 개수/바이트 한도, 디스크 저장/정리)
+import sqlite3
+
+from translation_cache import TranslationCache, _entry_size, make_key, normalize_text
+
+def disk_keys(path):
+    db = sqlite3.connect(path)
+    try:
+        return {key for (key,) in db.execute("SELECT key FROM translations")}
+    finally:
+        db.close()
+
+def test_normalize_keeps_line_breaks():
+    assert normalize_text("  Hello \t  world  \n  next\tline ") == "Hello world\nnext line"
+    assert make_key("deepl", None, "KO", "a  b") == make_key("deepl", None, "KO", "a b")
+    assert make_key("deepl", None, "KO", "a\nb") != make_key("deepl", None, "KO", "a b")
+    # 언어 조합이 다르면 다른 키
+    assert make_key("deepl", "JA", "KO", "a") != make_key("deepl", "EN", "KO", "a")
+
+def test_memory_evicts_least_recently_used_by_count():
+    cache = TranslationCache(path=None, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"   # a가 최근 사용
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.stats()["memory_entries"] == 2
+
+def test_memory_evicts_by_bytes():
+    limit = _entry_size("k1", "x" * 10) * 2
+    cache = TranslationCache(path=None, max_entries=100, max_bytes=limit)
+    cache.put("k1", "x" * 10)
+    cache.put("k2", "y" * 10)
+    assert cache.stats()["memory_bytes"] == limit
+    cache.put("k3", "z" * 10)
+    assert cache.get("k1") is None
+    assert cache.stats()["memory_bytes"] == limit
+    # 한도보다 큰 항목 하나는 남기지 않음
+    cache.put("big", "w" * limit)
+    assert cache.get("big") is None
+    assert cache.stats()["memory_bytes"] <= limit
+
+def test_empty_values_are_not_cached(tmp_path):
+    cache = TranslationCache(path=str(tmp_path / "cache.db"))
+    cache.put("a", "")
+    assert cache.get("a") is None
+    assert disk_keys(cache.path) == set()
+    cache.close()
+
+def test_disk_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(path=path, max_entries=1)
+    cache.put("a", "A")
+    cache.put("b", "B")    # a는 메모리에서 밀려나도 디스크에 남음
+    assert cache.get("a") == "A"
+    cache.close()
+
+    reopened = TranslationCache(path=path)
+    assert reopened.stats()["memory_entries"] == 0
+    assert reopened.get("b") == "B"
+    assert reopened.stats() == {"hits": 1, "misses": 0, "memory_entries": 1,
+                                "memory_bytes": _entry_size("b", "B")}
+    reopened.close()
+
+def test_disk_trims_least_recently_used(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(path=path, max_entries=10, disk_max_entries=50)
+    cache.put("first", "F")
+    cache._db.execute("UPDATE translations SET last_used = 0 WHERE key = 'first'")
+    for i in range(99):
+        cache.put(f"k{i}", str(i))   # 100번째 저장에서 정리
+    keys = disk_keys(path)
+    assert len(keys) == 45           # 한도의 90%까지 줄임
+    assert "first" not in keys
+    cache.close()
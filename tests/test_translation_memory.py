@@ -0,0 +1,101 @@
+# translation_memory.py 테스트 (숫자 교체, 한도 제거, DB 저장)
+import sqlite3
+
+from translation_memory import TranslationMemory, mask_placeholders, substitute_tokens, unmask_placeholders
+
+def rows(path):
+    db = sqlite3.connect(path)
+    try:
+        return sorted(source for (source,) in db.execute("SELECT source FROM memory"))
+    finally:
+        db.close()
+
+def open_memory(path, **kwargs):
+    memory = TranslationMemory(path=str(path), **kwargs)
+    assert memory.loaded.wait(5)
+    return memory
+
+def test_mask_and_unmask_round_trip():
+    text = "Got {name} x3 for 1,000 gold <b>now</b> (%s)"
+    masked, tokens = mask_placeholders(text)
+    assert tokens == ("{name}", "3", "1,000", "<b>", "</b>", "%s")
+    assert unmask_placeholders(masked, tokens) == text
+
+def test_substitute_tokens():
+    assert substitute_tokens("포션 3개를 얻었다", ("3",), ("5",)) == "포션 5개를 얻었다"
+    # 값이 서로 바뀌어도 한 번에 교체
+    assert substitute_tokens("3 → 5", ("3", "5"), ("5", "3")) == "5 → 3"
+    # 13의 3처럼 더 긴 숫자의 일부는 바꾸지 않음
+    assert substitute_tokens("13층 3번 방", ("3",), ("4",)) == "13층 4번 방"
+    # 번역에서 위치를 확실히 찾을 수 없으면 None
+    assert substitute_tokens("포션을 얻었다", ("3",), ("5",)) is None
+
+def test_lookup_substitutes_numbers():
+    memory = TranslationMemory(path=None)
+    memory.add("g", "You got 3 Potions", "포션 3개를 얻었다")
+    assert memory.lookup("g", "You got 5 Potions") == "포션 5개를 얻었다"
+    assert memory.lookup("g", "You got  3 Potions") == "포션 3개를 얻었다"
+    assert memory.lookup("g", "You lost 3 Potions") is None
+    assert memory.lookup("other", "You got 3 Potions") is None
+    stats = memory.stats()
+    assert (stats["exact_hits"], stats["misses"]) == (2, 2)
+
+def test_fuzzy_reuse_is_opt_in():
+    memory = TranslationMemory(path=None)
+    memory.add("g", "Welcome back to the village, traveler", "마을에 돌아온 걸 환영하네, 여행자")
+    assert memory.lookup("g", "Welcome back to the village, traveller") is None
+    memory.threshold = 0.8
+    assert memory.lookup("g", "Welcome back to the village, traveller") == "마을에 돌아온 걸 환영하네, 여행자"
+
+def test_eviction_keeps_recently_used_entries():
+    memory = TranslationMemory(path=None, max_entries=10)
+    for i in range(10):
+        memory.add("g", f"line number {chr(97 + i)}", f"번역 {i}")
+    memory.lookup("g", "line number a")       # 가장 먼저 넣었지만 최근에 씀
+    memory.add("g", "line number k", "번역 10")
+    assert memory.stats()["entries"] == 10 - 1
+    assert memory.lookup("g", "line number a") == "번역 0"
+    assert memory.lookup("g", "line number b") is None
+    assert memory.lookup("g", "line number k") == "번역 10"
+
+def test_eviction_removes_rows_from_db(tmp_path):
+    path = tmp_path / "tm.db"
+    memory = open_memory(path, max_entries=10)
+    for i in range(25):
+        memory.add("g", f"line number {chr(97 + i)}", f"번역 {i}")
+    memory.close()
+    assert len(rows(path)) == open_memory(path, max_entries=10).stats()["entries"] <= 10
+
+def test_replaced_tokens_do_not_leave_stale_rows(tmp_path):
+    path = tmp_path / "tm.db"
+    memory = open_memory(path)
+    for count in range(50):
+        memory.add("g", f"You got {count} Potions", f"포션 {count}개를 얻었다")
+    memory.close()
+    assert rows(path) == ["You got 49 Potions"]
+    memory = open_memory(path)
+    assert memory.stats()["entries"] == 1
+    assert memory.lookup("g", "You got 2 Potions") == "포션 2개를 얻었다"
+    memory.close()
+
+def test_load_prefers_newest_duplicate_and_drops_older_rows(tmp_path):
+    path = tmp_path / "tm.db"
+    open_memory(path).close()
+    db = sqlite3.connect(path)
+    db.executemany("INSERT INTO memory (grp, source, translation) VALUES (?, ?, ?)",
+                   [("g", "You got 3 Potions", "오래된 번역 3"), ("g", "You got 5 Potions", "새 번역 5")])
+    db.commit()
+    db.close()
+    memory = open_memory(path)
+    assert memory.lookup("g", "You got 5 Potions") == "새 번역 5"
+    memory.close()
+    assert rows(path) == ["You got 5 Potions"]
+
+def test_writes_are_committed_in_batches(tmp_path):
+    path = tmp_path / "tm.db"
+    memory = open_memory(path, commit_delay=60)
+    memory.add("g", "Hello there", "안녕")
+    assert rows(path) == []          # 아직 커밋 전 (다른 연결에서는 보이지 않음)
+    memory.flush()
+    assert rows(path) == ["Hello there"]
+    memory.close()
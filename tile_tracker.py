@@ -0,0 +1,177 @@
+# tile_tracker.py - 넓은 OCR 영역에서 바뀐 부분만 다시 인식해서 이전 결과에 끼워넣기
+import numpy as np
+from change_detect import dirty_tiles, dirty_rects
+from preprocess import to_gray, text_row_runs
+
+def _bounds(result_box):
+    """readtext 상자 꼭짓점 → (x1, y1, x2, y2)"""
+    xs = [p[0] for p in result_box]
+    ys = [p[1] for p in result_box]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def _merge_overlapping(rects):
+    """겹치는 사각형 병합"""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if _overlaps(rects[i], rects[j]):
+                    a, b = rects[i], rects.pop(j)
+                    rects[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+def sort_reading_order(results):
+    """결과를 줄 단위(세로 겹침)로 묶고 줄 안에서는 왼쪽부터 정렬"""
+    items = sorted(results, key=lambda r: _bounds(r[0])[1])
+    lines = []
+    for item in items:
+        x1, y1, x2, y2 = _bounds(item[0])
+        center = (y1 + y2) / 2
+        if lines and lines[-1][0] <= center <= lines[-1][1]:
+            lines[-1][2].append(item)
+            lines[-1][1] = max(lines[-1][1], y2)
+        else:
+            lines.append([y1, y2, [item]])
+    ordered = []
+    for _, _, line in lines:
+        ordered.extend(sorted(line, key=lambda r: _bounds(r[0])[0]))
+    return ordered
+
+class TileTracker:
+    """타일 단위 변화 지도로 바뀐 영역만 OCR하고 나머지는 이전 결과 유지
+
+    바뀐 타일을 사각형으로 묶은 뒤, 세로로는 걸친 글자 줄 전체로,
+    가로로는 겹치는 이전 글자 상자와 이어진 글자(간격이 줄 높이 미만)까지 넓혀서 인식한다.
+    """
+
+    def __init__(self, tile=32, noise=8, max_dirty_fraction=0.5):
+        self.tile = tile
+        self.noise = noise
+        self.max_dirty_fraction = max_dirty_fraction
+        self.reset()
+
+    def reset(self):
+        self.reader_id = None
+        self.prev_gray = None
+        self._checked = None   # has_changed에서 계산한 (이미지 id, 흑백, 변화 타일) 재사용
+        self.prev_results = None
+        self.full_reads = 0
+        self.partial_reads = 0
+        self.unchanged = 0
+        self.pixels_read = 0
+        self.pixels_total = 0
+
+    def _expand(self, rect, gray, line_runs):
+        """사각형을 글자 줄 경계까지 확장"""
+        h, w = gray.shape
+        x1, y1, x2, y2 = rect
+        # 세로: 걸친 글자 줄 전체 포함
+        for start, end in line_runs:
+            if start < y2 and y1 < end:
+                y1, y2 = min(y1, start), max(y2, end)
+        line_height = max(y2 - y1, 8)
+        # 가로: 겹치는 이전 상자 포함
+        for result_box, _, _ in self.prev_results:
+            bx1, by1, bx2, by2 = _bounds(result_box)
+            if _overlaps((x1, y1, x2, y2), (bx1, by1, bx2, by2)):
+                x1, x2 = min(x1, int(bx1)), max(x2, int(bx2))
+        # 가로: 줄 높이보다 짧은 간격으로 이어진 글자까지 포함 (단어 중간에서 잘리지 않게)
+        background = int(np.median(gray[::4, ::4]))
+        ink_cols = (np.abs(gray[y1:y2].astype(np.int16) - background) > 40).any(axis=0)
+        gap = 0
+        while x1 > 0 and gap < line_height:
+            x1 -= 1
+            gap = 0 if ink_cols[x1] else gap + 1
+        gap = 0
+        while x2 < w and gap < line_height:
+            gap = 0 if ink_cols[x2] else gap + 1
+            x2 += 1
+        margin = max(line_height // 4, 2)
+        return (max(x1 - margin, 0), max(y1 - margin, 0), min(x2 + margin, w), min(y2 + margin, h))
+
+    def _gray_and_grid(self, image):
+        checked, self._checked = self._checked, None
+        if checked is not None and checked[0] is image:
+            return checked[1], checked[2]
+        gray = to_gray(image)
+        if self.prev_gray is None or self.prev_gray.shape != gray.shape:
+            return gray, None
+        return gray, dirty_tiles(self.prev_gray, gray, self.tile, self.noise)
+
+    def has_changed(self, image):
+        """마지막으로 인식한 이미지에서 바뀐 타일이 있으면 True (처음이거나 크기가 바뀌어도 True)
+
+        영역 전체의 변화 비율 대신 이 타일 지도로 OCR 여부를 정하면 단어 하나, 커서처럼
+        작은 변화도 부분 인식까지 이어진다. 계산한 지도는 바로 다음 read()에서 재사용한다.
+        """
+        gray, grid = self._gray_and_grid(image)
+        changed = grid is None or bool(grid.any())
+        if changed:
+            self._checked = (image, gray, grid)
+        else:
+            self.unchanged += 1
+        return changed
+
+    def read(self, reader, image, full_read):
+        """바뀐 부분만 인식한 (상자, 텍스트, 신뢰도) 목록 반환
+
+        full_read()는 영역 전체를 인식하는 함수 (처음이거나 변화가 클 때 사용).
+        """
+        gray, grid = self._gray_and_grid(image)
+        self.pixels_total += gray.size
+        if id(reader) != self.reader_id or grid is None:
+            return self._full(reader, gray, full_read)
+
+        if not grid.any():
+            # 기준 이미지는 유지 (노이즈 이하의 느린 변화가 쌓이면 언젠가 감지되도록)
+            self.unchanged += 1
+            return self.prev_results
+
+        line_runs = text_row_runs(gray) + text_row_runs(self.prev_gray)
+        rects = [self._expand(r, gray, line_runs) for r in dirty_rects(grid, self.tile, gray.shape)]
+        rects = _merge_overlapping(rects)
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+        if area > gray.size * self.max_dirty_fraction:
+            return self._full(reader, gray, full_read)
+
+        # 바뀐 사각형과 겹치는 이전 결과는 버리고 새로 인식한 결과로 교체
+        kept = [r for r in self.prev_results
+                if not any(_overlaps(_bounds(r[0]), rect) for rect in rects)]
+        for x1, y1, x2, y2 in rects:
+            crop = np.ascontiguousarray(image[y1:y2, x1:x2])
+            for result_box, text, conf in reader.readtext(crop, detail=1):
+                shifted = [[int(px) + x1, int(py) + y1] for px, py in result_box]
+                kept.append((shifted, text, conf))
+        self.partial_reads += 1
+        self.pixels_read += area
+        self.prev_gray = gray
+        self.prev_results = sort_reading_order(kept)
+        return self.prev_results
+
+    def _full(self, reader, gray, full_read):
+        results = full_read()
+        self.reader_id = id(reader)
+        self.full_reads += 1
+        self.pixels_read += gray.size
+        self.prev_gray = gray
+        self.prev_results = list(results)
+        return self.prev_results
+
+    def stats(self):
+        """전체/부분 인식 통계 (pixel_ratio = 실제 인식한 픽셀 비율)"""
+        ratio = self.pixels_read / self.pixels_total if self.pixels_total else 1.0
+        return {
+            "full_reads": self.full_reads,
+            "partial_reads": self.partial_reads,
+            "unchanged": self.unchanged,
+            "pixel_ratio": ratio,
+        }
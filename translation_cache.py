@@ -0,0 +1,178 @@
+# translation_cache.py - 번역 결과 캐시 (메모리 LRU + SQLite 디스크 저장)
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from app_log import get_logger
+
+log = get_logger("translation_cache")
+
+# 줄바꿈을 뺀 공백 연속 (줄바꿈은 줄 단위 번역 결과가 달라지므로 유지)
+_SPACES_RE = re.compile(r"[^\S\n]+")
+_LINE_EDGE_RE = re.compile(r" ?\n ?")
+
+def normalize_text(text):
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 줄 안의 공백/탭 연속은 공백 하나로, 줄바꿈은 유지)"""
+    text = unicodedata.normalize("NFC", text)
+    text = _SPACES_RE.sub(" ", text)
+    return _LINE_EDGE_RE.sub("\n", text).strip()
+
+def make_key(engine, source, target, text):
+    """엔진/언어/정규화 텍스트로 캐시 키 생성"""
+    return f"{engine}\x1f{source or 'auto'}\x1f{target}\x1f{normalize_text(text)}"
+
+def _entry_size(key, value):
+    return len(key.encode("utf-8")) + len(value.encode("utf-8"))
+
+class TranslationCache:
+    """메모리 LRU 앞단 + SQLite 뒷단 번역 캐시
+
+    메모리와 디스크 모두 항목 수와 바이트 수 기준으로 오래된 항목부터 제거한다.
+    """
+
+    def __init__(self, path="translation_cache.db", max_entries=2000, max_bytes=4 * 1024 * 1024,
+                 disk_max_entries=100000, disk_max_bytes=50 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._puts_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._open_db()
+
+    def _open_db(self):
+        try:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+            self._db.commit()
+        except Exception as e:
+            log.warning("[⚠️ 번역 캐시 DB 열기 실패, 메모리 캐시만 사용]: %s", e)
+            self._db = None
+
+    def _remember(self, key, value):
+        """메모리 LRU에 저장 (잠금 상태에서 호출)"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= _entry_size(key, old)
+        self._memory[key] = value
+        self._memory_bytes += _entry_size(key, value)
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            old_key, old_value = self._memory.popitem(last=False)
+            self._memory_bytes -= _entry_size(old_key, old_value)
+
+    def get(self, key):
+        """캐시 조회 (없으면 None)"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        value = row[0]
+                        self._db.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+                        self._db.commit()
+                        self._remember(key, value)
+                        self.hits += 1
+                        return value
+                except Exception as e:
+                    log.warning("[⚠️ 번역 캐시 조회 실패]: %s", e)
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """캐시에 저장"""
+        if not value:
+            return
+        with self._lock:
+            self._remember(key, value)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, _entry_size(key, value), time.time()),
+                )
+                self._db.commit()
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= 100:
+                    self._trim_disk()
+            except Exception as e:
+                log.warning("[⚠️ 번역 캐시 저장 실패]: %s", e)
+
+    def _trim_disk(self):
+        """디스크 캐시 크기 제한 (잠금 상태에서 호출)"""
+        self._puts_since_trim = 0
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations").fetchone()
+        if count <= self.disk_max_entries and total <= self.disk_max_bytes:
+            return
+        # 오래 사용하지 않은 항목부터 10%씩 여유를 두고 제거
+        excess = max(count - int(self.disk_max_entries * 0.9), 0)
+        if total > self.disk_max_bytes:
+            excess = max(excess, count // 10, 1)
+        self._db.execute(
+            "DELETE FROM translations WHERE key IN "
+            "(SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self._db.commit()
+        log.info("[🧹 번역 캐시 정리] %d개 항목 제거", excess)
+
+    def stats(self):
+        """캐시 통계 반환"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+# 전역 캐시 인스턴스
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """설정에 따라 전역 번역 캐시 반환 (비활성화 시 None)"""
+    global _cache
+    from config import get_setting
+    if not get_setting("TRANSLATION_CACHE", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache(
+                path=get_setting("CACHE_PATH", "translation_cache.db"),
+                max_entries=get_setting("CACHE_MEMORY_ENTRIES", 2000),
+                max_bytes=get_setting("CACHE_MEMORY_BYTES", 4 * 1024 * 1024),
+                disk_max_entries=get_setting("CACHE_DISK_ENTRIES", 100000),
+                disk_max_bytes=get_setting("CACHE_DISK_BYTES", 50 * 1024 * 1024),
+            )
+        return _cache
@@ -0,0 +1,423 @@
+# translation_memory.py - 번역 메모리 (문자 n-gram 색인으로 비슷한 문장의 이전 번역 재사용)
+#
+# "You got 3 Potions" / "You got 5 Potions"처럼 숫자나 자리표시자만 다른 문장은
+# 숫자 등을 가린 문장이 같으므로 이전 번역에서 숫자만 바꿔 끼워 바로 돌려준다.
+# TM_THRESHOLD를 1.0 미만으로 낮추면 가린 문장이 다르더라도 n-gram 유사도(Dice)가 임계값 이상일 때
+# 이전 번역을 재사용한다. 후보는 드문 n-gram부터 정해진 개수까지만 세서 추리므로 (근사)
+# 항목이 많거나 어휘가 적어도 조회 시간이 일정하게 묶인다.
+import os
+import re
+import sqlite3
+import heapq
+import threading
+import time
+from array import array
+from collections import Counter
+from translation_cache import normalize_text
+from app_log import get_logger
+
+log = get_logger("translation_memory")
+
+# 번역에서 그대로 옮겨지는 숫자/자리표시자 ({name}, %s, %1$d, <b> 태그, 1,000 / 3.5)
+PLACEHOLDER_RE = re.compile(r"\{[^{}]*\}|%\d*\$?[sdif]|<[^<>]+>|\d+(?:[.,]\d+)*")
+MASK = "\ue000"   # 가린 자리 (사용자 영역 문자)
+
+def mask_placeholders(text):
+    """(숫자/자리표시자를 MASK로 바꾼 문장, 바꾼 토큰 목록)"""
+    text = normalize_text(text)
+    return PLACEHOLDER_RE.sub(MASK, text), tuple(PLACEHOLDER_RE.findall(text))
+
+def char_ngrams(text, n=3):
+    """비교용 문자 n-gram 집합 (소문자, 앞뒤 공백을 붙여 짧은 단어도 포함)"""
+    text = f" {text.lower()} "
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def _token_pattern(token):
+    # 숫자는 더 긴 숫자의 일부(13의 3 등)와 구분
+    return r"(?<![\d.,])" + re.escape(token) + r"(?![\d]|[.,]\d)"
+
+def substitute_tokens(translation, old_tokens, new_tokens):
+    """이전 번역의 숫자/자리표시자를 새 값으로 교체 (번역에서 위치를 확실히 찾을 수 없으면 None)"""
+    if len(old_tokens) != len(new_tokens):
+        return None
+    mapping = {}
+    for old, new in zip(old_tokens, new_tokens):
+        if old == new:
+            continue
+        # 같은 토큰이 다른 값으로 바뀌거나 번역에 정확히 한 번 나오지 않으면 어디를 바꿀지 알 수 없음
+        if mapping.get(old, new) != new or len(re.findall(_token_pattern(old), translation)) != 1:
+            return None
+        mapping[old] = new
+    if not mapping:
+        return translation
+    # 한 번에 교체 (3↔5처럼 값이 서로 바뀌어도 안전)
+    pattern = re.compile("|".join(_token_pattern(old) for old in sorted(mapping, key=len, reverse=True)))
+    return pattern.sub(lambda m: mapping[m.group(0)], translation)
+
+def unmask_placeholders(masked, tokens):
+    """mask_placeholders의 반대 (가린 자리에 토큰을 차례대로 되돌림)"""
+    parts = masked.split(MASK)
+    if len(parts) != len(tokens) + 1:
+        return None
+    return "".join(part + token for part, token in zip(parts, tokens)) + parts[-1]
+
+class _GroupIndex:
+    """(엔진, 원본 언어, 목표 언어) 하나의 메모리 색인
+
+    항목은 번호로 관리하고 n-gram → 항목 번호 목록은 array('I')로 저장해서 메모리를 아낀다.
+    밀려난 항목은 번역을 None으로 표시만 해두고, 죽은 항목이 살아 있는 항목보다 많아지면 색인을 다시 만든다.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.masked = []        # 번호 → 가린 문장
+        self.tokens = []        # 번호 → 원문 토큰
+        self.translations = []  # 번호 → 번역 (밀려난 항목은 None)
+        self.sizes = array("I") # 번호 → n-gram 개수
+        self.used = array("Q")  # 번호 → 마지막으로 추가/재사용된 순번 (밀어낼 항목 선택)
+        self.exact = {}         # 가린 문장 → 번호
+        self.postings = {}      # n-gram → 항목 번호 array
+        self.dead = 0
+        self._tick = 0
+
+    def __len__(self):
+        return len(self.exact)
+
+    def touch(self, index):
+        self._tick += 1
+        self.used[index] = self._tick
+
+    def add(self, masked, tokens, translation, replace=True):
+        """항목 추가, 같은 가린 문장의 다른 토큰 항목을 바꿨으면 이전 원문 반환 (DB에서 지울 행)"""
+        index = self.exact.get(masked)
+        if index is not None:
+            if not replace:
+                return None
+            previous = self.tokens[index]
+            self.tokens[index] = tokens
+            self.translations[index] = translation
+            self.touch(index)
+            return unmask_placeholders(masked, previous) if previous != tokens else None
+        index = len(self.masked)
+        grams = char_ngrams(masked, self.n)
+        self.masked.append(masked)
+        self.tokens.append(tokens)
+        self.translations.append(translation)
+        self.sizes.append(len(grams))
+        self.used.append(0)
+        self.touch(index)
+        self.exact[masked] = index
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("I")
+            posting.append(index)
+        return None
+
+    def evict(self, count):
+        """가장 오래 쓰지 않은 항목 count개 제거, 제거한 (가린 문장, 토큰) 목록 반환"""
+        live = self.exact.values()
+        removed = []
+        for index in heapq.nsmallest(count, live, key=self.used.__getitem__):
+            removed.append((self.masked[index], self.tokens[index]))
+            del self.exact[self.masked[index]]
+            self.translations[index] = None
+            self.dead += 1
+        if self.dead > len(self.exact):
+            self._rebuild()
+        return removed
+
+    def _rebuild(self):
+        entries = sorted(self.exact.values())
+        masked, tokens, translations, used = self.masked, self.tokens, self.translations, self.used
+        self.__init__(self.n)
+        for index in entries:
+            self.add(masked[index], tokens[index], translations[index])
+            self.used[-1] = used[index]
+        self._tick = max(used, default=0)
+
+    def search(self, masked, threshold, probe_budget, posting_cap, max_candidates):
+        """가장 비슷한 (번호, Dice 유사도), 임계값 이상이 없으면 None
+
+        드문 n-gram부터 항목 번호를 세되, n-gram 하나당 최근 posting_cap개, 전체 probe_budget개까지만 본다
+        (어휘가 적으면 거의 모든 항목이 공유하는 n-gram이 생기고 이걸 다 세면 조회가 수백 ms 걸림).
+        그래서 결과는 근사이며, 공통 개수가 많은 후보 max_candidates개만 실제 유사도를 계산한다.
+        """
+        index = self.exact.get(masked)
+        if index is not None:
+            return index, 1.0
+        if threshold >= 1.0:
+            return None
+        grams = char_ngrams(masked, self.n)
+        size = len(grams)
+        # Dice >= t 이려면 상대 크기가 이 범위 안이어야 함
+        min_size = size * threshold / (2.0 - threshold)
+        max_size = size * (2.0 - threshold) / threshold
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        counts = Counter()
+        scanned = 0
+        complete = True
+        for posting in postings:
+            if not posting:
+                continue
+            take = min(len(posting), posting_cap, probe_budget - scanned)
+            if take <= 0:
+                complete = False
+                break
+            if take < len(posting):
+                complete = False
+                posting = posting[-take:]
+            counts.update(posting)
+            scanned += take
+        translations, sizes = self.translations, self.sizes
+        best, best_score = None, threshold
+        for index, count in counts.most_common(max_candidates):
+            other = sizes[index]
+            if translations[index] is None or other < min_size or other > max_size:
+                continue
+            overlap = count if complete else len(grams & char_ngrams(self.masked[index], self.n))
+            score = 2.0 * overlap / (size + other)
+            if score >= best_score:
+                best, best_score = index, score
+        return None if best is None else (best, best_score)
+
+class TranslationMemory:
+    """번역한 원문을 n-gram으로 색인해서 비슷한 문장의 번역을 재사용하는 메모리 (SQLite에 저장)
+
+    - threshold 1.0(기본)이면 숫자/자리표시자를 가린 문장이 같은 경우만 재사용한다 (유사 문장 재사용은 선택).
+    - 가린 문장 하나에 항목 하나만 둔다 ("3 Potions" 다음에 "5 Potions"가 오면 DB의 "3 Potions" 행은 지움).
+    - 그룹마다 max_entries개를 넘으면 가장 오래 쓰지 않은 항목을 메모리와 DB에서 함께 지운다.
+    - 저장된 항목은 백그라운드 스레드에서 불러온다 (다 불러오기 전 조회는 불러온 만큼만 찾음).
+    - DB 쓰기는 commit_delay초 동안 모아서 한 번에 커밋한다 (번역할 때마다 디스크 동기화하지 않음).
+    """
+
+    def __init__(self, path="translation_memory.db", threshold=1.0, ngram=3, substitute=True,
+                 probe_budget=4000, posting_cap=1000, max_candidates=64, max_entries=200000, commit_delay=1.0):
+        self.path = path
+        self.threshold = threshold
+        self.ngram = ngram
+        self.substitute = substitute
+        self.probe_budget = probe_budget     # 한 번 조회에서 세는 항목 번호 수 한도
+        self.posting_cap = posting_cap       # n-gram 하나에서 세는 항목 번호 수 한도 (최근 항목 우선)
+        self.max_candidates = max_candidates # 실제 유사도를 계산하는 후보 수
+        self.max_entries = max_entries       # 그룹별 최대 항목 수 (0이면 제한 없음)
+        self.commit_delay = commit_delay
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._commit_timer = None
+        self._live = set()                   # 불러오는 동안 새로 추가된 (그룹, 가린 문장)
+        self.loaded = threading.Event()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.lookup_seconds = 0.0
+        if path:
+            self._open_db()
+        else:
+            self.loaded.set()
+
+    def _open_db(self):
+        try:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                "grp TEXT NOT NULL, source TEXT NOT NULL, translation TEXT NOT NULL, "
+                "PRIMARY KEY (grp, source))"
+            )
+            self._db.commit()
+        except Exception as e:
+            log.warning("[⚠️ 번역 메모리 DB 열기 실패, 메모리에만 저장]: %s", e)
+            self._db = None
+            self.loaded.set()
+            return
+        threading.Thread(target=self._load, name="translation-memory-load", daemon=True).start()
+
+    def _load(self, batch=5000):
+        """저장된 항목을 오래된 것부터 불러옴 (별도 연결, 배치마다 잠금)"""
+        started = time.perf_counter()
+        count = 0
+        try:
+            db = sqlite3.connect(self.path)
+            try:
+                cursor = db.execute("SELECT grp, source, translation FROM memory ORDER BY rowid")
+                while True:
+                    rows = cursor.fetchmany(batch)
+                    if not rows:
+                        break
+                    with self._lock:
+                        for group, source, translation in rows:
+                            masked, tokens = mask_placeholders(source)
+                            # 불러오는 동안 새로 추가된 번역을 옛 값으로 덮어쓰지 않고, 옛 행은 지움
+                            if (group, masked) in self._live:
+                                index = self._groups[group]
+                                entry = index.exact.get(masked)
+                                if entry is None or unmask_placeholders(masked, index.tokens[entry]) != source:
+                                    self._delete(group, [source])
+                                continue
+                            # 오래된 행부터 읽으므로 같은 가린 문장의 더 새 행이 이전 행을 대체
+                            self._store(group, masked, tokens, translation)
+                    count += len(rows)
+            finally:
+                db.close()
+            if count:
+                log.info("[📚 번역 메모리 불러옴] %d개 (%.0fms)", count, (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            log.warning("[⚠️ 번역 메모리 불러오기 실패]: %s", e)
+        finally:
+            with self._lock:
+                self.loaded.set()
+                self._live.clear()
+
+    def _group(self, group):
+        index = self._groups.get(group)
+        if index is None:
+            index = self._groups[group] = _GroupIndex(self.ngram)
+        return index
+
+    def _schedule_commit(self):
+        """commit_delay초 뒤 한 번에 커밋 (잠금 상태에서 호출)"""
+        if self._commit_timer is None:
+            self._commit_timer = threading.Timer(self.commit_delay, self.flush)
+            self._commit_timer.daemon = True
+            self._commit_timer.start()
+
+    def flush(self):
+        """모아둔 DB 쓰기 커밋"""
+        with self._lock:
+            if self._commit_timer is not None:
+                self._commit_timer.cancel()
+                self._commit_timer = None
+            if self._db is None:
+                return
+            try:
+                self._db.commit()
+            except Exception as e:
+                log.warning("[⚠️ 번역 메모리 저장 실패]: %s", e)
+
+    def _delete(self, group, sources):
+        """DB에서 원문 행 삭제 (잠금 상태에서 호출)"""
+        if self._db is None or not sources:
+            return
+        try:
+            self._db.executemany("DELETE FROM memory WHERE grp = ? AND source = ?",
+                                 [(group, source) for source in sources])
+            self._schedule_commit()
+        except Exception as e:
+            log.warning("[⚠️ 번역 메모리 정리 실패]: %s", e)
+
+    def _store(self, group, masked, tokens, translation):
+        """색인에 추가하고 대체된 이전 행과 한도를 넘은 항목을 DB에서 지움 (잠금 상태에서 호출)"""
+        previous = self._group(group).add(masked, tokens, translation)
+        if previous is not None:
+            self._delete(group, [previous])
+        self._evict(group)
+
+    def _evict(self, group):
+        """그룹 항목 수가 max_entries를 넘으면 오래 쓰지 않은 항목을 10%씩 제거 (잠금 상태에서 호출)"""
+        index = self._groups[group]
+        if not self.max_entries or len(index) <= self.max_entries:
+            return
+        removed = index.evict(len(index) - self.max_entries + max(self.max_entries // 10, 1))
+        self.evicted += len(removed)
+        self._delete(group, [unmask_placeholders(masked, tokens) for masked, tokens in removed])
+
+    def lookup(self, group, text):
+        """비슷한 문장의 이전 번역 (숫자/자리표시자 교체 포함), 없으면 None"""
+        masked, tokens = mask_placeholders(text)
+        with self._lock:
+            started = time.perf_counter()
+            index = self._groups.get(group)
+            found = None
+            if index is not None:
+                found = index.search(masked, self.threshold, self.probe_budget, self.posting_cap,
+                                     self.max_candidates)
+            result = None
+            if found is not None:
+                entry, score = found
+                old_tokens, translation = index.tokens[entry], index.translations[entry]
+                if old_tokens == tokens:
+                    result = translation
+                elif self.substitute:
+                    result = substitute_tokens(translation, old_tokens, tokens)
+                if result is not None:
+                    index.touch(entry)
+                    if score >= 1.0:
+                        self.exact_hits += 1
+                    else:
+                        self.fuzzy_hits += 1
+            if result is None:
+                self.misses += 1
+            self.lookup_seconds += time.perf_counter() - started
+            return result
+
+    def add(self, group, text, translation):
+        """번역 결과를 메모리에 추가"""
+        if not text or not translation:
+            return
+        source = normalize_text(text)
+        masked, tokens = mask_placeholders(source)
+        with self._lock:
+            if not self.loaded.is_set():
+                self._live.add((group, masked))
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO memory (grp, source, translation) VALUES (?, ?, ?)",
+                                     (group, source, translation))
+                    self._schedule_commit()
+                except Exception as e:
+                    log.warning("[⚠️ 번역 메모리 저장 실패]: %s", e)
+            self._store(group, masked, tokens, translation)
+
+    def stats(self):
+        """메모리 통계 반환"""
+        with self._lock:
+            lookups = self.exact_hits + self.fuzzy_hits + self.misses
+            return {
+                "entries": sum(len(index) for index in self._groups.values()),
+                "loaded": self.loaded.is_set(),
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "evicted": self.evicted,
+                "avg_lookup_ms": self.lookup_seconds * 1000 / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+def make_group(engine, source, target):
+    """엔진/언어별로 메모리를 나누는 키"""
+    return f"{engine}\x1f{source or 'auto'}\x1f{target}"
+
+# 전역 메모리 인스턴스
+_memory = None
+_memory_lock = threading.Lock()
+
+def get_memory():
+    """설정에 따라 전역 번역 메모리 반환 (비활성화 시 None)"""
+    global _memory
+    from config import get_setting
+    if not get_setting("TRANSLATION_MEMORY", True):
+        return None
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(
+                path=get_setting("TM_PATH", "translation_memory.db"),
+                threshold=get_setting("TM_THRESHOLD", 1.0),
+                ngram=get_setting("TM_NGRAM", 3),
+                substitute=get_setting("TM_SUBSTITUTE", True),
+                max_entries=get_setting("TM_MAX_ENTRIES", 200000),
+            )
+        return _memory
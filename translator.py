@@ -1,142 +1,397 @@
 # translator.py - 번역 기능 (DeepL, LibreTranslate만 지원)
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout
 import requests
-from config import get_setting, update_setting
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from config import get_setting, update_setting, subscribe
+from translation_cache import get_cache, make_key, normalize_text
+from translation_memory import get_memory, make_group
+from metrics import metrics
+from batcher import MicroBatcher
+from app_log import get_logger
 
-# DeepL 번역 함수
-def deepl_translate(text):
-    """DeepL API를 사용하여 텍스트 번역"""
-    if not text:
-        return ""
-    
-    # API 키 로드
+log = get_logger("translator")
+
+# DeepL API 언어 코드 매핑
+DEEPL_LANGS = {
+    "ko": "KO", "en": "EN", "ja": "JA", "zh-CN": "ZH", "zh": "ZH",
+    "ru": "RU", "fr": "FR", "es": "ES", "de": "DE", "pt": "PT",
+    "it": "IT", "nl": "NL", "pl": "PL"
+}
+
+# LibreTranslate 언어 코드 매핑
+LIBRE_LANGS = {
+    "en": "en", "ko": "ko", "ja": "ja", "zh": "zh", "zh-CN": "zh",
+    "es": "es", "de": "de", "ru": "ru", "fr": "fr", "it": "it",
+    "pt": "pt", "auto": "auto"
+}
+
+DEEPL_URL = "https://api-free.deepl.com/v2/translate"
+
+class TranslationError(Exception):
+    """번역 실패 (메시지는 오버레이에 그대로 표시됨)"""
+
+# 엔진별 HTTP 세션 (keep-alive 연결 재사용)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(engine):
+    """엔진별 장기 유지 HTTP 세션 반환"""
+    with _sessions_lock:
+        session = _sessions.get(engine)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[engine] = session
+        return session
+
+def close_sessions():
+    """모든 HTTP 세션 종료"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def get_timeout():
+    """(연결, 읽기) 타임아웃"""
+    return (get_setting("HTTP_CONNECT_TIMEOUT", 3.0), get_setting("HTTP_READ_TIMEOUT", 10.0))
+
+# 인증 정보 파일 캐시: 경로 -> ((수정시각, 크기), 내용)
+_credential_cache = {}
+_credential_lock = threading.Lock()
+
+def _read_credential_file(path):
+    """인증 정보 파일 읽기 (파일이 바뀐 경우에만 다시 읽음, 없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        with _credential_lock:
+            _credential_cache.pop(path, None)
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _credential_lock:
+        cached = _credential_cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    with _credential_lock:
+        _credential_cache[path] = (signature, content)
+    return content
+
+def load_deepl_key():
+    """DeepL API 키 로드 (실패 시 TranslationError)"""
     try:
-        with open("deepl.txt", "r", encoding="utf-8") as f:
-            api_key = f.read().strip()
+        api_key = _read_credential_file("deepl.txt")
     except Exception as e:
-        print(f"[⚠️ DeepL API 키 로드 실패]: {e}")
-        return "(DeepL API 키가 설정되지 않았습니다)"
-    
-    # 언어 설정
-    auto_detect = get_setting("AUTO_DETECT_LANG", True)
-    source_lang = None if auto_detect else get_setting("SOURCE_LANG", "en")
+        log.warning("[⚠️ DeepL API 키 로드 실패]: %s", e)
+        api_key = None
+    if not api_key:
+        raise TranslationError("(DeepL API 키가 설정되지 않았습니다)")
+    return api_key
+
+def load_libre_config():
+    """LibreTranslate (API URL, API 키) 로드"""
+    try:
+        content = _read_credential_file("libretranslate.txt")
+    except Exception:
+        content = None
+    if content:
+        parts = content.split("|")
+        return parts[0], (parts[1] if len(parts) > 1 else "")
+    return (get_setting("LIBRE_API_URL", "http://localhost:5001/translate"),
+            get_setting("LIBRE_API_KEY", ""))
+
+def _source_setting(source_lang, auto):
+    """영역에 지정된 원본 언어, 없으면 설정 (자동 감지면 auto)"""
+    if source_lang:
+        return source_lang
+    return auto if get_setting("AUTO_DETECT_LANG", True) else get_setting("SOURCE_LANG", "en")
+
+def deepl_langs(source_lang=None):
+    """DeepL 원본/목표 언어 코드 (원본 None이면 자동 감지, source_lang은 영역별 원본 언어)"""
+    source_lang = _source_setting(source_lang, None)
     target_lang = get_setting("TARGET_LANG", "ko")
-    
-    # DeepL API 언어 코드 매핑
-    DEEPL_LANGS = {
-        "ko": "KO", "en": "EN", "ja": "JA", "zh-CN": "ZH", "zh": "ZH",
-        "ru": "RU", "fr": "FR", "es": "ES", "de": "DE", "pt": "PT",
-        "it": "IT", "nl": "NL", "pl": "PL"
-    }
-    
-    # 언어 코드 변환
+
     deepl_target = DEEPL_LANGS.get(target_lang, "EN")
     deepl_source = None if source_lang is None else DEEPL_LANGS.get(source_lang, "EN")
-    
+    return deepl_source, deepl_target
+
+def libre_langs(source_lang=None):
+    """LibreTranslate 원본/목표 언어 코드 (source_lang은 영역별 원본 언어)"""
+    source_lang = _source_setting(source_lang, "auto")
+    target_lang = get_setting("TARGET_LANG", "ko")
+    return LIBRE_LANGS.get(source_lang, "en"), LIBRE_LANGS.get(target_lang, "ko")
+
+def _deepl_request(texts, deepl_source, deepl_target):
+    """DeepL API 호출: 텍스트 리스트를 한 요청으로 번역 (언어는 deepl_langs 코드, 실패 시 TranslationError)"""
+    api_key = load_deepl_key()
+
     # 같은 언어면 번역 스킵
     if deepl_source and deepl_source == deepl_target:
-        return text
-    
+        return list(texts)
+
     # API 요청
-    url = "https://api-free.deepl.com/v2/translate"
     headers = {
         "Authorization": f"DeepL-Auth-Key {api_key}",
         "Content-Type": "application/json"
     }
-    
+
     data = {
-        "text": [text],
+        "text": list(texts),
         "target_lang": deepl_target
     }
-    
+
     if deepl_source:
         data["source_lang"] = deepl_source
-    
+
     try:
-        response = requests.post(url, headers=headers, json=data)
-        if response.status_code != 200:
-            return f"(DeepL 번역 실패: HTTP {response.status_code})"
-        
-        result = response.json()
-        translations = result.get("translations", [])
-        
-        if translations:
-            return translations[0].get("text", "")
-        else:
-            return "(DeepL 번역 결과 없음)"
+        response = get_session("deepl").post(DEEPL_URL, headers=headers, json=data, timeout=get_timeout())
+    except requests.exceptions.Timeout:
+        raise TranslationError("(DeepL 번역 실패: 응답 시간 초과)")
     except Exception as e:
-        return f"(DeepL 번역 실패: {str(e)})"
+        raise TranslationError(f"(DeepL 번역 실패: {str(e)})")
 
-# LibreTranslate 번역 함수
-def libre_translate(text):
-    """LibreTranslate API를 사용하여 텍스트 번역"""
+    if response.status_code != 200:
+        raise TranslationError(f"(DeepL 번역 실패: HTTP {response.status_code})")
+
+    try:
+        translations = response.json().get("translations", [])
+    except Exception as e:
+        raise TranslationError(f"(DeepL 번역 실패: {str(e)})")
+
+    if not translations:
+        raise TranslationError("(DeepL 번역 결과 없음)")
+    if len(translations) != len(texts):
+        raise TranslationError(f"(DeepL 번역 실패: 결과 개수 불일치 {len(translations)}/{len(texts)})")
+    return [t.get("text", "") for t in translations]
+
+# DeepL 번역 함수
+def deepl_translate(text):
+    """DeepL API를 사용하여 텍스트 번역"""
     if not text:
         return ""
-    
-    # 설정 로드
     try:
-        with open("libretranslate.txt", "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            parts = content.split("|")
-            api_url = parts[0]
-            api_key = parts[1] if len(parts) > 1 else ""
-    except:
-        api_url = get_setting("LIBRE_API_URL", "http://localhost:5001/translate")
-        api_key = get_setting("LIBRE_API_KEY", "")
-    
-    # 언어 설정
-    auto_detect = get_setting("AUTO_DETECT_LANG", True)
-    source_lang = "auto" if auto_detect else get_setting("SOURCE_LANG", "en")
-    target_lang = get_setting("TARGET_LANG", "ko")
-    
-    # 언어 코드 매핑
-    LANG_MAP = {
-        "en": "en", "ko": "ko", "ja": "ja", "zh": "zh", "zh-CN": "zh",
-        "es": "es", "de": "de", "ru": "ru", "fr": "fr", "it": "it",
-        "pt": "pt", "auto": "auto"
-    }
-    
-    source = LANG_MAP.get(source_lang, "en")
-    target = LANG_MAP.get(target_lang, "ko")
-    
+        return _deepl_request([text], *deepl_langs())[0]
+    except TranslationError as e:
+        return str(e)
+
+def _libre_request(texts, source, target):
+    """LibreTranslate API 호출: 텍스트 리스트를 한 요청으로 번역 (언어는 libre_langs 코드, 실패 시 TranslationError)"""
+    api_url, api_key = load_libre_config()
+
     # 소스와 타겟 언어가 같으면 번역 필요 없음
     if source != "auto" and source == target:
-        return text
-    
-    # API 요청 데이터
+        return list(texts)
+
+    # API 요청 데이터 (여러 개면 배열로 전송, 하나면 구버전 서버 호환을 위해 문자열)
     payload = {
-        "q": text,
+        "q": list(texts) if len(texts) > 1 else texts[0],
         "source": source,
         "target": target,
         "format": "text"
     }
-    
+
     if api_key:
         payload["api_key"] = api_key
-    
+
     headers = {"Content-Type": "application/json"}
-    
+
     try:
-        response = requests.post(api_url, json=payload, headers=headers)
+        response = get_session("libretranslate").post(api_url, json=payload, headers=headers, timeout=get_timeout())
         response.raise_for_status()
-        return response.json().get("translatedText", "")
+        translated = response.json().get("translatedText", "")
+    except requests.exceptions.Timeout:
+        raise TranslationError("(LibreTranslate 번역 실패: 응답 시간 초과)")
     except requests.exceptions.HTTPError as e:
-        return f"(LibreTranslate 번역 실패: HTTP {e.response.status_code})"
+        raise TranslationError(f"(LibreTranslate 번역 실패: HTTP {e.response.status_code})")
     except requests.exceptions.ConnectionError:
-        return "(LibreTranslate 연결 실패 - 서버에 접속할 수 없습니다)"
+        raise TranslationError("(LibreTranslate 연결 실패 - 서버에 접속할 수 없습니다)")
     except Exception as e:
-        return f"(LibreTranslate 번역 실패: {str(e)})"
+        raise TranslationError(f"(LibreTranslate 번역 실패: {str(e)})")
 
-# 번역 디스패치 함수
-def translate_text(text):
-    """선택된 번역 엔진으로 텍스트 번역"""
+    if isinstance(translated, str):
+        translated = [translated]
+    if len(translated) != len(texts):
+        raise TranslationError(f"(LibreTranslate 번역 실패: 결과 개수 불일치 {len(translated)}/{len(texts)})")
+    return translated
+
+# LibreTranslate 번역 함수
+def libre_translate(text):
+    """LibreTranslate API를 사용하여 텍스트 번역"""
     if not text:
         return ""
-    
+    try:
+        return _libre_request([text], *libre_langs())[0]
+    except TranslationError as e:
+        return str(e)
+
+def prewarm(engine):
+    """인증 정보를 미리 읽고 번역 서버에 연결해 둠 (TCP/TLS 핸드셰이크 선행)"""
+    try:
+        if engine == "deepl":
+            load_deepl_key()
+            url = DEEPL_URL
+        elif engine == "libretranslate":
+            url, _ = load_libre_config()
+        else:
+            return
+        parts = urlsplit(url)
+        # 응답 코드와 관계없이 연결만 열어두면 됨
+        get_session(engine).head(f"{parts.scheme}://{parts.netloc}/", timeout=get_timeout())
+        log.info("[🔌 번역 서버 연결 준비 완료] %s", engine)
+    except Exception as e:
+        log.warning("[⚠️ 번역 서버 사전 연결 실패] %s: %s", engine, e)
+
+def prewarm_async(engine):
+    """백그라운드 스레드에서 번역 서버 사전 연결"""
+    threading.Thread(target=prewarm, args=(engine,), daemon=True).start()
+
+# 엔진이나 서버 주소가 바뀌면 새 서버에 미리 연결
+subscribe(("ENGINE", "LIBRE_API_URL", "LIBRE_API_KEY"), lambda changes: prewarm_async(get_setting("ENGINE", "deepl")))
+
+# 엔진별 (묶음 요청 함수, 언어 코드 함수, 요청당 최대 텍스트 수)
+ENGINES = {
+    "deepl": (_deepl_request, deepl_langs, 50),
+    "libretranslate": (_libre_request, libre_langs, 50),
+}
+
+def register_engine(name, request_func, langs_func=None, max_batch=50):
+    """번역 엔진 등록 (벤치마크용 가짜 엔진, 로컬 번역기 등)
+
+    request_func(texts, source, target)는 같은 순서의 번역 결과 리스트를 반환하고 실패 시 TranslationError를 발생시킨다.
+    source/target은 langs_func(source_lang)이 반환한 엔진 언어 코드 (source_lang은 영역별 원본 언어, 없으면 None).
+    """
+    if langs_func is None:
+        langs_func = lambda source_lang=None: (source_lang or get_setting("SOURCE_LANG", "en"),
+                                               get_setting("TARGET_LANG", "ko"))
+    ENGINES[name] = (request_func, langs_func, max_batch)
+
+def _timed_request(engine, source, target, texts):
+    """엔진 요청 한 번 (요청 시간, 보낸 글자 수, 오류 수 기록)"""
+    metrics.inc("engine_chars", sum(len(t) for t in texts), engine=engine)
+    started = time.perf_counter()
+    try:
+        return ENGINES[engine][0](texts, source, target)
+    except TranslationError:
+        metrics.inc("errors", stage="translate", engine=engine)
+        raise
+    finally:
+        metrics.observe("engine_request_seconds", time.perf_counter() - started, engine=engine)
+
+def _send_batch(group, texts):
+    """묶음 전송 (group = (엔진, 원본, 목표), 묶음 안의 텍스트는 모두 같은 언어 쌍)"""
+    return _timed_request(*group, texts)
+
+# 동시에 들어온 translate_text 호출을 모아 보내는 배처 (묶음 최대 개수는 엔진별, 모으는 시간은 설정)
+_batcher = MicroBatcher(_send_batch, window=get_setting("TRANSLATE_BATCH_WINDOW", 0.015),
+                        max_size=lambda group: ENGINES[group[0]][2])
+
+def _on_batch_window(changes):
+    _batcher.window = changes["TRANSLATE_BATCH_WINDOW"]
+
+subscribe("TRANSLATE_BATCH_WINDOW", _on_batch_window)
+
+def get_batch_stats():
+    """묶음 전송 통계 반환"""
+    return _batcher.stats()
+
+def _batch_timeout():
+    """배처 결과 대기 시간: 모으는 시간 + 엔진 요청 타임아웃 (연결은 재시도 1회 포함)"""
+    connect, read = get_timeout()
+    return _batcher.window + 2 * connect + read + 1.0
+
+def _request_translations(engine, source, target, texts):
+    """캐시에 없는 텍스트를 엔진에 요청 (최대 개수 단위로 나눠 전송)"""
+    max_batch = ENGINES[engine][2]
+    if _batcher.window > 0 and len(texts) == 1:
+        # 다른 호출자와 묶일 수 있도록 배처에 맡김 (엔진이 멈춰도 번역 스레드는 묶이지 않게 제한 시간까지만 대기)
+        future = _batcher.submit((engine, source, target), texts[0])
+        try:
+            return [future.result(timeout=_batch_timeout())]
+        except FuturesTimeout:
+            metrics.inc("errors", stage="translate", engine=engine)
+            raise TranslationError(f"({engine} 번역 실패: 응답 시간 초과)")
+    results = []
+    for i in range(0, len(texts), max_batch):
+        results.extend(_timed_request(engine, source, target, texts[i:i + max_batch]))
+    return results
+
+def same_language(source, target):
+    """원본/목표 언어 코드가 같은 언어인지 (EN / EN-US처럼 지역 구분은 무시, 자동 감지면 False)"""
+    if not source or not target:
+        return False
+    return source.split("-")[0].lower() == target.split("-")[0].lower()
+
+def translate_batch(texts, source_lang=None):
+    """여러 텍스트를 번역 (캐시, 번역 메모리 조회 후 남은 것만 중복 제거해서 한 번에 요청)
+
+    source_lang은 영역별 원본 언어 (없으면 설정의 원본 언어/자동 감지).
+    실패 시 모든 항목에 오류 메시지를 채워서 반환한다.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
     engine = get_setting("ENGINE", "deepl")
-    
-    if engine == "deepl":
-        return deepl_translate(text)
-    elif engine == "libretranslate":
-        return libre_translate(text)
-    else:
-        return f"(지원되지 않는 번역 엔진: {engine})"
\ No newline at end of file
+    if engine not in ENGINES:
+        return [f"(지원되지 않는 번역 엔진: {engine})" if t else "" for t in texts]
+    _, langs_func, _ = ENGINES[engine]
+    source, target = langs_func(source_lang)
+
+    # 캐시 조회 (없으면 숫자만 다르거나 아주 비슷한 문장의 이전 번역을 메모리에서 찾음)
+    # 원본과 목표 언어가 같으면 결과가 원문과 다를 이유가 없으므로 캐시/메모리에 남기지 않음
+    cache = memory = None
+    if not same_language(source, target):
+        cache = get_cache()
+        memory = get_memory()
+    group = make_group(engine, source, target)
+    results = [None] * len(texts)
+    missing = {}  # 정규화 텍스트(캐시 키와 같은 기준) -> (보낼 텍스트, 위치 목록)
+    for i, text in enumerate(texts):
+        if not text:
+            results[i] = ""
+            continue
+        if cache is not None:
+            cached = cache.get(make_key(engine, source, target, text))
+            if cached is not None:
+                results[i] = cached
+                metrics.inc("translation_lookups", result="cache", engine=engine)
+                continue
+        if memory is not None:
+            remembered = memory.lookup(group, text)
+            if remembered is not None:
+                results[i] = remembered
+                metrics.inc("translation_lookups", result="memory", engine=engine)
+                continue
+        metrics.inc("translation_lookups", result="engine", engine=engine)
+        missing.setdefault(normalize_text(text), (text, []))[1].append(i)
+
+    if missing:
+        unique = [text for text, _ in missing.values()]
+        try:
+            translated = _request_translations(engine, source, target, unique)
+        except TranslationError as e:
+            # 오류 메시지는 캐시하지 않음
+            translated = [str(e)] * len(unique)
+            cache = memory = None
+        for (text, positions), result in zip(missing.values(), translated):
+            for i in positions:
+                results[i] = result
+            if cache is not None and result:
+                cache.put(make_key(engine, source, target, text), result)
+            if memory is not None and result:
+                memory.add(group, text, result)
+    return results
+
+# 번역 디스패치 함수
+def translate_text(text, source_lang=None):
+    """선택된 번역 엔진으로 텍스트 번역 (캐시 우선)"""
+    if not text:
+        return ""
+    return translate_batch([text], source_lang)[0]